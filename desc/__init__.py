@@ -139,3 +139,34 @@ def set_device(kind="cpu"):
             selected_gpu["mem_total"] - selected_gpu["mem_used"]
         ) / 1024  # in GB
         os.environ["CUDA_VISIBLE_DEVICES"] = str(selected_gpu["index"])
+
+
+def _set_worker_device(counter, kind="cpu", devices=None):
+    """Pin a worker process of a process pool to one of ``devices``.
+
+    Used as the initializer of worker processes, so it must run before JAX is
+    imported in the worker.
+
+    Parameters
+    ----------
+    counter : multiprocessing.Value
+        Shared counter used to give each worker a unique index.
+    kind : {``'cpu'``, ``'gpu'``}
+        whether to use CPU or GPU.
+    devices : list, optional
+        For ``kind='gpu'``, GPU ids, worker ``i`` uses ``devices[i % len(devices)]``.
+        For ``kind='cpu'``, CPU cores (int or list of int), worker ``i`` is
+        restricted to the cores ``devices[i % len(devices)]``.
+
+    """
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    if devices:
+        device = devices[index % len(devices)]
+        if kind == "gpu":
+            os.environ["CUDA_VISIBLE_DEVICES"] = str(device)
+        elif hasattr(os, "sched_setaffinity"):
+            cores = device if isinstance(device, (list, tuple, set)) else [device]
+            os.sched_setaffinity(0, set(cores))
+    set_device(kind)
@@ -4,6 +4,7 @@ import functools
 from functools import partial
 from typing import Callable, Optional
 
+import numpy as np
 from jax._src.api import (
     _check_input_dtype_jacfwd,
     _check_input_dtype_jacrev,
@@ -175,6 +176,72 @@ def _chunk_vmapped_function(
     return functools.partial(_eval_fun_in_chunks, vmapped_fun, chunk_size, argnums)
 
 
+def _get_devices(devices):
+    """Parse devices argument into a list of jax devices or None."""
+    if devices is None:
+        return None
+    if isinstance(devices, str):
+        assert devices == "all", f"devices should be 'all', int or list, got {devices}"
+        return jax.local_devices()
+    if isinstance(devices, (int, np.integer)):
+        available = jax.local_devices()
+        if devices > len(available):
+            raise ValueError(
+                f"Requested {devices} devices but only {len(available)} are available."
+                " On CPU, more host devices can be exposed by setting "
+                "XLA_FLAGS=--xla_force_host_platform_device_count=N before JAX is "
+                "imported."
+            )
+        return available[:devices]
+    return list(devices)
+
+
+def _shard_vmapped_function(vmapped_fun, devices, argnums):
+    """Takes a vmapped function and splits the batch dimension across devices.
+
+    Each device evaluates its share of the batch with ``vmapped_fun``, which may
+    itself be chunked, and the results are gathered along the leading axis.
+    """
+    devices = _get_devices(devices)
+    if devices is None or len(devices) == 1:
+        return vmapped_fun
+
+    from jax.experimental.shard_map import shard_map
+    from jax.sharding import Mesh, PartitionSpec
+
+    if isinstance(argnums, int):
+        argnums = (argnums,)
+    mesh = Mesh(np.array(devices), ("batch",))
+    num_devices = len(devices)
+
+    def _pad(x, pad):
+        # repeat the last element, which is always a valid input
+        return jnp.concatenate([x, jnp.repeat(x[-1:], pad, axis=0)], axis=0)
+
+    @functools.wraps(vmapped_fun)
+    def sharded_fun(*args, **kwargs):
+        n = jax.tree_util.tree_leaves(args[argnums[0]])[0].shape[0]
+        pad = -n % num_devices
+        args = [
+            jax.tree_util.tree_map(lambda x: _pad(x, pad), a) if i in argnums else a
+            for i, a in enumerate(args)
+        ]
+        in_specs = tuple(
+            PartitionSpec("batch") if i in argnums else PartitionSpec()
+            for i in range(len(args))
+        )
+        y = shard_map(
+            lambda *a: vmapped_fun(*a, **kwargs),
+            mesh,
+            in_specs=in_specs,
+            out_specs=PartitionSpec("batch"),
+            check_rep=False,
+        )(*args)
+        return jax.tree_util.tree_map(lambda x: x[:n], y)
+
+    return sharded_fun
+
+
 def _parse_in_axes(in_axes):
     if isinstance(in_axes, int):
         in_axes = (in_axes,)
@@ -193,6 +260,7 @@ def vmap_chunked(
     in_axes=0,
     *,
     chunk_size: Optional[int],
+    devices=None,
 ) -> Callable:
     """Behaves like jax.vmap but uses scan to chunk the computations in smaller chunks.
 
@@ -202,6 +270,10 @@ def vmap_chunked(
     in_axes: The axes that should be scanned along. Only supports `0` or `None`
     chunk_size: The maximum size of the chunks to be used. If it is `None`,
         chunking is disabled
+    devices: Devices to split the batch across, either "all" for all local devices,
+        an int for the first ``devices`` local devices, or a list of devices.
+        Each device evaluates its share in chunks of ``chunk_size``. If `None`,
+        everything is evaluated on the default device.
 
 
     Returns
@@ -210,10 +282,13 @@ def vmap_chunked(
     """
     in_axes, argnums = _parse_in_axes(in_axes)
     vmapped_fun = jax.vmap(f, in_axes=in_axes)
-    return _chunk_vmapped_function(vmapped_fun, chunk_size, argnums)
+    chunked_fun = _chunk_vmapped_function(vmapped_fun, chunk_size, argnums)
+    return _shard_vmapped_function(chunked_fun, devices, argnums)
 
 
-def batched_vectorize(pyfunc, *, excluded=frozenset(), signature=None, chunk_size=None):
+def batched_vectorize(
+    pyfunc, *, excluded=frozenset(), signature=None, chunk_size=None, devices=None
+):
     """Define a vectorized function with broadcasting and batching.
 
     :func:`vectorize` is a convenience wrapper for defining vectorized
@@ -243,6 +318,9 @@ def batched_vectorize(pyfunc, *, excluded=frozenset(), signature=None, chunk_siz
     default, pyfunc is assumed to take scalars arrays as input and output.
     chunk_size: the size of the batches to pass to vmap. If None, defaults to
     the largest possible chunk_size (like the default behavior of ``vectorize11)
+    devices: devices to split the outermost batch dimension across, either "all",
+    an int or a list of devices. Each device evaluates its share in chunks of
+    ``chunk_size``. If None, everything is evaluated on the default device.
 
     Returns
     -------
@@ -317,15 +395,22 @@ def batched_vectorize(pyfunc, *, excluded=frozenset(), signature=None, chunk_siz
 
         vectorized_func = checked_func
         dims_to_expand = []
+        all_in_axes = []
         for negdim, axis_sizes in enumerate(zip(*rev_filled_shapes)):
             in_axes = tuple(None if size == 1 else 0 for size in axis_sizes)
             if all(axis is None for axis in in_axes):
                 dims_to_expand.append(len(broadcast_shape) - 1 - negdim)
             else:
-                # change the vmap here to chunked_vmap
-                vectorized_func = vmap_chunked(
-                    vectorized_func, in_axes, chunk_size=chunk_size
-                )
+                all_in_axes.append(in_axes)
+        for i, in_axes in enumerate(all_in_axes):
+            # change the vmap here to chunked_vmap, only the outermost batch
+            # dimension is split across devices
+            vectorized_func = vmap_chunked(
+                vectorized_func,
+                in_axes,
+                chunk_size=chunk_size,
+                devices=devices if i == len(all_in_axes) - 1 else None,
+            )
         result = vectorized_func(*squeezed_args)
 
         if not dims_to_expand:
@@ -354,6 +439,7 @@ def jacfwd_chunked(
     holomorphic=False,
     *,
     chunk_size=None,
+    devices=None,
 ):
     """Jacobian of ``fun`` evaluated column-by-column using forward-mode AD.
 
@@ -373,6 +459,10 @@ def jacfwd_chunked(
     chunk_size: int
         The size of the batches to pass to vmap. If None, defaults to the largest
         possible chunk_size.
+    devices: {None, "all", int, list}
+        Devices to split the columns of the Jacobian across. Each device computes
+        its share of columns in chunks of ``chunk_size``. If None, all columns are
+        computed on the default device.
 
     Returns
     -------
@@ -401,12 +491,14 @@ def jacfwd_chunked(
         tree_map(partial(_check_input_dtype_jacfwd, holomorphic), dyn_args)
         if not has_aux:
             pushfwd: Callable = partial(_jvp, f_partial, dyn_args)
-            y, jac = vmap_chunked(pushfwd, chunk_size=chunk_size)(_std_basis(dyn_args))
+            y, jac = vmap_chunked(pushfwd, chunk_size=chunk_size, devices=devices)(
+                _std_basis(dyn_args)
+            )
             y = tree_map(lambda x: x[0], y)
             jac = tree_map(lambda x: jnp.moveaxis(x, 0, -1), jac)
         else:
             pushfwd: Callable = partial(_jvp, f_partial, dyn_args, has_aux=True)
-            y, jac, aux = vmap_chunked(pushfwd, chunk_size=chunk_size)(
+            y, jac, aux = vmap_chunked(pushfwd, chunk_size=chunk_size, devices=devices)(
                 _std_basis(dyn_args)
             )
             y = tree_map(lambda x: x[0], y)
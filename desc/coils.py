@@ -28,6 +28,7 @@ from desc.geometry import (
 )
 from desc.grid import LinearGrid
 from desc.magnetic_fields import _MagneticField
+from desc.magnetic_fields._treecode import biot_savart_tree
 from desc.optimizable import Optimizable, OptimizableCollection, optimizable_parameter
 from desc.utils import cross, dot, equals, errorif, flatten_list, safenorm, warnif
 
@@ -283,6 +284,34 @@ class _Coil(_MagneticField, Optimizable, ABC):
             return x, x_s
         return x
 
+    def _compute_sources(self, params=None, source_grid=None):
+        """Compute quadrature points and current elements for the Biot-Savart law.
+
+        Parameters
+        ----------
+        params : dict, optional
+            Parameters to pass to Curve, may include `current`.
+        source_grid : Grid, int or None, optional
+            Grid used to discretize coil.
+
+        Returns
+        -------
+        rs, rs_end : ndarray, shape(n,3)
+            Start and end of each source segment in [X,Y,Z] coordinates. The same
+            for the point sources of quadrature.
+        dl : ndarray, shape(n,3)
+            Current times tangent times quadrature weight at each source point.
+
+        """
+        params = {} if params is None else dict(params)
+        current = params.pop("current", self.current)
+        if source_grid is None:
+            source_grid = LinearGrid(N=2 * self.N * getattr(self, "NFP", 1) + 5)
+        data = self.compute(
+            ["x", "x_s", "ds"], grid=source_grid, params=params or None, basis="xyz"
+        )
+        return data["x"], data["x"], current * data["x_s"] * data["ds"][:, None]
+
     def _compute_A_or_B(
         self,
         coords,
@@ -970,6 +999,34 @@ class SplineXYZCoil(_Coil, SplineXYZCurve):
     ):
         super().__init__(current, X, Y, Z, knots, method, name)
 
+    def _compute_sources(self, params=None, source_grid=None):
+        """Compute quadrature points and current elements for the Biot-Savart law.
+
+        Uses the straight segments between grid points, as in the direct sum.
+
+        Parameters
+        ----------
+        params : dict, optional
+            Parameters to pass to Curve, may include `current`.
+        source_grid : Grid, int or None, optional
+            Grid used to discretize coil.
+
+        Returns
+        -------
+        rs, rs_end : ndarray, shape(n,3)
+            Start and end of each segment in [X,Y,Z] coordinates.
+        dl : ndarray, shape(n,3)
+            Current times segment vector of each segment.
+
+        """
+        params = {} if params is None else dict(params)
+        current = params.pop("current", self.current)
+        x = self.compute(["x"], grid=source_grid, params=params or None, basis="xyz")[
+            "x"
+        ]
+        x_end = jnp.concatenate([x[1:], x[:1]])
+        return x, x_end, current * (x_end - x)
+
     def _compute_A_or_B(
         self,
         coords,
@@ -1478,6 +1535,80 @@ class CoilSet(OptimizableCollection, _Coil, MutableSequence):
         )
         return link / (4 * jnp.pi)
 
+    def _compute_sources(self, params=None, source_grid=None):
+        """Compute quadrature points and current elements for the Biot-Savart law.
+
+        Includes the virtual coils from stellarator and field period symmetry.
+
+        Parameters
+        ----------
+        params : dict or array-like of dict, optional
+            Parameters to pass to coils, either the same for all coils or one for each.
+        source_grid : Grid, int or None, optional
+            Grid used to discretize coils.
+
+        Returns
+        -------
+        rs, rs_end : ndarray, shape(n,3)
+            Start and end of each source segment in [X,Y,Z] coordinates. The same
+            for the point sources of quadrature.
+        dl : ndarray, shape(n,3)
+            Current times tangent times quadrature weight at each source point.
+
+        """
+        if params is None:
+            params = [get_params(["x_s", "x", "s", "ds"], coil) for coil in self]
+            for par, coil in zip(params, self):
+                par["current"] = coil.current
+        params = self._make_arraylike(params)
+        rs, rs_end, dl = vmap(lambda par: self[0]._compute_sources(par, source_grid))(
+            tree_stack(params)
+        )
+
+        # if stellarator symmetric, add reflected coils from the other half field
+        # period, with reversed direction of current
+        if self.sym:
+            normal = jnp.array(
+                [-jnp.sin(jnp.pi / self.NFP), jnp.cos(jnp.pi / self.NFP), 0]
+            )
+            T = reflection_matrix(normal).T @ reflection_matrix([0, 0, 1]).T
+            rs = jnp.vstack((rs, rs @ T))
+            rs_end = jnp.vstack((rs_end, rs_end @ T))
+            dl = jnp.vstack((dl, -dl @ T))
+
+        # if field period symmetry, add rotated coils from other field periods
+        angles = 2 * jnp.pi * jnp.arange(self.NFP) / self.NFP
+        rotations = jnp.array(
+            [
+                [jnp.cos(angles), -jnp.sin(angles), jnp.zeros_like(angles)],
+                [jnp.sin(angles), jnp.cos(angles), jnp.zeros_like(angles)],
+                [jnp.zeros_like(angles), jnp.zeros_like(angles), jnp.ones_like(angles)],
+            ]
+        )
+        rs, rs_end, dl = (
+            jnp.einsum("ijk,...j->k...i", rotations, x).reshape(-1, 3)
+            for x in (rs, rs_end, dl)
+        )
+        return rs, rs_end, dl
+
+    def _compute_A_or_B_tree(
+        self, coords, params, basis, source_grid, transforms, compute_A_or_B, tol
+    ):
+        """Compute magnetic field or vector potential using the tree code."""
+        errorif(
+            transforms is not None,
+            ValueError,
+            "transforms can't be used with the tree code, use source_grid instead.",
+        )
+        assert basis.lower() in ["rpz", "xyz"]
+        coords = jnp.atleast_2d(jnp.asarray(coords))
+        coords_xyz = rpz2xyz(coords) if basis.lower() == "rpz" else coords
+        rs, rs_end, dl = self._compute_sources(params, source_grid)
+        AB = biot_savart_tree(coords_xyz, rs, dl, tol, compute_A_or_B, rs_end=rs_end)
+        if basis.lower() == "rpz":
+            AB = xyz2rpz_vec(AB, x=coords_xyz[:, 0], y=coords_xyz[:, 1])
+        return AB
+
     def _compute_A_or_B(
         self,
         coords,
@@ -1486,6 +1617,7 @@ class CoilSet(OptimizableCollection, _Coil, MutableSequence):
         source_grid=None,
         transforms=None,
         compute_A_or_B="B",
+        tol=None,
     ):
         """Compute magnetic field at a set of points.
 
@@ -1505,6 +1637,13 @@ class CoilSet(OptimizableCollection, _Coil, MutableSequence):
         compute_A_or_B: {"A", "B"}, optional
             whether to compute the magnetic vector potential "A" or the magnetic field
             "B". Defaults to "B"
+        tol : float, optional
+            If given, use a tree code with multipole expansions for distant coil
+            segments instead of the direct sum over all coil points, with roughly
+            this relative error compared to the direct sum. Only faster than the
+            direct sum for more than about 1e5 source points, counting the
+            symmetric copies of coils. Can't be used with ``transforms``. Default is
+            the direct sum.
 
         Returns
         -------
@@ -1518,6 +1657,10 @@ class CoilSet(OptimizableCollection, _Coil, MutableSequence):
             ValueError,
             f'Expected "A" or "B" for compute_A_or_B, instead got {compute_A_or_B}',
         )
+        if tol is not None:
+            return self._compute_A_or_B_tree(
+                coords, params, basis, source_grid, transforms, compute_A_or_B, tol
+            )
         assert basis.lower() in ["rpz", "xyz"]
         coords = jnp.atleast_2d(jnp.asarray(coords))
         if params is None:
@@ -1577,7 +1720,13 @@ class CoilSet(OptimizableCollection, _Coil, MutableSequence):
         return AB
 
     def compute_magnetic_field(
-        self, coords, params=None, basis="rpz", source_grid=None, transforms=None
+        self,
+        coords,
+        params=None,
+        basis="rpz",
+        source_grid=None,
+        transforms=None,
+        tol=None,
     ):
         """Compute magnetic field at a set of points.
 
@@ -1594,6 +1743,13 @@ class CoilSet(OptimizableCollection, _Coil, MutableSequence):
             points. Should NOT include endpoint at 2pi.
         transforms : dict of Transform or array-like
             Transforms for R, Z, lambda, etc. Default is to build from grid.
+        tol : float, optional
+            If given, use a tree code with multipole expansions for distant coil
+            segments instead of the direct sum over all coil points, with roughly
+            this relative error compared to the direct sum. Only faster than the
+            direct sum for more than about 1e5 source points, counting the
+            symmetric copies of coils. Can't be used with ``transforms``. Default is
+            the direct sum.
 
         Returns
         -------
@@ -1601,10 +1757,18 @@ class CoilSet(OptimizableCollection, _Coil, MutableSequence):
             Magnetic field at specified nodes, in [R,phi,Z] or [X,Y,Z] coordinates.
 
         """
-        return self._compute_A_or_B(coords, params, basis, source_grid, transforms, "B")
+        return self._compute_A_or_B(
+            coords, params, basis, source_grid, transforms, "B", tol
+        )
 
     def compute_magnetic_vector_potential(
-        self, coords, params=None, basis="rpz", source_grid=None, transforms=None
+        self,
+        coords,
+        params=None,
+        basis="rpz",
+        source_grid=None,
+        transforms=None,
+        tol=None,
     ):
         """Compute magnetic vector potential at a set of points.
 
@@ -1621,6 +1785,13 @@ class CoilSet(OptimizableCollection, _Coil, MutableSequence):
             points. Should NOT include endpoint at 2pi.
         transforms : dict of Transform or array-like
             Transforms for R, Z, lambda, etc. Default is to build from grid.
+        tol : float, optional
+            If given, use a tree code with multipole expansions for distant coil
+            segments instead of the direct sum over all coil points, with roughly
+            this relative error compared to the direct sum. Only faster than the
+            direct sum for more than about 1e5 source points, counting the
+            symmetric copies of coils. Can't be used with ``transforms``. Default is
+            the direct sum.
 
         Returns
         -------
@@ -1629,7 +1800,9 @@ class CoilSet(OptimizableCollection, _Coil, MutableSequence):
             or xyz coordinates
 
         """
-        return self._compute_A_or_B(coords, params, basis, source_grid, transforms, "A")
+        return self._compute_A_or_B(
+            coords, params, basis, source_grid, transforms, "A", tol
+        )
 
     @classmethod
     def linspaced_angular(
@@ -2409,6 +2582,36 @@ class MixedCoilSet(CoilSet):
             return x, x_s
         return jnp.vstack(out)
 
+    def _compute_sources(self, params=None, source_grid=None):
+        """Compute quadrature points and current elements for the Biot-Savart law.
+
+        Parameters
+        ----------
+        params : dict or array-like of dict, optional
+            Parameters to pass to coils, either the same for all coils or one for each.
+        source_grid : Grid, int or None or array-like, optional
+            Grid used to discretize coils, either the same for all coils or one for
+            each.
+
+        Returns
+        -------
+        rs, rs_end : ndarray, shape(n,3)
+            Start and end of each source segment in [X,Y,Z] coordinates. The same
+            for the point sources of quadrature.
+        dl : ndarray, shape(n,3)
+            Current times tangent times quadrature weight at each source point.
+
+        """
+        params = self._make_arraylike(params)
+        source_grid = self._make_arraylike(source_grid)
+        rs, rs_end, dl = zip(
+            *[
+                coil._compute_sources(par, grd)
+                for coil, par, grd in zip(self.coils, params, source_grid)
+            ]
+        )
+        return jnp.concatenate(rs), jnp.concatenate(rs_end), jnp.concatenate(dl)
+
     def _compute_A_or_B(
         self,
         coords,
@@ -2417,6 +2620,7 @@ class MixedCoilSet(CoilSet):
         source_grid=None,
         transforms=None,
         compute_A_or_B="B",
+        tol=None,
     ):
         """Compute magnetic field or vector potential at a set of points.
 
@@ -2438,6 +2642,13 @@ class MixedCoilSet(CoilSet):
         compute_A_or_B: {"A", "B"}, optional
             whether to compute the magnetic vector potential "A" or the magnetic field
             "B". Defaults to "B"
+        tol : float, optional
+            If given, use a tree code with multipole expansions for distant coil
+            segments instead of the direct sum over all coil points, with roughly
+            this relative error compared to the direct sum. Only faster than the
+            direct sum for more than about 1e5 source points, counting the
+            symmetric copies of coils. Can't be used with ``transforms``. Default is
+            the direct sum.
 
         Returns
         -------
@@ -2451,6 +2662,10 @@ class MixedCoilSet(CoilSet):
             ValueError,
             f'Expected "A" or "B" for compute_A_or_B, instead got {compute_A_or_B}',
         )
+        if tol is not None:
+            return self._compute_A_or_B_tree(
+                coords, params, basis, source_grid, transforms, compute_A_or_B, tol
+            )
         params = self._make_arraylike(params)
         source_grid = self._make_arraylike(source_grid)
         transforms = self._make_arraylike(transforms)
@@ -2469,7 +2684,13 @@ class MixedCoilSet(CoilSet):
         return AB
 
     def compute_magnetic_field(
-        self, coords, params=None, basis="rpz", source_grid=None, transforms=None
+        self,
+        coords,
+        params=None,
+        basis="rpz",
+        source_grid=None,
+        transforms=None,
+        tol=None,
     ):
         """Compute magnetic field at a set of points.
 
@@ -2488,6 +2709,13 @@ class MixedCoilSet(CoilSet):
             If array-like, should be 1 value per coil.
         transforms : dict of Transform or array-like
             Transforms for R, Z, lambda, etc. Default is to build from grid.
+        tol : float, optional
+            If given, use a tree code with multipole expansions for distant coil
+            segments instead of the direct sum over all coil points, with roughly
+            this relative error compared to the direct sum. Only faster than the
+            direct sum for more than about 1e5 source points, counting the
+            symmetric copies of coils. Can't be used with ``transforms``. Default is
+            the direct sum.
 
         Returns
         -------
@@ -2495,10 +2723,18 @@ class MixedCoilSet(CoilSet):
             magnetic field at specified points, in either rpz or xyz coordinates
 
         """
-        return self._compute_A_or_B(coords, params, basis, source_grid, transforms, "B")
+        return self._compute_A_or_B(
+            coords, params, basis, source_grid, transforms, "B", tol
+        )
 
     def compute_magnetic_vector_potential(
-        self, coords, params=None, basis="rpz", source_grid=None, transforms=None
+        self,
+        coords,
+        params=None,
+        basis="rpz",
+        source_grid=None,
+        transforms=None,
+        tol=None,
     ):
         """Compute magnetic vector potential at a set of points.
 
@@ -2517,6 +2753,13 @@ class MixedCoilSet(CoilSet):
             If array-like, should be 1 value per coil.
         transforms : dict of Transform or array-like
             Transforms for R, Z, lambda, etc. Default is to build from grid.
+        tol : float, optional
+            If given, use a tree code with multipole expansions for distant coil
+            segments instead of the direct sum over all coil points, with roughly
+            this relative error compared to the direct sum. Only faster than the
+            direct sum for more than about 1e5 source points, counting the
+            symmetric copies of coils. Can't be used with ``transforms``. Default is
+            the direct sum.
 
         Returns
         -------
@@ -2525,7 +2768,9 @@ class MixedCoilSet(CoilSet):
             or xyz coordinates
 
         """
-        return self._compute_A_or_B(coords, params, basis, source_grid, transforms, "A")
+        return self._compute_A_or_B(
+            coords, params, basis, source_grid, transforms, "A", tol
+        )
 
     def to_FourierPlanar(
         self, N=10, grid=None, basis="xyz", name="", check_intersection=True
@@ -0,0 +1,267 @@
+"""Persistent on-disk cache for compiled objective functions and derivatives.
+
+JAX can serialize compiled XLA executables to disk, so that a later process which
+traces the same computation can load the executable instead of compiling it again.
+This module manages such a cache directory for DESC: it records which files belong to
+which ``ObjectiveFunction`` structure, reports hits and misses when compiling, and
+evicts the least recently used entries once the directory grows past a maximum size.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from termcolor import colored
+
+from desc.backend import jax, use_jax
+from desc.utils import errorif
+
+_MANIFEST = "desc_cache_manifest.json"
+
+_cache = None
+
+
+class CompilationCache:
+    """Managed persistent compilation cache.
+
+    Parameters
+    ----------
+    cache_dir : str or path-like
+        Directory to store serialized executables in. Created if it does not exist.
+    max_size : float, optional
+        Maximum size of the cache directory in GB. When exceeded, the least recently
+        used entries are removed until the cache fits. ``None`` means no limit.
+    min_compile_time : float, optional
+        Only executables that took longer than this many seconds to compile are
+        written to disk.
+
+    """
+
+    def __init__(self, cache_dir, max_size=2.0, min_compile_time=0.0):
+        errorif(
+            max_size is not None and max_size <= 0,
+            ValueError,
+            f"max_size should be positive or None, got {max_size}",
+        )
+        self._cache_dir = os.path.abspath(os.fspath(cache_dir))
+        self._max_size = max_size
+        self._min_compile_time = min_compile_time
+        os.makedirs(self._cache_dir, exist_ok=True)
+        self._manifest_path = os.path.join(self._cache_dir, _MANIFEST)
+        self._manifest = self._read_manifest()
+        self.hits = 0
+        self.misses = 0
+
+    def _read_manifest(self):
+        try:
+            with open(self._manifest_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_manifest(self):
+        tmp = self._manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp, self._manifest_path)
+
+    def _listdir(self):
+        return {
+            f
+            for f in os.listdir(self._cache_dir)
+            if f != _MANIFEST and not f.endswith(".tmp")
+        }
+
+    def _file_size(self, fname):
+        try:
+            return os.path.getsize(os.path.join(self._cache_dir, fname))
+        except FileNotFoundError:
+            return 0
+
+    def activate(self):
+        """Point JAX's persistent compilation cache at this directory."""
+        if not use_jax:
+            return
+        from jax.experimental.compilation_cache import compilation_cache as cc
+
+        jax.config.update("jax_enable_compilation_cache", True)
+        jax.config.update("jax_compilation_cache_dir", self._cache_dir)
+        jax.config.update(
+            "jax_persistent_cache_min_compile_time_secs", self._min_compile_time
+        )
+        jax.config.update("jax_persistent_cache_min_entry_size_bytes", 0)
+        # JAX initializes the cache lazily and only once, so reset it in case
+        # something was compiled with a different directory before.
+        cc.reset_cache()
+
+    def contains(self, key):
+        """Whether an entry for ``key`` has been stored and is still on disk."""
+        entry = self._manifest.get(key)
+        if entry is None:
+            return False
+        existing = self._listdir()
+        return len(entry["files"]) > 0 and all(f in existing for f in entry["files"])
+
+    def begin(self, key):
+        """Mark the start of compiling ``key``.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the computation being compiled.
+
+        Returns
+        -------
+        hit : bool
+            Whether ``key`` was found in the cache.
+        snapshot : set
+            Files in the cache directory before compilation, to pass to ``end``.
+
+        """
+        hit = self.contains(key)
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return hit, self._listdir()
+
+    def end(self, key, snapshot):
+        """Record the files written while compiling ``key`` and evict if needed.
+
+        Parameters
+        ----------
+        key : str
+            Hash of the computation that was compiled.
+        snapshot : set
+            Files in the cache directory before compilation, as returned by ``begin``.
+
+        """
+        new_files = sorted(self._listdir() - snapshot)
+        entry = self._manifest.setdefault(key, {"files": []})
+        entry["files"] = sorted(set(entry["files"]).union(new_files))
+        entry["last_used"] = time.time()
+        self._evict(keep=key)
+        self._write_manifest()
+
+    @property
+    def size(self):
+        """float: Total size of the cache directory in GB."""
+        return sum(self._file_size(f) for f in self._listdir()) / 1024**3
+
+    def _evict(self, keep=None):
+        if self._max_size is None:
+            return
+        # least recently used first
+        order = sorted(
+            (k for k in self._manifest if k != keep),
+            key=lambda k: self._manifest[k].get("last_used", 0),
+        )
+        size = self.size
+        for k in order:
+            if size <= self._max_size:
+                break
+            for f in self._manifest.pop(k)["files"]:
+                size -= self._file_size(f) / 1024**3
+                try:
+                    os.remove(os.path.join(self._cache_dir, f))
+                except FileNotFoundError:
+                    pass
+
+    def clear(self):
+        """Remove all entries managed by this cache."""
+        for entry in self._manifest.values():
+            for f in entry["files"]:
+                try:
+                    os.remove(os.path.join(self._cache_dir, f))
+                except FileNotFoundError:
+                    pass
+        self._manifest = {}
+        self._write_manifest()
+
+    @property
+    def cache_dir(self):
+        """str: Directory where the cache is stored."""
+        return self._cache_dir
+
+    @property
+    def max_size(self):
+        """float: Maximum size of the cache in GB."""
+        return self._max_size
+
+
+def enable_compilation_cache(cache_dir, max_size=2.0, min_compile_time=0.0):
+    """Enable the persistent compilation cache for ``ObjectiveFunction.compile``.
+
+    Once enabled, compiled objectives and derivatives are written to ``cache_dir``
+    so that running the same optimization again (possibly on another machine with
+    access to the same directory) can skip compilation.
+
+    Parameters
+    ----------
+    cache_dir : str or path-like
+        Directory to store serialized executables in.
+    max_size : float, optional
+        Maximum size of the cache directory in GB. Least recently used entries are
+        evicted once exceeded. ``None`` means no limit.
+    min_compile_time : float, optional
+        Only executables that took longer than this many seconds to compile are
+        written to disk.
+
+    Returns
+    -------
+    cache : CompilationCache
+        The active cache.
+
+    """
+    global _cache
+    errorif(
+        not use_jax,
+        RuntimeError,
+        "The compilation cache requires JAX.",
+    )
+    _cache = CompilationCache(cache_dir, max_size, min_compile_time)
+    _cache.activate()
+    return _cache
+
+
+def disable_compilation_cache():
+    """Disable the persistent compilation cache."""
+    global _cache
+    _cache = None
+    if use_jax:
+        from jax.experimental.compilation_cache import compilation_cache as cc
+
+        jax.config.update("jax_compilation_cache_dir", None)
+        cc.reset_cache()
+
+
+def get_compilation_cache():
+    """Return the active ``CompilationCache``, or None if not enabled."""
+    return _cache
+
+
+def hash_structure(*args):
+    """Compute a stable hash of nested tuples/lists/dicts of basic types.
+
+    Parameters
+    ----------
+    args : tuple
+        Objects to hash. Should be composed of str, int, float, bool, None and
+        nested tuples, lists and dicts of those.
+
+    Returns
+    -------
+    key : str
+        Hex digest that is the same across processes and machines.
+
+    """
+    s = json.dumps(args, sort_keys=True, default=repr)
+    return hashlib.sha256(s.encode()).hexdigest()
+
+
+def _report(key, hit, verbose):
+    if verbose > 0:
+        msg = "hit" if hit else "miss"
+        color = "green" if hit else "yellow"
+        print(colored(f"Compilation cache {msg} (key {key[:12]})", color))
@@ -11,7 +11,7 @@ expensive computations.
 
 from scipy.constants import mu_0
 
-from desc.backend import jit, jnp, scan, vmap
+from desc.backend import custom_jvp, fori_loop, jit, jnp, scan, vmap
 
 from ..integrals.surface_integral import surface_integrals_map
 from ..utils import dot
@@ -234,6 +234,126 @@ def _magnetic_well(params, transforms, profiles, data, **kwargs):
     return data
 
 
+# Shifts evaluated per pass of multisection, and number of passes. Each pass shrinks
+# the interval containing the largest eigenvalue by a factor of _NUM_SHIFTS + 1, so
+# 14 passes of 15 shifts are enough to reach machine precision.
+_NUM_SHIFTS = 15
+_NUM_PASSES = 14
+
+
+@custom_jvp
+def _eigvalsh_max_tridiagonal(d, e):
+    """Largest eigenvalue of real symmetric tridiagonal matrices.
+
+    Uses multisection with Sturm sequences, which only needs O(n) memory and
+    O(n log(1/eps)) operations per matrix, rather than the O(n^2) memory and O(n^3)
+    operations of a dense eigenvalue solver. The derivative is computed from the
+    eigenvector, found by inverse iteration.
+
+    Parameters
+    ----------
+    d : jnp.ndarray
+        Shape (..., n). Diagonals of the matrices.
+    e : jnp.ndarray
+        Shape (..., n - 1). Off diagonals of the matrices.
+
+    Returns
+    -------
+    w : jnp.ndarray
+        Shape (...). Largest eigenvalue of each matrix.
+
+    """
+    n = d.shape[-1]
+    pad = jnp.zeros_like(d[..., :1])
+    radius = jnp.concatenate([jnp.abs(e), pad], -1)
+    radius = radius + jnp.concatenate([pad, jnp.abs(e)], -1)
+    # Gershgorin bound, and the largest eigenvalue is at least the largest diagonal
+    lo = jnp.max(d, axis=-1)
+    hi = jnp.max(d + radius, axis=-1)
+    # minimum magnitude of pivots to avoid division by zero, as in LAPACK
+    pivmin = jnp.finfo(d.dtype).tiny * jnp.maximum(1, jnp.max(e**2, axis=-1, initial=0))
+    pivmin = pivmin[..., None]
+    d = jnp.moveaxis(d, -1, 0)[..., None]
+    e2 = jnp.moveaxis(e**2, -1, 0)[..., None]
+    s = jnp.arange(1, _NUM_SHIFTS + 1) / (_NUM_SHIFTS + 1)
+
+    def count(x):
+        # number of eigenvalues less than each shift x, from the signs of the pivots
+        # of the LDL^T factorization of T - xI
+        def body(carry, de2):
+            q, num = carry
+            q = de2[0] - x - de2[1] / q
+            q = jnp.where(jnp.abs(q) < pivmin, -pivmin, q)
+            return (q, num + (q < 0)), None
+
+        q = d[0] - x
+        q = jnp.where(jnp.abs(q) < pivmin, -pivmin, q)
+        (_, num), _ = scan(body, (q, (q < 0).astype(int)), (d[1:], e2))
+        return num
+
+    def multisect(i, bounds):
+        lo, hi = bounds
+        x = lo[..., None] + (hi - lo)[..., None] * s
+        # whether the largest eigenvalue is greater than each shift
+        above = count(x) < n
+        lo = jnp.max(jnp.where(above, x, lo[..., None]), axis=-1)
+        hi = jnp.min(jnp.where(above, hi[..., None], x), axis=-1)
+        return lo, hi
+
+    lo, hi = fori_loop(0, _NUM_PASSES, multisect, (lo, hi))
+    return (lo + hi) / 2
+
+
+def _eigvec_max_tridiagonal(d, e, w, num_iter=3):
+    """Normalized eigenvector of largest eigenvalue w of symmetric tridiagonal T.
+
+    Uses inverse iteration with a shift just above w, so that T - shift I is
+    negative definite and can be factored without pivoting.
+    """
+    scale = jnp.max(jnp.abs(d), axis=-1) + 2 * jnp.max(jnp.abs(e), axis=-1, initial=0)
+    shift = w + 1e-12 * scale
+    d = jnp.moveaxis(d, -1, 0) - shift
+    e = jnp.moveaxis(e, -1, 0)
+
+    # T - shift I = L Q L^T with L unit lower bidiagonal and Q diagonal
+    def factor(q, de):
+        l = de[1] / q
+        return de[0] - l * de[1], (q, l)
+
+    q_last, (q, l) = scan(factor, d[0], (d[1:], e))
+    q = jnp.concatenate([q, q_last[None]])
+
+    def forward(y, lb):
+        y = lb[1] - lb[0] * y
+        return y, y
+
+    def backward(x, lz):
+        x = lz[1] - lz[0] * x
+        return x, x
+
+    v = jnp.ones_like(d)
+    for _ in range(num_iter):
+        _, y = scan(forward, v[0], (l, v[1:]))
+        z = jnp.concatenate([v[:1], y]) / q
+        _, x = scan(backward, z[-1], (l, z[:-1]), reverse=True)
+        v = jnp.concatenate([x, z[-1:]])
+        v = v / jnp.linalg.norm(v, axis=0)
+    return jnp.moveaxis(v, 0, -1)
+
+
+@_eigvalsh_max_tridiagonal.defjvp
+def _eigvalsh_max_tridiagonal_jvp(primals, tangents):
+    d, e = primals
+    d_dot, e_dot = tangents
+    w = _eigvalsh_max_tridiagonal(d, e)
+    v = _eigvec_max_tridiagonal(d, e, w)
+    # dw = v^T dT v
+    w_dot = jnp.sum(d_dot * v**2, axis=-1) + 2 * jnp.sum(
+        e_dot * v[..., :-1] * v[..., 1:], axis=-1
+    )
+    return w, w_dot
+
+
 @register_compute_fun(
     name="ideal ballooning lambda",
     label="\\lambda_{\\mathrm{ballooning}}=\\gamma^2",
@@ -379,28 +499,16 @@ def _ideal_ballooning_gamma2(params, transforms, profiles, data, **kwargs):
 
     h = phi[1] - phi[0]
 
-    i = jnp.arange(N_alpha)[:, None, None, None]
-    l = jnp.arange(N_zeta0)[None, :, None, None]
-    j = jnp.arange(N_zeta - 2)[None, None, :, None]
-    k = jnp.arange(N_zeta - 2)[None, None, None, :]
-
-    A = jnp.zeros((N_alpha, N_zeta0, N_zeta - 2, N_zeta - 2))
-    B_inv = jnp.zeros((N_alpha, N_zeta0, N_zeta - 2, N_zeta - 2))
-
-    A = A.at[i, l, j, k].set(
-        g_half[i, l, k] / h**2 * (j - k == -1)
-        + (-(g_half[i, l, j + 1] + g_half[i, l, j]) / h**2 + c[i, l, j + 1])
-        * (j - k == 0)
-        + g_half[i, l, j] / h**2 * (j - k == 1)
-    )
-
-    B_inv = B_inv.at[i, l, j, k].set(1 / jnp.sqrt(f[i, l, j + 1]) * (j - k == 0))
-
-    A_redo = B_inv @ A @ jnp.transpose(B_inv, axes=(0, 1, 3, 2))
+    # The finite difference operator A is tridiagonal, so the symmetrized operator
+    # F^(-1/2) A F^(-1/2), with F = diag(f) at the interior points, is too.
+    f_sqrt = jnp.sqrt(f[:, :, 1:-1])
+    # diagonal of the symmetrized operator; shape(N_alpha, N_zeta0, N_zeta-2)
+    d = (-(g_half[:, :, 1:] + g_half[:, :, :-1]) / h**2 + c[:, :, 1:-1]) / f[:, :, 1:-1]
+    # off-diagonal of the symmetrized operator; shape(N_alpha, N_zeta0, N_zeta-3)
+    e = g_half[:, :, 1:-1] / h**2 / (f_sqrt[:, :, 1:] * f_sqrt[:, :, :-1])
 
-    w, _ = jnp.linalg.eigh(A_redo)
-    # max over "zeta" axis, still a function of rho, alpha, zeta0
-    gamma = jnp.real(jnp.max(w, axis=(2,)))
+    # max eigenvalue, still a function of rho, alpha, zeta0
+    gamma = _eigvalsh_max_tridiagonal(d, e)
 
     data["ideal ballooning lambda"] = gamma.flatten()
 
@@ -216,6 +216,10 @@ def register_compute_fun(  # noqa: C901
                 raise ValueError(
                     f"Can't register function with unknown parameterization: {p}"
                 )
+        # cached compute plans may depend on what was registered before
+        from .utils import _clear_dependency_caches
+
+        _clear_dependency_caches()
         return func
 
     return _decorator
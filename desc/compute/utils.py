@@ -1,6 +1,7 @@
 """Functions for flux surface averages and vector algebra operations."""
 
 import copy
+import functools
 import inspect
 
 import numpy as np
@@ -33,6 +34,113 @@ def _parse_parameterization(p):
     return module + "." + klass.__qualname__
 
 
+@functools.lru_cache(maxsize=1024)
+def _compute_plan(p, names, has_axis, computed=frozenset()):
+    """Order in which to compute ``names`` and their missing dependencies.
+
+    Dependencies are visited depth first, in the order they are listed in the data
+    index, so that quantities are always computed (and traced) in the same order.
+    Plans only depend on the data index, so they are cached and shared between all
+    calls with the same arguments, eg from different objectives.
+
+    Parameters
+    ----------
+    p : str
+        Type of object to compute for, as returned by ``_parse_parameterization``.
+    names : tuple of str
+        Names of the quantities to compute.
+    has_axis : bool
+        Whether the grid to compute on has a node on the magnetic axis.
+    computed : frozenset of str
+        Names of quantities that have already been computed.
+
+    Returns
+    -------
+    plan : tuple of str
+        Names to compute, such that the dependencies of each name come before it.
+
+    """
+    plan = []
+    visited = set(computed)
+
+    def visit(name):
+        if name in visited:
+            return
+        visited.add(name)
+        deps = data_index[p][name]["dependencies"]
+        for dep in deps["data"]:
+            visit(dep)
+        if has_axis:
+            for dep in deps["axis_limit_data"]:
+                visit(dep)
+        plan.append(name)
+
+    for name in names:
+        visit(name)
+    return tuple(plan)
+
+
+def _transform_only(p, name):
+    """Transform, parameter and derivative order if name is a single transform.
+
+    Quantities like ``R_rt`` that are only a derivative of a spectral parameter are
+    registered with a single parameter ``X_lmn``, a single derivative of transform
+    ``X``, and no other dependencies.
+    """
+    deps = data_index[p][name]["dependencies"]
+    if deps["data"] or deps["profiles"] or len(deps["params"]) != 1:
+        return None
+    if len(deps["transforms"]) != 1:
+        return None
+    ((key, derivs),) = deps["transforms"].items()
+    if deps["params"][0] != key + "_lmn" or len(derivs) != 1:
+        return None
+    return key, deps["params"][0], tuple(derivs[0])
+
+
+@functools.lru_cache(maxsize=1024)
+def _transform_groups(p, plan):
+    """Quantities in a compute plan that can be computed with ``transform_all``.
+
+    Returns
+    -------
+    groups : tuple
+        Tuple of (transform, parameter, names, derivatives) for each transform that
+        is used by more than one quantity in ``plan``. ``names`` are the names to
+        store each derivative under, which may be aliases of the same quantity.
+
+    """
+    groups = {}
+    for name in plan:
+        fun = data_index[p][name]["fun"]
+        primary = (
+            fun.keywords["primary"] if isinstance(fun, functools.partial) else name
+        )
+        t = _transform_only(p, primary)
+        if t is None:
+            continue
+        group = groups.setdefault(t[:2], {})
+        group.setdefault(t[2], []).append(name)
+    return tuple(
+        (key, param, tuple(tuple(names) for names in group.values()), tuple(group))
+        for (key, param), group in groups.items()
+        if len(group) > 1
+    )
+
+
+def _clear_dependency_caches():
+    """Forget cached compute plans and dependencies, eg after changing data_index."""
+    for fun in [
+        _compute_plan,
+        _transform_groups,
+        _get_data_deps,
+        _get_derivs,
+        _get_param_names,
+        _get_profile_names,
+    ]:
+        fun.cache_clear()
+
+
 def compute(  # noqa: C901
     parameterization, names, params, transforms, profiles, data=None, **kwargs
 ):
@@ -114,9 +222,9 @@ def compute(  # noqa: C901
                     f"Expected grid with '{req}:{reqs[req]}' to compute {name}.",
                 )
 
-        _ = _get_deps(
-            p, names, set(), data, transforms["grid"].axis.size, check_fun=check_fun
-        )
+        has_axis = bool(transforms["grid"].axis.size)
+        for name in _compute_plan(p, tuple(names), has_axis, frozenset(data or ())):
+            check_fun(name)
 
     if data is None:
         data = {}
@@ -160,10 +268,10 @@ def _compute(
     of the cylindrical coordinates R, ϕ, Z.
 
     We need to directly call this function in objectives, since the checks in above
-    function are not compatible with JIT. This function computes given names while
-    using recursion to compute dependencies. If you want to call this function, you
-    cannot give the argument basis='xyz' since that will break the recursion. In that
-    case, either call above function or manually convert the output to xyz basis.
+    function are not compatible with JIT. This function computes given names and
+    their dependencies in the order given by a cached compute plan. If you want to
+    call this function, you cannot give the argument basis='xyz'. In that case,
+    either call above function or manually convert the output to xyz basis.
     """
     assert kwargs.get("basis", "rpz") == "rpz", "_compute only works in rpz coordinates"
     parameterization = _parse_parameterization(parameterization)
@@ -172,36 +280,22 @@ def _compute(
     if data is None:
         data = {}
 
-    for name in names:
+    plan = _compute_plan(
+        parameterization,
+        tuple(names),
+        bool(transforms["grid"].axis.size),
+        frozenset(data),
+    )
+    # evaluate all derivatives of the same transform at once
+    for key, param, names, derivs in _transform_groups(parameterization, plan):
+        x = transforms[key].transform_all(params[param], np.array(derivs))
+        for i, group in enumerate(names):
+            for name in group:
+                data[name] = x[i]
+    for name in plan:
         if name in data:
-            # don't compute something that's already been computed
+            # some functions compute more than one quantity
             continue
-        if not has_data_dependencies(
-            parameterization, name, data, transforms["grid"].axis.size
-        ):
-            # then compute the missing dependencies
-            data = _compute(
-                parameterization,
-                data_index[parameterization][name]["dependencies"]["data"],
-                params=params,
-                transforms=transforms,
-                profiles=profiles,
-                data=data,
-                **kwargs,
-            )
-            if transforms["grid"].axis.size:
-                data = _compute(
-                    parameterization,
-                    data_index[parameterization][name]["dependencies"][
-                        "axis_limit_data"
-                    ],
-                    params=params,
-                    transforms=transforms,
-                    profiles=profiles,
-                    data=data,
-                    **kwargs,
-                )
-        # now compute the quantity
         data = data_index[parameterization][name]["fun"](
             params=params, transforms=transforms, profiles=profiles, data=data, **kwargs
         )
@@ -234,18 +328,23 @@ def get_data_deps(keys, obj, has_axis=False, basis="rpz", data=None):
     p = _parse_parameterization(obj)
     keys = [keys] if isinstance(keys, str) else keys
     if not data:
-        out = []
-        for key in keys:
-            out += _get_deps_1_key(p, key, has_axis)
-        out = set(out)
+        out = set(_get_data_deps(p, tuple(keys), bool(has_axis)))
     else:
-        out = _get_deps(p, keys, deps=set(), data=data, has_axis=has_axis)
+        out = set(_compute_plan(p, tuple(keys), bool(has_axis), frozenset(data)))
         out.difference_update(keys)
     if basis.lower() == "xyz":
         out.add("phi")
     return sorted(out)
 
 
+@functools.lru_cache(maxsize=1024)
+def _get_data_deps(p, keys, has_axis):
+    out = []
+    for key in keys:
+        out += _get_deps_1_key(p, key, has_axis)
+    return tuple(sorted(set(out)))
+
+
 def _get_deps_1_key(p, key, has_axis):
     """Gather all quantities required to compute ``key``.
 
@@ -286,56 +385,6 @@ def _get_deps_1_key(p, key, has_axis):
     return sorted(set(out))
 
 
-def _get_deps(parameterization, names, deps, data=None, has_axis=False, check_fun=None):
-    """Gather all quantities required to compute ``names`` given already computed data.
-
-    Parameters
-    ----------
-    parameterization : str, class, or instance
-        Type of object to compute for, eg Equilibrium, Curve, etc.
-    names : str or array-like of str
-        Name(s) of the quantity(s) to compute.
-    deps : set[str]
-        Dependencies gathered so far.
-    data : dict[str, jnp.ndarray]
-        Data computed so far, generally output from other compute functions.
-    has_axis : bool
-        Whether the grid to compute on has a node on the magnetic axis.
-    check_fun : callable
-        If provided, ``check_fun(name)`` is called before adding name to ``deps``.
-
-    Returns
-    -------
-    deps : set[str]
-        All additional quantities required to compute ``names``.
-
-    """
-    p = _parse_parameterization(parameterization)
-    for name in names:
-        if name not in deps and (data is None or name not in data):
-            if check_fun is not None:
-                check_fun(name)
-            deps.add(name)
-            deps = _get_deps(
-                p,
-                data_index[p][name]["dependencies"]["data"],
-                deps,
-                data,
-                has_axis,
-                check_fun,
-            )
-            if has_axis:
-                deps = _get_deps(
-                    p,
-                    data_index[p][name]["dependencies"]["axis_limit_data"],
-                    deps,
-                    data,
-                    has_axis,
-                    check_fun,
-                )
-    return deps
-
-
 def _grow_seeds(parameterization, seeds, search_space, has_axis=False):
     """Return ``seeds`` plus keys in ``search_space`` with dependency in ``seeds``.
 
@@ -392,7 +441,12 @@ def get_derivs(keys, obj, has_axis=False, basis="rpz"):
     """
     p = _parse_parameterization(obj)
     keys = [keys] if isinstance(keys, str) else keys
+    derivs = _get_derivs(p, tuple(keys), bool(has_axis), basis)
+    return {key: [list(d) for d in val] for key, val in derivs.items()}
 
+
+@functools.lru_cache(maxsize=1024)
+def _get_derivs(p, keys, has_axis, basis):
     def _get_derivs_1_key(key):
         if has_axis:
             if "full_with_axis_dependencies" in data_index[p][key]:
@@ -415,7 +469,10 @@ def get_derivs(keys, obj, has_axis=False, basis="rpz"):
             if key1 not in derivs:
                 derivs[key1] = []
             derivs[key1] += val
-    return {key: np.unique(val, axis=0).tolist() for key, val in derivs.items()}
+    return {
+        key: tuple(map(tuple, np.unique(val, axis=0).tolist()))
+        for key, val in derivs.items()
+    }
 
 
 def get_profiles(keys, obj, grid=None, has_axis=False, basis="rpz"):
@@ -446,11 +503,7 @@ def get_profiles(keys, obj, grid=None, has_axis=False, basis="rpz"):
     p = _parse_parameterization(obj)
     keys = [keys] if isinstance(keys, str) else keys
     has_axis = has_axis or (grid is not None and grid.axis.size)
-    deps = list(keys) + get_data_deps(keys, p, has_axis=has_axis, basis=basis)
-    profs = []
-    for key in deps:
-        profs += data_index[p][key]["dependencies"]["profiles"]
-    profs = sorted(set(profs))
+    profs = list(_get_profile_names(p, tuple(keys), bool(has_axis), basis))
     if isinstance(obj, str) or inspect.isclass(obj):
         return profs
     # need to use copy here because profile may be None
@@ -458,6 +511,15 @@ def get_profiles(keys, obj, grid=None, has_axis=False, basis="rpz"):
     return profiles
 
 
+@functools.lru_cache(maxsize=1024)
+def _get_profile_names(p, keys, has_axis, basis):
+    deps = list(keys) + get_data_deps(keys, p, has_axis=has_axis, basis=basis)
+    profs = []
+    for key in deps:
+        profs += data_index[p][key]["dependencies"]["profiles"]
+    return tuple(sorted(set(profs)))
+
+
 @execute_on_cpu
 def get_params(keys, obj, has_axis=False, basis="rpz"):
     """Get parameters needed to compute a given quantity.
@@ -483,10 +545,7 @@ def get_params(keys, obj, has_axis=False, basis="rpz"):
     """
     p = _parse_parameterization(obj)
     keys = [keys] if isinstance(keys, str) else keys
-    deps = list(keys) + get_data_deps(keys, p, has_axis=has_axis, basis=basis)
-    params = []
-    for key in deps:
-        params += data_index[p][key]["dependencies"]["params"]
+    params = list(_get_param_names(p, tuple(keys), bool(has_axis), basis))
     if isinstance(obj, str) or inspect.isclass(obj):
         return params
     temp_params = {}
@@ -499,6 +558,15 @@ def get_params(keys, obj, has_axis=False, basis="rpz"):
     return temp_params
 
 
+@functools.lru_cache(maxsize=1024)
+def _get_param_names(p, keys, has_axis, basis):
+    deps = list(keys) + get_data_deps(keys, p, has_axis=has_axis, basis=basis)
+    params = []
+    for key in deps:
+        params += data_index[p][key]["dependencies"]["params"]
+    return tuple(params)
+
+
 @execute_on_cpu
 def get_transforms(
     keys, obj, grid, jitable=False, has_axis=False, basis="rpz", **kwargs
@@ -1,12 +1,18 @@
 """Functions for solving for equilibria with multigrid continuation method."""
 
 import copy
+import multiprocessing
+import os
 import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import numpy as np
 from termcolor import colored
 
+import desc
 from desc.equilibrium import EquilibriaFamily, Equilibrium
+from desc.geometry import FourierRZToroidalSurface
+from desc.io import load
 from desc.objectives import get_equilibrium_objective, get_fixed_boundary_constraints
 from desc.optimize import Optimizer
 from desc.perturbations import get_deltas
@@ -30,8 +36,13 @@ def _solve_axisym(
     verbose=1,
     checkpoint_path=None,
     jac_chunk_size="auto",
+    eqfam=None,
 ):
-    """Solve initial axisymmetric case with adaptive step sizing."""
+    """Solve initial axisymmetric case with adaptive step sizing.
+
+    If ``eqfam`` is given, continues from its last member, which should be a step of
+    an interrupted continuation.
+    """
     timer = Timer()
 
     surface = eq.surface
@@ -46,8 +57,17 @@ def _solve_axisym(
     M_gridi = np.ceil(M_grid / M * Mi).astype(int)
     N_gridi = np.ceil(N_grid / max(N, 1) * Ni).astype(int)
 
+    eqfam_temp = EquilibriaFamily() if eqfam is None else eqfam.copy()
+    eqfam = eqfam_temp.copy()
+
     # first we solve vacuum until we reach full L,M
-    mres_steps = int(max(np.ceil(M / mres_step), 1)) if mres_step > 0 else 0
+    if len(eqfam):
+        Mi = eqfam[-1].M
+        mres_steps = len(eqfam) + (
+            int(np.ceil((M - Mi) / mres_step)) if mres_step > 0 else 0
+        )
+    else:
+        mres_steps = int(max(np.ceil(M / mres_step), 1)) if mres_step > 0 else 0
     deltas = {}
 
     surf_axisym = surface.copy()
@@ -76,10 +96,10 @@ def _solve_axisym(
     if not isinstance(optimizer, Optimizer):
         optimizer = Optimizer(optimizer)
 
-    eqfam = EquilibriaFamily()
-
-    ii = 0
+    ii = len(eqfam)
     stop = False
+    # after the first checkpoint only the new members are written to it
+    checkpoint_mode = "w"
     while ii < mres_steps and not stop:
         timer.start("Iteration {} total".format(ii + 1))
 
@@ -149,7 +169,8 @@ def _solve_axisym(
         if checkpoint_path is not None:
             if verbose > 0:
                 print("Saving latest iteration")
-            eqfam.save(checkpoint_path)
+            eqfam.save(checkpoint_path, file_mode=checkpoint_mode, append=True)
+            checkpoint_mode = "a"
         timer.stop("Iteration {} total".format(ii + 1))
         if verbose > 1:
             timer.disp("Iteration {} total".format(ii + 1))
@@ -181,6 +202,7 @@ def _solve_axisym(
                 maxiter,
                 verbose,
                 checkpoint_path,
+                eqfam=eqfam_temp,
             )
 
     return eqfam
@@ -209,22 +231,26 @@ def _add_pressure(
     # make sure its at full radial/poloidal resolution
     eqi.change_resolution(L=eq.L, M=eq.M, L_grid=eq.L_grid, M_grid=eq.M_grid)
 
+    # nonzero if resuming an interrupted continuation partway through this stage
+    pres_ratio0 = _get_ratio(eqi.pressure, eq.pressure)
     pres_steps = (
         0
         if (abs(eq.pressure(np.linspace(0, 1, 20))) < 1e-14).all() or pres_step == 0
-        else int(np.ceil(1 / pres_step))
+        else int(np.ceil(np.round((1 - pres_ratio0) / pres_step, 8)))
     )
-    pres_ratio = 0 if pres_steps else 1
+    pres_ratio = pres_ratio0
 
     ii = len(eqfam_temp)
     stop = False
+    # after the first checkpoint only the new members are written to it
+    checkpoint_mode = "w"
     while ii - len(eqfam_temp) < pres_steps and not stop:
         timer.start("Iteration {} total".format(ii + 1))
         # increase pressure
         deltas = get_deltas(
             {"pressure": eqfam_temp[-1].pressure}, {"pressure": eq.pressure}
         )
-        deltas["p_l"] *= pres_step
+        deltas["p_l"] *= pres_step / (1 - pres_ratio0)
         pres_ratio += pres_step
 
         constraints_i = get_fixed_boundary_constraints(eq=eqi)
@@ -278,7 +304,8 @@ def _add_pressure(
         if checkpoint_path is not None:
             if verbose > 0:
                 print("Saving latest iteration")
-            eqfam.save(checkpoint_path)
+            eqfam.save(checkpoint_path, file_mode=checkpoint_mode, append=True)
+            checkpoint_mode = "a"
         timer.stop("Iteration {} total".format(ii + 1))
         if verbose > 1:
             timer.disp("Iteration {} total".format(ii + 1))
@@ -340,23 +367,30 @@ def _add_shaping(
     # make sure its at full resolution
     eqi.change_resolution(eq.L, eq.M, eq.N, eq.L_grid, eq.M_grid, eq.N_grid)
 
-    bdry_steps = 0 if eq.N == 0 or bdry_step == 0 else int(np.ceil(1 / bdry_step))
-    bdry_ratio = 0 if eq.N else 1
+    # nonzero if resuming an interrupted continuation partway through this stage,
+    # the stage starts at full toroidal resolution
+    bdry_ratio0 = _get_ratio(eqi.surface, eq.surface) if eqfam[-1].N == eq.N else 0
+    bdry_steps = (
+        0
+        if eq.N == 0 or bdry_step == 0
+        else int(np.ceil(np.round((1 - bdry_ratio0) / bdry_step, 8)))
+    )
+    bdry_ratio = bdry_ratio0
 
-    surf_axisym = eq.surface.copy()
-    surf_axisym.change_resolution(eq.L, eq.M, 0)
-    surf_axisym.change_resolution(eq.L, eq.M, eq.N)
+    surf_start = eqi.surface.copy()
 
     ii = len(eqfam_temp)
     stop = False
+    # after the first checkpoint only the new members are written to it
+    checkpoint_mode = "w"
     while ii - len(eqfam_temp) < bdry_steps and not stop:
         timer.start("Iteration {} total".format(ii + 1))
         # increase shaping
-        deltas = get_deltas({"surface": surf_axisym}, {"surface": eq.surface})
+        deltas = get_deltas({"surface": surf_start}, {"surface": eq.surface})
         if "Rb_lmn" in deltas:
-            deltas["Rb_lmn"] *= bdry_step
+            deltas["Rb_lmn"] *= bdry_step / (1 - bdry_ratio0)
         if "Zb_lmn" in deltas:
-            deltas["Zb_lmn"] *= bdry_step
+            deltas["Zb_lmn"] *= bdry_step / (1 - bdry_ratio0)
         bdry_ratio += bdry_step
 
         constraints_i = get_fixed_boundary_constraints(eq=eqi)
@@ -410,7 +444,8 @@ def _add_shaping(
         if checkpoint_path is not None:
             if verbose > 0:
                 print("Saving latest iteration")
-            eqfam.save(checkpoint_path)
+            eqfam.save(checkpoint_path, file_mode=checkpoint_mode, append=True)
+            checkpoint_mode = "a"
         timer.stop("Iteration {} total".format(ii + 1))
         if verbose > 1:
             timer.disp("Iteration {} total".format(ii + 1))
@@ -506,6 +541,52 @@ def solve_continuation_automatic(  # noqa: C901
         family of equilibria for the intermediate steps, where the last member is the
         final desired configuration,
 
+    """
+    mres_step = kwargs.pop("mres_step", 6)
+    pres_step = kwargs.pop("pres_step", 1 / 2)
+    bdry_step = kwargs.pop("bdry_step", 1 / 4)
+    assert len(kwargs) == 0, "Got an unexpected kwarg {}".format(kwargs.keys())
+
+    return _solve_continuation_automatic(
+        eq,
+        None,
+        mres_step,
+        pres_step,
+        bdry_step,
+        objective,
+        optimizer,
+        pert_order,
+        ftol,
+        xtol,
+        gtol,
+        maxiter,
+        verbose,
+        checkpoint_path,
+        jac_chunk_size,
+    )
+
+
+def _solve_continuation_automatic(  # noqa: C901
+    eq,
+    eqfam,
+    mres_step,
+    pres_step,
+    bdry_step,
+    objective="force",
+    optimizer="lsq-exact",
+    pert_order=2,
+    ftol=None,
+    xtol=None,
+    gtol=None,
+    maxiter=100,
+    verbose=1,
+    checkpoint_path=None,
+    jac_chunk_size="auto",
+):
+    """Run the steps of solve_continuation_automatic.
+
+    If ``eqfam`` is given, it should hold the steps saved by an interrupted
+    continuation, and only the remaining steps are solved.
     """
     errorif(
         eq.electron_temperature is not None,
@@ -520,10 +601,6 @@ def solve_continuation_automatic(  # noqa: C901
     timer = Timer()
     timer.start("Total time")
 
-    mres_step = kwargs.pop("mres_step", 6)
-    pres_step = kwargs.pop("pres_step", 1 / 2)
-    bdry_step = kwargs.pop("bdry_step", 1 / 4)
-    assert len(kwargs) == 0, "Got an unexpected kwarg {}".format(kwargs.keys())
     if not isinstance(optimizer, Optimizer):
         optimizer = Optimizer(optimizer)
 
@@ -540,6 +617,7 @@ def solve_continuation_automatic(  # noqa: C901
         verbose,
         checkpoint_path,
         jac_chunk_size=jac_chunk_size,
+        eqfam=eqfam,
     )
 
     # for zero current we want to do shaping before pressure to avoid having a
@@ -709,6 +787,9 @@ def solve_continuation(  # noqa: C901
     ii = 0
     nn = len(eqfam)
     stop = False
+    # checkpoints hold the members solved so far, after the first one only the
+    # latest member is written
+    checkpoint_mode = "w"
     while ii < nn and not stop:
         timer.start("Iteration {} total".format(ii + 1))
         eqi = eqfam[ii]
@@ -792,7 +873,10 @@ def solve_continuation(  # noqa: C901
         if checkpoint_path is not None:
             if verbose > 0:
                 print("Saving latest iteration")
-            eqfam.save(checkpoint_path)
+            EquilibriaFamily(*eqfam[: ii + 1]).save(
+                checkpoint_path, file_mode=checkpoint_mode, append=True
+            )
+            checkpoint_mode = "a"
         timer.stop("Iteration {} total".format(ii + 1))
         if verbose > 1:
             timer.disp("Iteration {} total".format(ii + 1))
@@ -807,12 +891,271 @@ def solve_continuation(  # noqa: C901
     if checkpoint_path is not None:
         if verbose > 0:
             print("Output written to {}".format(checkpoint_path))
-        eqfam.save(checkpoint_path)
+        eqfam.save(checkpoint_path, file_mode=checkpoint_mode, append=True)
     if verbose:
         print("====================")
     return eqfam
 
 
+def solve_continuation_batch(  # noqa: C901
+    eqs,
+    output_path,
+    num_workers=None,
+    devices=None,
+    resume=True,
+    objective="force",
+    optimizer="lsq-exact",
+    pert_order=2,
+    ftol=None,
+    xtol=None,
+    gtol=None,
+    maxiter=100,
+    verbose=1,
+    jac_chunk_size="auto",
+    **kwargs,
+):
+    """Solve many independent equilibria with automatic continuation in parallel.
+
+    Each equilibrium is solved with ``solve_continuation_automatic`` in its own
+    worker process. Finished equilibria are written to ``output_path`` as they
+    complete, and every continuation step is checkpointed so that an interrupted
+    batch can be restarted by calling this function again with the same arguments.
+
+    Parameters
+    ----------
+    eqs : list of Equilibrium, dict or FourierRZToroidalSurface
+        Unsolved equilibria with the final desired boundary, profiles, resolution.
+        Dictionaries are passed as inputs to ``Equilibrium``, and surfaces are used
+        as the boundary of an ``Equilibrium`` with default profiles.
+    output_path : str or path-like
+        HDF5 file to store the solved equilibria in, as an ``EquilibriaFamily``.
+        While the batch runs, each finished equilibrium is appended to the file and
+        its index in ``eqs`` to a text file next to it, named
+        ``<output_path>_index.txt``. Once all are done the file is rewritten in the
+        order of ``eqs``, so that line ``k`` of the index file is always the index
+        in ``eqs`` of member ``k`` of the file. Checkpoints of the continuation
+        steps are kept in a directory next to it, named
+        ``<output_path>_checkpoints``.
+    num_workers : int, optional
+        Number of worker processes. Defaults to the number of ``devices`` if given,
+        otherwise to ``min(len(eqs), os.cpu_count())``.
+    devices : list, optional
+        Devices to pin the workers to, worker ``i`` uses ``devices[i % len(devices)]``.
+        When running on GPU these are GPU ids, on CPU they are CPU cores (int or list
+        of int) to restrict each worker to. Default is to not pin workers.
+    resume : bool
+        Whether to reuse results from a previous call with the same ``output_path``.
+        Finished equilibria are loaded instead of solved again, and unfinished ones
+        continue from their last checkpointed step.
+    objective : {"force", "energy"}
+        function to solve for equilibrium solution
+    optimizer : str or Optimizer (optional)
+        optimizer to use
+    pert_order : int
+        order of perturbations to use.
+    ftol, xtol, gtol : float
+        stopping tolerances for subproblem at each step. `None` will use defaults
+        for given optimizer.
+    maxiter : int
+        maximum number of iterations in each equilibrium subproblem.
+    verbose : integer
+        * 0: no output
+        * 1: print progress as equilibria finish
+        * 2: as above plus detailed solver output from the workers
+    **kwargs : dict, optional
+        ``mres_step``, ``pres_step`` and ``bdry_step`` passed to
+        ``solve_continuation_automatic``.
+
+    Returns
+    -------
+    eqfam : EquilibriaFamily
+        Solved equilibria in the order of ``eqs``, the same as in ``output_path``.
+        Equilibria that failed to solve are left out with a warning, the index
+        file gives the index in ``eqs`` of each member.
+
+    Notes
+    -----
+    Worker processes are started with the "spawn" method, so scripts calling this
+    function should protect their entry point with ``if __name__ == "__main__":``.
+
+    """
+    eqs = [_as_equilibrium(eq) for eq in eqs]
+    output_path = os.fspath(output_path)
+    index_path = os.path.splitext(output_path)[0] + "_index.txt"
+    checkpoint_dir = os.path.splitext(output_path)[0] + "_checkpoints"
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    done_paths = [os.path.join(checkpoint_dir, f"done_{i}.h5") for i in range(len(eqs))]
+    step_paths = [os.path.join(checkpoint_dir, f"step_{i}.h5") for i in range(len(eqs))]
+    if not resume:
+        for path in done_paths + step_paths + [output_path, index_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    solve_kwargs = dict(
+        objective=objective,
+        optimizer=optimizer,
+        pert_order=pert_order,
+        ftol=ftol,
+        xtol=xtol,
+        gtol=gtol,
+        maxiter=maxiter,
+        verbose=max(verbose - 1, 0),
+        jac_chunk_size=jac_chunk_size,
+        **kwargs,
+    )
+
+    # input indices of the equilibria in output_path, in the order they were saved
+    indices = _saved_batch_indices(output_path, index_path, done_paths)
+    for i in indices:
+        eqs[i].params_dict = load(done_paths[i]).params_dict
+
+    def _save():
+        # in append mode only the equilibria that are not in the file yet are
+        # written, and any left over from an interrupted save are removed
+        EquilibriaFamily(*[eqs[j] for j in indices]).save(
+            output_path, file_format="hdf5", file_mode="a", append=True
+        )
+        np.savetxt(index_path + ".tmp", indices, fmt="%d")
+        os.replace(index_path + ".tmp", index_path)
+
+    def _finish(i):
+        eqs[i].params_dict = load(done_paths[i]).params_dict
+        indices.append(i)
+        _save()
+        if verbose > 0:
+            print(f"Finished equilibrium {i} ({len(indices)}/{len(eqs)} done)")
+
+    _save()
+    todo = []
+    for i in range(len(eqs)):
+        if i in indices:
+            continue
+        if os.path.exists(done_paths[i]):
+            _finish(i)
+        else:
+            todo.append(i)
+
+    if len(todo):
+        if num_workers is None:
+            num_workers = len(devices) if devices else min(len(todo), os.cpu_count())
+        ctx = multiprocessing.get_context("spawn")
+        counter = ctx.Value("i", 0)
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=ctx,
+            initializer=desc._set_worker_device,
+            initargs=(counter, desc.config.get("kind") or "cpu", devices),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _continuation_task,
+                    eqs[i],
+                    done_paths[i],
+                    step_paths[i],
+                    solve_kwargs,
+                ): i
+                for i in todo
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    warnings.warn(
+                        colored(
+                            f"Continuation for equilibrium {i} failed with {e!r}",
+                            "yellow",
+                        )
+                    )
+                    continue
+                _finish(i)
+
+    if indices != sorted(indices):
+        # put the file in input order. Without the index file a resumed batch
+        # writes the file again from the finished equilibria, so an interruption
+        # here can't leave the file and the index out of step
+        indices.sort()
+        EquilibriaFamily(*[eqs[i] for i in indices]).save(
+            output_path + ".tmp", file_format="hdf5"
+        )
+        os.remove(index_path)
+        os.replace(output_path + ".tmp", output_path)
+        np.savetxt(index_path + ".tmp", indices, fmt="%d")
+        os.replace(index_path + ".tmp", index_path)
+
+    return EquilibriaFamily(*[eqs[i] for i in indices])
+
+
+def _saved_batch_indices(output_path, index_path, done_paths):
+    """Read which equilibria of a batch are already saved, in the order they are."""
+    if not (os.path.exists(output_path) and os.path.exists(index_path)):
+        return []
+    try:
+        num_saved = len(load(output_path))
+    except Exception:
+        # file was only partially written, so start it again
+        os.remove(output_path)
+        return []
+    with open(index_path) as f:
+        saved = [int(i) for i in f.read().split()]
+    indices = []
+    for i in saved[:num_saved]:
+        if not (0 <= i < len(done_paths) and os.path.exists(done_paths[i])):
+            # from a different batch, or its result was removed, so everything
+            # after it has to be written again
+            break
+        indices.append(i)
+    return indices
+
+
+def _as_equilibrium(eq):
+    if isinstance(eq, Equilibrium):
+        return eq
+    if isinstance(eq, dict):
+        return Equilibrium(**eq)
+    if isinstance(eq, FourierRZToroidalSurface):
+        return Equilibrium(surface=eq)
+    raise TypeError(
+        "Inputs should be Equilibrium, dictionary or FourierRZToroidalSurface, "
+        + f"got {type(eq)}"
+    )
+
+
+def _continuation_task(eq, done_path, checkpoint_path, solve_kwargs):
+    """Solve one equilibrium of a batch, resuming from its checkpoint if it exists."""
+    eqfam = None
+    if os.path.exists(checkpoint_path):
+        try:
+            eqfam = load(checkpoint_path)
+        except Exception:
+            # checkpoint was only partially written
+            eqfam = None
+    if eqfam is not None:
+        # a step that failed is saved before it is retried with a smaller step
+        while len(eqfam) and not eqfam[-1].is_nested():
+            del eqfam[-1]
+        if len(eqfam) == 0:
+            eqfam = None
+        elif solve_kwargs.get("verbose", 0) > 0:
+            print(f"Resuming continuation after step {len(eqfam)}")
+    solve_kwargs = solve_kwargs.copy()
+    mres_step = solve_kwargs.pop("mres_step", 6)
+    pres_step = solve_kwargs.pop("pres_step", 1 / 2)
+    bdry_step = solve_kwargs.pop("bdry_step", 1 / 4)
+    eqfam = _solve_continuation_automatic(
+        eq,
+        eqfam,
+        mres_step,
+        pres_step,
+        bdry_step,
+        checkpoint_path=checkpoint_path,
+        **solve_kwargs,
+    )
+    eqfam[-1].save(done_path + ".tmp", file_format="hdf5")
+    os.replace(done_path + ".tmp", done_path)
+    return done_path
+
+
 def _get_ratio(thing1, thing2):
     """Figure out bdry_ratio, pres_ratio etc from objects."""
     if thing1 is None or thing2 is None:
@@ -1,3 +1,4 @@
 """Core class representing MHD equilibrium, and utilities for creating them."""
 
+from .coords import CoordinateMapper
 from .equilibrium import EquilibriaFamily, Equilibrium
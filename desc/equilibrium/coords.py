@@ -1,15 +1,34 @@
 """Functions for mapping between flux, sfl, and real space coordinates."""
 
 import functools
+import hashlib
 
 import numpy as np
-
-from desc.backend import fori_loop, jit, jnp, put, root, root_scalar, vmap
+from scipy.spatial import cKDTree
+
+from desc.backend import (
+    fori_loop,
+    jax,
+    jit,
+    jnp,
+    put,
+    root,
+    root_scalar,
+    tree_leaves,
+    vmap,
+)
 from desc.compute import compute as compute_fun
 from desc.compute import data_index, get_data_deps, get_profiles, get_transforms
 from desc.grid import ConcentricGrid, Grid, LinearGrid, QuadratureGrid
 from desc.transform import Transform
-from desc.utils import check_posint, errorif, safenorm, setdefault, warnif
+from desc.utils import (
+    check_posint,
+    errorif,
+    lru_cache_by_key,
+    safenorm,
+    setdefault,
+    warnif,
+)
 
 
 def _periodic(x, period):
@@ -58,6 +77,8 @@ def map_coordinates(  # noqa: C901
         Initial guess for the computational coordinates ['rho', 'theta', 'zeta']
         corresponding to ``coords`` in ``inbasis``. If not given, then heuristics
         based on ``inbasis`` or a nearest neighbor search on a grid may be used.
+        The spatial index used for the nearest neighbor search is cached, so
+        repeated calls with the same equilibrium only pay for the lookup.
         In general, this must be given to be compatible with JIT.
     params : dict
         Values of equilibrium parameters to use, e.g. ``eq.params_dict``.
@@ -146,10 +167,71 @@ def map_coordinates(  # noqa: C901
         profiles["iota"] = eq.get_profile(["iota", "iota_r"], params=params)
         params["i_l"] = profiles["iota"].params
 
-    rhomin = kwargs.pop("rhomin", tol / 10)
     period = np.asarray(setdefault(period, (np.inf, np.inf, np.inf)))
     coords = _periodic(coords, period)
 
+    compute, fixup, vecroot = _get_root_functions(
+        eq,
+        inbasis,
+        outbasis,
+        basis_derivs,
+        params,
+        profiles,
+        period,
+        tol,
+        maxiter,
+        **kwargs,
+    )
+
+    yk = guess
+    if yk is None:
+        yk = _initial_guess_heuristic(yk, coords, inbasis, eq, profiles)
+    if yk is None:
+        yk = _initial_guess_nn_search(
+            coords, inbasis, eq, period, compute, params, profiles
+        )
+
+    yk = fixup(yk)
+
+    # See description here
+    # https://github.com/PlasmaControl/DESC/pull/504#discussion_r1194172532
+    # except we make sure properly handle periodic coordinates.
+    yk, (res, niter) = vecroot(yk, coords)
+
+    out = compute(yk, outbasis)
+    if full_output:
+        return out, (res, niter)
+    return out
+
+
+def _get_root_functions(
+    eq,
+    inbasis,
+    outbasis,
+    basis_derivs,
+    params,
+    profiles,
+    period,
+    tol,
+    maxiter,
+    **kwargs,
+):
+    """Build the jitted functions used to solve for computational coordinates.
+
+    Returns
+    -------
+    compute : callable
+        ``compute(y, basis)`` evaluates the quantities in ``basis`` at the
+        computational coordinates ``y``.
+    fixup : callable
+        ``fixup(y)`` maps ``y`` back into the computational domain.
+    vecroot : callable
+        ``vecroot(yk, coords)`` solves for the computational coordinates of each
+        row of ``coords`` starting from ``yk``, returning the solution and a tuple
+        of the norm of the residual and number of iterations for each point.
+
+    """
+    rhomin = kwargs.pop("rhomin", tol / 10)
     p = "desc.equilibrium.equilibrium.Equilibrium"
     names = inbasis + basis_derivs + outbasis
     deps = list(set(get_data_deps(names, obj=p) + list(names)))
@@ -190,14 +272,6 @@ def map_coordinates(  # noqa: C901
         y = jnp.array([r, t, z]).T
         return y
 
-    yk = guess
-    if yk is None:
-        yk = _initial_guess_heuristic(yk, coords, inbasis, eq, profiles)
-    if yk is None:
-        yk = _initial_guess_nn_search(coords, inbasis, eq, period, compute)
-
-    yk = fixup(yk)
-
     vecroot = jit(
         vmap(
             lambda x0, *p: root(
@@ -208,23 +282,218 @@ def map_coordinates(  # noqa: C901
                 fixup=fixup,
                 tol=tol,
                 maxiter=maxiter,
-                full_output=full_output,
+                full_output=True,
                 **kwargs,
             )
         )
     )
-    # See description here
-    # https://github.com/PlasmaControl/DESC/pull/504#discussion_r1194172532
-    # except we make sure properly handle periodic coordinates.
-    if full_output:
-        yk, (res, niter) = vecroot(yk, coords)
-    else:
-        yk = vecroot(yk, coords)
+    return compute, fixup, vecroot
 
-    out = compute(yk, outbasis)
-    if full_output:
-        return out, (res, niter)
-    return out
+
+class CoordinateMapper:
+    """Reusable map from ``inbasis`` to ``outbasis`` coordinates of an equilibrium.
+
+    Equivalent to calling ``map_coordinates`` repeatedly with the same equilibrium
+    and bases, but the compute functions are built and compiled once. Queries are
+    split into chunks of at most ``chunk_size`` points and each chunk is padded to
+    a power of two number of points, so batches of any size reuse a small set of
+    compiled functions and arbitrarily large arrays of points (including memory
+    mapped arrays) can be streamed through without holding intermediate data for
+    all of them at once.
+
+    The equilibrium parameters are captured when the mapper is created. If the
+    equilibrium changes, a new mapper should be created.
+
+    Parameters
+    ----------
+    eq : Equilibrium
+        Equilibrium to use.
+    inbasis, outbasis : tuple of str
+        Labels for input and output coordinates, e.g. ("R", "phi", "Z") or
+        ("rho", "alpha", "zeta") or any combination thereof. Labels should be the
+        same as the compute function data key.
+    params : dict
+        Values of equilibrium parameters to use, e.g. ``eq.params_dict``.
+    period : tuple of float
+        Assumed periodicity for each quantity in ``inbasis``.
+        Use ``np.inf`` to denote no periodicity.
+    tol : float
+        Stopping tolerance.
+    maxiter : int
+        Maximum number of Newton iterations.
+    chunk_size : int
+        Maximum number of points solved for at once.
+    kwargs : dict, optional
+        Additional keyword arguments to pass to ``root`` such as ``maxiter_ls``,
+        ``alpha``.
+
+    """
+
+    _min_bucket = 64
+
+    def __init__(
+        self,
+        eq,
+        inbasis,
+        outbasis=("rho", "theta", "zeta"),
+        params=None,
+        period=None,
+        tol=1e-6,
+        maxiter=30,
+        chunk_size=2**14,
+        **kwargs,
+    ):
+        check_posint(maxiter, allow_none=False)
+        check_posint(chunk_size, "chunk_size", False)
+        errorif(
+            not np.isfinite(tol) or tol <= 0,
+            ValueError,
+            f"tol must be a positive float, got {tol}",
+        )
+        self._eq = eq
+        self._inbasis = tuple(inbasis)
+        self._outbasis = tuple(outbasis)
+        self._params = dict(setdefault(params, eq.params_dict))
+        self._period = np.asarray(setdefault(period, (np.inf, np.inf, np.inf)))
+        self._tol = tol
+        self._chunk_size = chunk_size
+
+        basis_derivs = tuple(f"{X}_{d}" for X in self._inbasis for d in ("r", "t", "z"))
+        for key in basis_derivs:
+            errorif(
+                key not in data_index["desc.equilibrium.equilibrium.Equilibrium"],
+                NotImplementedError,
+                f"don't have recipe to compute partial derivative {key}",
+            )
+        self._profiles = get_profiles(self._inbasis + basis_derivs, eq)
+        if "iota" in self._profiles and self._profiles["iota"] is None:
+            self._profiles["iota"] = eq.get_profile(
+                ["iota", "iota_r"], params=self._params
+            )
+            self._params["i_l"] = self._profiles["iota"].params
+
+        self._compute, self._fixup, self._vecroot = _get_root_functions(
+            eq,
+            self._inbasis,
+            self._outbasis,
+            basis_derivs,
+            self._params,
+            self._profiles,
+            self._period,
+            tol,
+            maxiter,
+            **kwargs,
+        )
+
+    @property
+    def inbasis(self):
+        """tuple: Labels of the input coordinates."""
+        return self._inbasis
+
+    @property
+    def outbasis(self):
+        """tuple: Labels of the output coordinates."""
+        return self._outbasis
+
+    @property
+    def chunk_size(self):
+        """int: Maximum number of points solved for at once."""
+        return self._chunk_size
+
+    def _bucket_size(self, n):
+        size = min(self._min_bucket, self._chunk_size)
+        while size < n:
+            size *= 2
+        return min(size, self._chunk_size)
+
+    def _map_chunk(self, coords, guess):
+        n = coords.shape[0]
+        coords = _periodic(np.asarray(coords, dtype=float), self._period)
+        if guess is None:
+            guess = _initial_guess_heuristic(
+                guess, coords, self._inbasis, self._eq, self._profiles
+            )
+        if guess is None:
+            guess = _initial_guess_nn_search(
+                coords,
+                self._inbasis,
+                self._eq,
+                self._period,
+                self._compute,
+                self._params,
+                self._profiles,
+            )
+        # pad with copies of the last point so the compiled functions only ever
+        # see a few distinct shapes
+        pad = ((0, self._bucket_size(n) - n), (0, 0))
+        coords = np.pad(coords, pad, mode="edge")
+        guess = np.pad(np.asarray(guess, dtype=float), pad, mode="edge")
+        yk, (res, niter) = self._vecroot(self._fixup(guess), coords)
+        out = self._compute(yk, self._outbasis)
+        return (
+            np.asarray(out)[:n],
+            np.asarray(res)[:n],
+            np.asarray(niter)[:n].astype(int),
+        )
+
+    def map(self, coords, guess=None, full_output=False):
+        """Transform coordinates given in ``inbasis`` to ``outbasis``.
+
+        Parameters
+        ----------
+        coords : ndarray
+            Shape (k, 3).
+            2D array of input coordinates. Each row is a different point in space.
+            Any array supporting slicing along the first axis may be given, e.g. a
+            memory mapped array, and only one chunk is loaded at a time.
+        guess : ndarray
+            Shape (k, 3).
+            Initial guess for the computational coordinates ['rho', 'theta', 'zeta']
+            corresponding to ``coords`` in ``inbasis``. If not given, then
+            heuristics based on ``inbasis`` or a nearest neighbor search on a grid
+            may be used.
+        full_output : bool, optional
+            If True, also return convergence diagnostics for each point.
+
+        Returns
+        -------
+        out : ndarray
+            Shape (k, 3).
+            Coordinates mapped from ``inbasis`` to ``outbasis``. Values of NaN will
+            be returned for coordinates where root finding did not succeed, possibly
+            because the coordinate is not in the plasma volume.
+        info : dict of ndarray
+            Dictionary with the norm of the residual ``"residual"``, the number of
+            iterations ``"niter"`` and whether the residual reached the stopping
+            tolerance ``"converged"`` for each point, each of shape (k, ). Only
+            returned if ``full_output`` is True.
+
+        """
+        if not hasattr(coords, "shape"):
+            coords = np.asarray(coords)
+        if guess is not None and not hasattr(guess, "shape"):
+            guess = np.asarray(guess)
+        k = coords.shape[0]
+        if guess is not None:
+            errorif(
+                guess.shape[0] != k,
+                ValueError,
+                f"guess should have {k} rows, got {guess.shape[0]}",
+            )
+        out = np.empty((k, len(self._outbasis)))
+        res = np.empty(k)
+        niter = np.empty(k, dtype=int)
+        for i in range(0, k, self._chunk_size):
+            s = slice(i, min(i + self._chunk_size, k))
+            out[s], res[s], niter[s] = self._map_chunk(
+                coords[s], guess[s] if guess is not None else None
+            )
+        if full_output:
+            converged = res <= self._tol
+            return out, {"residual": res, "niter": niter, "converged": converged}
+        return out
+
+    __call__ = map
 
 
 def _initial_guess_heuristic(yk, coords, inbasis, eq, profiles):
@@ -268,8 +537,86 @@ def _initial_guess_heuristic(yk, coords, inbasis, eq, profiles):
     return yk
 
 
-def _initial_guess_nn_search(coords, inbasis, eq, period, compute):
+def _hash_update(h, x):
+    """Add the values in x, possibly nested containers or IOAble objects, to h."""
+    if hasattr(x, "_io_attrs_"):
+        h.update(type(x).__name__.encode())
+        for attr in x._io_attrs_:
+            _hash_update(h, getattr(x, attr, None))
+    elif isinstance(x, dict):
+        for key in sorted(x):
+            h.update(str(key).encode())
+            _hash_update(h, x[key])
+    elif isinstance(x, (list, tuple)):
+        for xi in x:
+            _hash_update(h, xi)
+    else:
+        val = np.asarray(x)
+        if val.dtype == object:
+            h.update(repr(x).encode())
+        else:
+            h.update(str(val.shape).encode())
+            h.update(val.tobytes())
+
+
+def _nn_index_key(inbasis, eq, period, compute, params, profiles):
+    # everything that determines the coordinates of the grid nodes
+    h = hashlib.sha1()
+    _hash_update(h, params)
+    # profiles such as iota enter the coordinates of the grid nodes for some bases
+    _hash_update(h, profiles)
+    return (
+        inbasis,
+        tuple(period),
+        eq.L,
+        eq.M,
+        eq.N,
+        eq.L_grid,
+        eq.M_grid,
+        eq.N_grid,
+        eq.NFP,
+        bool(eq.sym),
+        eq.spectral_indexing,
+        h.hexdigest(),
+    )
+
+
+def _wrap_periodic(x, boxsize):
+    # put periodic coordinates in [0, boxsize) as required by cKDTree
+    periodic = boxsize > 0
+    x = np.where(periodic, np.mod(x, np.where(periodic, boxsize, 1)), x)
+    # mod can round up to the period itself
+    return np.where(periodic & (x >= boxsize), 0.0, x)
+
+
+@lru_cache_by_key(_nn_index_key)
+def _get_nn_index(inbasis, eq, period, compute, params, profiles):
+    # k-d tree over the grid used for the nearest neighbor initial guess
+    yg = ConcentricGrid(eq.L_grid, eq.M_grid, max(eq.N_grid, eq.M_grid)).nodes
+    xg = np.asarray(compute(yg, inbasis))
+    mask = np.isfinite(xg).all(axis=-1)
+    yg, xg = yg[mask], xg[mask]
+    # periodic k-d tree has the same distance as _fixup_residual
+    boxsize = np.where(np.isfinite(period), period, 0.0)
+    tree = cKDTree(_wrap_periodic(xg, boxsize), boxsize=boxsize)
+    return yg, tree, boxsize
+
+
+def _initial_guess_nn_search(coords, inbasis, eq, period, compute, params, profiles):
     # nearest neighbor search on dense grid
+    if any(
+        isinstance(x, jax.core.Tracer) for x in tree_leaves((coords, params, profiles))
+    ):
+        # can't build a k-d tree from traced values, so search all grid points
+        return _initial_guess_nn_search_brute(coords, inbasis, eq, period, compute)
+    yg, tree, boxsize = _get_nn_index(inbasis, eq, period, compute, params, profiles)
+    coords = np.asarray(coords)
+    coords = np.where(np.isfinite(coords), coords, 0.0)
+    _, idx = tree.query(_wrap_periodic(coords, boxsize), workers=-1)
+    return yg[idx]
+
+
+def _initial_guess_nn_search_brute(coords, inbasis, eq, period, compute):
     yg = ConcentricGrid(eq.L_grid, eq.M_grid, max(eq.N_grid, eq.M_grid)).nodes
     xg = compute(yg, inbasis)
     idx = jnp.zeros(len(coords)).astype(int)
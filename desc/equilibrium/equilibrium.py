@@ -2099,6 +2099,9 @@ class Equilibrium(IOAble, Optimizable):
         options=None,
         verbose=1,
         copy=False,
+        checkpoint=None,
+        checkpoint_every=10,
+        restart_from=None,
     ):
         """Solve to find the equilibrium configuration.
 
@@ -2130,6 +2133,14 @@ class Equilibrium(IOAble, Optimizable):
         copy : bool
             Whether to return the current equilibrium or a copy (leaving the original
             unchanged).
+        checkpoint : str or path-like, optional
+            File to periodically save the state of the optimizer to, so that it can
+            be restarted if interrupted.
+        checkpoint_every : int
+            Number of iterations between saving checkpoints.
+        restart_from : str or path-like, optional
+            Checkpoint file to restart from. Should be called on the equilibrium in
+            the same state as when the checkpointed run was started.
 
         Returns
         -------
@@ -2179,6 +2190,9 @@ class Equilibrium(IOAble, Optimizable):
             maxiter=maxiter,
             options=options,
             copy=copy,
+            checkpoint=checkpoint,
+            checkpoint_every=checkpoint_every,
+            restart_from=restart_from,
         )
 
         return things[0], result
@@ -2197,6 +2211,9 @@ class Equilibrium(IOAble, Optimizable):
         options=None,
         verbose=1,
         copy=False,
+        checkpoint=None,
+        checkpoint_every=10,
+        restart_from=None,
     ):
         """Optimize an equilibrium for an objective.
 
@@ -2228,6 +2245,14 @@ class Equilibrium(IOAble, Optimizable):
         copy : bool
             Whether to return the current equilibrium or a copy (leaving the original
             unchanged).
+        checkpoint : str or path-like, optional
+            File to periodically save the state of the optimizer to, so that it can
+            be restarted if interrupted.
+        checkpoint_every : int
+            Number of iterations between saving checkpoints.
+        restart_from : str or path-like, optional
+            Checkpoint file to restart from. Should be called on the equilibrium in
+            the same state as when the checkpointed run was started.
 
         Returns
         -------
@@ -2262,6 +2287,9 @@ class Equilibrium(IOAble, Optimizable):
             maxiter=maxiter,
             options=options,
             copy=copy,
+            checkpoint=checkpoint,
+            checkpoint_every=checkpoint_every,
+            restart_from=restart_from,
         )
 
         return things[0], result
@@ -2534,6 +2562,101 @@ class EquilibriaFamily(IOAble, MutableSequence):
             **kwargs,
         )
 
+    @classmethod
+    def solve_continuation_batch(
+        cls,
+        eqs,
+        output_path,
+        num_workers=None,
+        devices=None,
+        resume=True,
+        objective="force",
+        optimizer="lsq-exact",
+        pert_order=2,
+        ftol=None,
+        xtol=None,
+        gtol=None,
+        maxiter=100,
+        verbose=1,
+        **kwargs,
+    ):
+        """Solve many independent equilibria with automatic continuation in parallel.
+
+        Each equilibrium is solved with ``solve_continuation_automatic`` in its own
+        worker process. Finished equilibria are written to ``output_path`` as they
+        complete, and every continuation step is checkpointed so that an interrupted
+        batch can be restarted by calling this function again with the same
+        arguments.
+
+        Parameters
+        ----------
+        eqs : list of Equilibrium, dict or FourierRZToroidalSurface
+            Unsolved equilibria with the final desired boundary, profiles,
+            resolution. Dictionaries are passed as inputs to ``Equilibrium``, and
+            surfaces are used as the boundary of an ``Equilibrium`` with default
+            profiles.
+        output_path : str or path-like
+            HDF5 file to store the solved equilibria in. Equilibria are appended as
+            they finish and the file is put in the order of ``eqs`` once all are
+            done. The index in ``eqs`` of each member of the file is stored in
+            ``<output_path>_index.txt`` and checkpoints are kept in a directory next
+            to it.
+        num_workers : int, optional
+            Number of worker processes. Defaults to the number of ``devices`` if
+            given, otherwise to ``min(len(eqs), os.cpu_count())``.
+        devices : list, optional
+            Devices to pin the workers to, worker ``i`` uses
+            ``devices[i % len(devices)]``. GPU ids when running on GPU, CPU cores
+            (int or list of int) when running on CPU.
+        resume : bool
+            Whether to reuse finished equilibria and checkpoints from a previous call
+            with the same ``output_path``.
+        objective : str or ObjectiveFunction (optional)
+            function to solve for equilibrium solution
+        optimizer : str or Optimizer (optional)
+            optimizer to use
+        pert_order : int
+            order of perturbations to use.
+        ftol, xtol, gtol : float
+            stopping tolerances for subproblem at each step. `None` will use defaults
+            for given optimizer.
+        maxiter : int
+            maximum number of iterations in each equilibrium subproblem.
+        verbose : integer
+            * 0: no output
+            * 1: print progress as equilibria finish
+            * 2: as above plus detailed solver output from the workers
+        **kwargs : dict, optional
+            ``mres_step``, ``pres_step`` and ``bdry_step`` passed to
+            ``solve_continuation_automatic``.
+
+        Returns
+        -------
+        eqfam : EquilibriaFamily
+            Solved equilibria in the order of ``eqs``. Equilibria that failed to
+            solve are left out with a warning, the index file gives the index in
+            ``eqs`` of each member.
+
+        """
+        from desc.continuation import solve_continuation_batch
+
+        return solve_continuation_batch(
+            eqs,
+            output_path,
+            num_workers,
+            devices,
+            resume,
+            objective,
+            optimizer,
+            pert_order,
+            ftol,
+            xtol,
+            gtol,
+            maxiter,
+            verbose,
+            **kwargs,
+        )
+
     @property
     def equilibria(self):
         """list: Equilibria contained in the family."""
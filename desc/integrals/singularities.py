@@ -1,17 +1,19 @@
 """High order method for singular surface integrals, from Malhotra 2019."""
 
+import hashlib
+import warnings
 from abc import ABC, abstractmethod
 
 import numpy as np
 import scipy
-from interpax import fft_interp2d
 
-from desc.backend import fori_loop, jnp, put, vmap
+from desc.backend import fori_loop, jnp, put, scan, vmap
 from desc.basis import DoubleFourierSeries
+from desc.batching import vmap_chunked
 from desc.compute.geom_utils import rpz2xyz, rpz2xyz_vec, xyz2rpz_vec
 from desc.grid import LinearGrid
 from desc.io import IOAble
-from desc.utils import isalmostequal, islinspaced, safediv, safenorm
+from desc.utils import isalmostequal, islinspaced, lru_cache_by_key, safediv, safenorm
 
 
 def _get_quadrature_nodes(q):
@@ -82,7 +84,38 @@ class _BIESTInterpolator(IOAble, ABC):
         """int: Order of quadrature in polar domain."""
         return self._q
 
+    def prepare(self, f):
+        """Compute the part of the interpolation that is the same for all polar nodes.
+
+        Parameters
+        ----------
+        f : ndarray
+            Data at source grid points to interpolate.
+
+        Returns
+        -------
+        c : ndarray
+            Data to pass to ``interpolate`` for each polar node.
+        """
+        return f
+
     @abstractmethod
+    def interpolate(self, c, i):
+        """Interpolate prepared data to polar grid points.
+
+        Parameters
+        ----------
+        c : ndarray
+            Source data, as returned by ``prepare``.
+        i : int
+            Index of polar node.
+
+        Returns
+        -------
+        fi : ndarray
+            Source data interpolated to ith polar node.
+        """
+
     def __call__(self, f, i):
         """Interpolate data to polar grid points.
 
@@ -98,6 +131,7 @@ class _BIESTInterpolator(IOAble, ABC):
         fi : ndarray
             Source data interpolated to ith polar node.
         """
+        return self.interpolate(self.prepare(f), i)
 
 
 class FFTInterpolator(_BIESTInterpolator):
@@ -116,7 +150,14 @@ class FFTInterpolator(_BIESTInterpolator):
 
     """
 
-    _io_attrs_ = _BIESTInterpolator._io_attrs_ + ["_h_t", "_h_z", "_st", "_sz"]
+    _io_attrs_ = _BIESTInterpolator._io_attrs_ + [
+        "_h_t",
+        "_h_z",
+        "_st",
+        "_sz",
+        "_shift_t",
+        "_shift_z",
+    ]
 
     def __init__(self, eval_grid, source_grid, s, q):
         # current fft interpolating can't handle symmetric grids correctly
@@ -195,14 +236,41 @@ class FFTInterpolator(_BIESTInterpolator):
 
         self._st = s / 2 * self._h_t * r * jnp.sin(w)
         self._sz = s / 2 * self._h_z * r * jnp.cos(w)
+        # phase factors that shift the fourier coefficients to each polar node,
+        # shape (num_theta, 2*q**2) and (num_zeta, 2*q**2) for the source grid
+        kt = jnp.fft.fftfreq(source_grid.num_theta)[:, None]
+        kz = jnp.fft.fftfreq(source_grid.num_zeta)[:, None]
+        self._shift_t = jnp.exp(-2j * jnp.pi * kt * self._st / self._h_t)
+        self._shift_z = jnp.exp(-2j * jnp.pi * kz * self._sz / self._h_z)
 
-    def __call__(self, f, i):
-        """Interpolate data to polar grid points.
+    def prepare(self, f):
+        """Compute the fourier coefficients of data on the source grid.
 
         Parameters
         ----------
         f : ndarray
             Data at source grid points to interpolate.
+
+        Returns
+        -------
+        c : ndarray
+            Fourier coefficients of ``f``, to pass to ``interpolate`` for each polar
+            node.
+        """
+        f = jnp.asarray(f)
+        f = f.reshape(
+            (self._source_grid.num_theta, self._source_grid.num_zeta, *f.shape[1:]),
+            order="F",
+        )
+        return jnp.fft.ifft2(f, axes=(0, 1))
+
+    def interpolate(self, c, i):
+        """Interpolate prepared data to polar grid points.
+
+        Parameters
+        ----------
+        c : ndarray
+            Fourier coefficients of source data, as returned by ``prepare``.
         i : int
             Index of polar node.
 
@@ -211,19 +279,12 @@ class FFTInterpolator(_BIESTInterpolator):
         fi : ndarray
             Source data interpolated to ith polar node.
         """
-        shp = f.shape[1:]
-        f = f.reshape(
-            (self._source_grid.num_theta, self._source_grid.num_zeta, -1), order="F"
-        )
-        g = fft_interp2d(
-            f,
-            self._eval_grid.num_theta,
-            self._eval_grid.num_zeta,
-            sx=self._st[i],
-            sy=self._sz[i],
-            dx=self._h_t,
-            dy=self._h_z,
-        )
+        shp = c.shape[2:]
+        c = c.reshape((*c.shape[:2], -1))
+        c = c * self._shift_t[:, i, None, None] * self._shift_z[None, :, i, None]
+        c = _fourier_pad(c, self._eval_grid.num_theta, 0)
+        c = _fourier_pad(c, self._eval_grid.num_zeta, 1)
+        g = jnp.fft.fft2(c, axes=(0, 1)).real
         return g.reshape((self._eval_grid.num_nodes, *shp), order="F")
 
 
@@ -300,29 +361,17 @@ class DFTInterpolator(_BIESTInterpolator):
         A = basis.evaluate(source_grid.nodes)
         Ainv = jnp.linalg.pinv(A)
 
-        B = jnp.zeros((*theta_q.shape, basis.num_modes))
-
-        def body(i, B):
-            x = jnp.array(
-                [
-                    jnp.zeros_like(theta_q[i]),
-                    theta_q[i],
-                    zeta_q[i],
-                ]
-            ).T
-            Bi = basis.evaluate(jnp.atleast_2d(x))
-            B = put(B, i, Bi)
-            return B
-
-        B = fori_loop(0, B.shape[0], body, B)
+        # all polar nodes around all eval points at once
+        x = jnp.array([jnp.zeros(theta_q.size), theta_q.flatten(), zeta_q.flatten()]).T
+        B = basis.evaluate(x).reshape((*theta_q.shape, basis.num_modes))
         self._mat = B @ Ainv
 
-    def __call__(self, f, i):
-        """Interpolate data to polar grid points.
+    def interpolate(self, c, i):
+        """Interpolate prepared data to polar grid points.
 
         Parameters
         ----------
-        f : ndarray
+        c : ndarray
             Data at source grid points to interpolate.
         i : int
             Index of polar node.
@@ -332,7 +381,81 @@ class DFTInterpolator(_BIESTInterpolator):
         fi : ndarray
             Source data interpolated to ith polar node.
         """
-        return self._mat[:, i] @ f
+        return self._mat[:, i] @ c
+
+
+def _fourier_pad(c, n, axis):
+    """Zero pad or truncate fourier coefficients along axis to n coefficients."""
+    m = c.shape[axis]
+    pad = ((n - m) // 2, n - m - (n - m) // 2)
+    if m % 2 != 0:
+        pad = pad[::-1]
+    if pad == (0, 0):
+        return c
+    c = jnp.moveaxis(jnp.fft.fftshift(c, axes=axis), axis, 0)
+    c = c[max(-pad[0], 0) : m - max(-pad[1], 0)]
+    width = [(0, 0)] * c.ndim
+    width[0] = (max(pad[0], 0), max(pad[1], 0))
+    c = jnp.pad(c, width)
+    return jnp.fft.ifftshift(jnp.moveaxis(c, 0, axis), axes=axis)
+
+
+def _grid_key(grid):
+    h = hashlib.sha1()
+    h.update(np.ascontiguousarray(grid.nodes, dtype=float).tobytes())
+    h.update(np.ascontiguousarray(grid.spacing, dtype=float).tobytes())
+    return (
+        grid.__class__.__name__,
+        grid.NFP,
+        bool(grid.sym),
+        grid.num_theta,
+        grid.num_zeta,
+        h.hexdigest(),
+    )
+
+
+def _interpolator_key(eval_grid, source_grid, s, q, use_dft=False):
+    return (_grid_key(eval_grid), _grid_key(source_grid), int(s), int(q), use_dft)
+
+
+@lru_cache_by_key(_interpolator_key)
+def get_interpolator(eval_grid, source_grid, s, q, use_dft=False):
+    """Get an interpolator to polar grids for singular integrals.
+
+    Uses ``FFTInterpolator`` if the grids allow it, otherwise the slower
+    ``DFTInterpolator``. Interpolators are cached, so that repeated calls with the
+    same grids and parameters reuse the precomputed interpolation data.
+
+    Parameters
+    ----------
+    eval_grid, source_grid : Grid
+        Evaluation and source points for the integral transform.
+    s : int
+        Extent of polar grid in number of source grid points. Same as "M" in the
+        original Malhotra papers.
+    q : int
+        Order of quadrature in polar domain
+    use_dft : bool
+        Whether to always use ``DFTInterpolator``.
+
+    Returns
+    -------
+    interpolator : FFTInterpolator or DFTInterpolator
+        Interpolator from ``source_grid`` to polar grids around ``eval_grid``.
+
+    """
+    interpolator = None
+    if not use_dft:
+        try:
+            interpolator = FFTInterpolator(eval_grid, source_grid, s, q)
+        except AssertionError as e:
+            warnings.warn(
+                "Could not built fft interpolator, switching to dft method which is"
+                " much slower. Reason: " + str(e)
+            )
+    if interpolator is None:
+        interpolator = DFTInterpolator(eval_grid, source_grid, s, q)
+    return interpolator
 
 
 def _chi(rho):
@@ -350,7 +473,14 @@ def _rho(theta, zeta, theta0, zeta0, dtheta, dzeta, s):
 
 
 def _nonsingular_part(
-    eval_data, eval_grid, source_data, source_grid, s, kernel, loop=False
+    eval_data,
+    eval_grid,
+    source_data,
+    source_grid,
+    s,
+    kernel,
+    loop=False,
+    chunk_size=None,
 ):
     """Integrate kernel over non-singular points.
 
@@ -414,7 +544,11 @@ def _nonsingular_part(
 
         # vmap for inner part found more efficient than fori_loop, especially on gpu,
         # but for jacobian looped seems to be better and less memory
-        if loop:
+        if chunk_size is not None:
+            fj = vmap_chunked(eval_pt_vmap, chunk_size=chunk_size)(
+                jnp.arange(eval_grid.num_nodes)
+            )
+        elif loop:
             fj = fori_loop(0, eval_grid.num_nodes, eval_pt_loop, jnp.zeros_like(f))
         else:
             fj = vmap(eval_pt_vmap)(jnp.arange(eval_grid.num_nodes))
@@ -445,6 +579,7 @@ def _singular_part(
     kernel,
     interpolator,
     loop=False,
+    chunk_size=None,
 ):
     """Integrate singular point by interpolating to polar grid.
 
@@ -469,7 +604,8 @@ def _singular_part(
     keys = list(set(["|e_theta x e_zeta|"] + kernel.keys))
     if "phi" in keys:
         keys += ["omega"]
-    fsource = [source_data[key] for key in keys]
+    # transform the source data once instead of once per polar node
+    fsource = [interpolator.prepare(source_data[key]) for key in keys]
 
     def polar_pt_vmap(i):
         # evaluate the effect from a single polar node around each eval point
@@ -482,7 +618,7 @@ def _singular_part(
 
         # data interpolated to each eval pt offset by dt,dz
         source_data_polar = {
-            key: interpolator(val, i) for key, val in zip(keys, fsource)
+            key: interpolator.interpolate(val, i) for key, val in zip(keys, fsource)
         }
 
         # can't interpolate phi directly since its not periodic, so we interpolate
@@ -513,7 +649,19 @@ def _singular_part(
 
     f = jnp.zeros((eval_grid.num_nodes, kernel.ndim))
     # vmap found more efficient than fori_loop, esp on gpu, but uses more memory
-    if loop:
+    if chunk_size is not None:
+
+        def polar_chunk(f, idx):
+            # padding at the end of the last chunk is masked out
+            fi = vmap(polar_pt_vmap)(idx % v.size)
+            return f + jnp.sum(fi * (idx < v.size)[:, None, None], axis=0), None
+
+        # sum over chunks of polar nodes
+        chunk_size = min(chunk_size, v.size)
+        n_chunks = -(-v.size // chunk_size)
+        idx = jnp.arange(n_chunks * chunk_size).reshape((n_chunks, chunk_size))
+        f, _ = scan(polar_chunk, f, idx)
+    elif loop:
         f = fori_loop(0, v.size, polar_pt_loop, f)
     else:
         f = vmap(polar_pt_vmap)(jnp.arange(v.size)).sum(axis=0)
@@ -532,6 +680,7 @@ def singular_integral(
     kernel,
     interpolator,
     loop=False,
+    chunk_size=None,
 ):
     """Evaluate a singular integral transform on a surface.
 
@@ -577,6 +726,11 @@ def singular_integral(
     loop : bool
         If True, evaluate integral using loops, as opposed to vmap. Slower, but uses
         less memory.
+    chunk_size : int or None
+        Number of evaluation points (for the non-singular part of the integral) or
+        polar nodes (for the singular part) to evaluate the kernel at at once. Memory
+        use scales with ``chunk_size`` times the number of source or evaluation
+        points. If given, ``loop`` is ignored.
 
     Returns
     -------
@@ -603,10 +757,19 @@ def singular_integral(
     eval_grid, source_grid = interpolator._eval_grid, interpolator._source_grid
 
     out2 = _singular_part(
-        eval_data, eval_grid, source_data, source_grid, s, q, kernel, interpolator, loop
+        eval_data,
+        eval_grid,
+        source_data,
+        source_grid,
+        s,
+        q,
+        kernel,
+        interpolator,
+        loop,
+        chunk_size,
     )
     out1 = _nonsingular_part(
-        eval_data, eval_grid, source_data, source_grid, s, kernel, loop
+        eval_data, eval_grid, source_data, source_grid, s, kernel, loop, chunk_size
     )
     return out1 + out2
 
@@ -712,7 +875,9 @@ kernels = {
 }
 
 
-def virtual_casing_biot_savart(eval_data, source_data, interpolator, loop=True):
+def virtual_casing_biot_savart(
+    eval_data, source_data, interpolator, loop=True, chunk_size=None
+):
     """Evaluate magnetic field on surface due to sheet current on surface.
 
     The magnetic field due to the plasma current can be written as a Biot-Savart
@@ -754,6 +919,11 @@ def virtual_casing_biot_savart(eval_data, source_data, interpolator, loop=True):
     loop : bool
         If True, evaluate integral using loops, as opposed to vmap. Slower, but uses
         less memory.
+    chunk_size : int or None
+        Number of evaluation points (for the non-singular part of the integral) or
+        polar nodes (for the singular part) to evaluate the kernel at at once. Memory
+        use scales with ``chunk_size`` times the number of source or evaluation
+        points. If given, ``loop`` is ignored.
 
     Returns
     -------
@@ -772,10 +942,13 @@ def virtual_casing_biot_savart(eval_data, source_data, interpolator, loop=True):
         _kernel_biot_savart,
         interpolator,
         loop,
+        chunk_size,
     )
 
 
-def compute_B_plasma(eq, eval_grid, source_grid=None, normal_only=False):
+def compute_B_plasma(
+    eq, eval_grid, source_grid=None, normal_only=False, chunk_size=None
+):
     """Evaluate magnetic field on surface due to enclosed plasma currents.
 
     The magnetic field due to the plasma current can be written as a Biot-Savart
@@ -810,6 +983,9 @@ def compute_B_plasma(eq, eval_grid, source_grid=None, normal_only=False):
         Source points for integral.
     normal_only : bool
         If True, only compute and return the normal component of the plasma field 𝐁ᵥ⋅𝐧
+    chunk_size : int or None
+        Number of evaluation points or polar nodes to evaluate the kernel at at once.
+        Smaller values use less memory. Defaults to looping over them one at a time.
 
     Returns
     -------
@@ -840,17 +1016,12 @@ def compute_B_plasma(eq, eval_grid, source_grid=None, normal_only=False):
     k = min(source_grid.num_theta, source_grid.num_zeta * source_grid.NFP)
     s = k - 1
     q = k // 2 + int(np.sqrt(k))
-    try:
-        interpolator = FFTInterpolator(eval_grid, source_grid, s, q)
-    except AssertionError as e:
-        print(
-            f"Unable to create FFTInterpolator, got error {e},"
-            "falling back to DFT method which is much slower"
-        )
-        interpolator = DFTInterpolator(eval_grid, source_grid, s, q)
+    interpolator = get_interpolator(eval_grid, source_grid, s, q)
     if hasattr(eq.surface, "Phi_mn"):
         source_data["K_vc"] += eq.surface.compute("K", grid=source_grid)["K"]
-    Bplasma = virtual_casing_biot_savart(eval_data, source_data, interpolator)
+    Bplasma = virtual_casing_biot_savart(
+        eval_data, source_data, interpolator, chunk_size=chunk_size
+    )
     # need extra factor of B/2 bc we're evaluating on plasma surface
     Bplasma = Bplasma + eval_data["B"] / 2
     if normal_only:
@@ -1,5 +1,6 @@
 """Classes for reading and writing HDF5 files."""
 
+import inspect
 import numbers
 import pydoc
 import warnings
@@ -13,7 +14,8 @@ from .core_io import IO, Reader, Writer
 
 def fullname(o):
     """Find where an object is defined."""
-    klass = o.__class__
+    # lazily loaded objects are saved as the class they stand in for
+    klass = getattr(o.__class__, "_lazy_base_", o.__class__)
     module = klass.__module__
     if module == "builtins":
         return klass.__qualname__  # avoid outputs like 'builtins.str'
@@ -85,21 +87,47 @@ class hdf5IO(IO):
 class hdf5Reader(hdf5IO, Reader):
     """Class specifying a Reader with hdf5IO."""
 
-    def __init__(self, target):
+    def __init__(self, target, lazy=False, mmap=False):
         """Initialize hdf5Reader class.
 
         Parameters
         ----------
         target : str or file instance
             Path to file OR file instance to be read.
+        lazy : bool
+            Whether objects stored in the file are returned as proxies that read
+            their attributes from the file on first access, see ``read_lazy``.
+        mmap : bool
+            Whether contiguous, uncompressed array datasets are returned as
+            read-only memory maps of the file instead of being read into memory.
+            Other datasets are read as usual.
 
         """
         self.target = target
         self.file_mode = "r"
+        self.lazy = lazy
+        self.mmap = mmap
         super().__init__()
 
     def _decode_attr(self, loc, attr):
 
+        if self.mmap and loc[attr].ndim > 0:
+            dset = loc[attr]
+            offset = dset.id.get_offset()
+            if (
+                dset.chunks is None
+                and dset.compression is None
+                and offset is not None
+                and dset.dtype.kind in "biufc"
+            ):
+                return np.memmap(
+                    dset.file.filename,
+                    dtype=dset.dtype,
+                    mode="r",
+                    offset=offset,
+                    shape=dset.shape,
+                )
+
         if isinstance(loc[attr][()], bytes):
             s = loc[attr][()].decode("utf-8")
         else:
@@ -110,7 +138,7 @@ class hdf5Reader(hdf5IO, Reader):
             return None
         return s
 
-    def read_obj(self, obj, where=None):
+    def read_obj(self, obj, where=None, attrs=None):
         """Read object from file in group specified by where argument.
 
         Parameters
@@ -119,10 +147,14 @@ class hdf5Reader(hdf5IO, Reader):
             object must have _io_attrs_ attribute to have attributes read and loaded
         where : None or file instance
             specifies where to read obj from
+        attrs : list of str, optional
+            Attributes to read. Defaults to ``obj._io_attrs_``.
 
         """
         loc = self.resolve_where(where)
-        for attr in obj._io_attrs_:
+        if attrs is None:
+            attrs = obj._io_attrs_
+        for attr in attrs:
             if attr not in loc.keys():
                 warnings.warn(
                     colored(
@@ -169,14 +201,7 @@ class hdf5Reader(hdf5IO, Reader):
                     # use importlib to import the correct class
                     cls = pydoc.locate(cls_name)
                     if cls is not None:
-                        setattr(
-                            obj,
-                            attr,
-                            cls.load(
-                                load_from=loc[attr],
-                                file_format=self._file_format_,
-                            ),
-                        )
+                        setattr(obj, attr, self._load_obj(cls, loc[attr]))
                     else:
                         warnings.warn(
                             "Class '{}' could not be imported.".format(cls_name),
@@ -218,10 +243,7 @@ class hdf5Reader(hdf5IO, Reader):
                     # use importlib to import the correct class
                     cls = pydoc.locate(cls_name)
                     if cls is not None:
-                        thedict[key] = cls.load(
-                            load_from=loc[key],
-                            file_format=self._file_format_,
-                        )
+                        thedict[key] = self._load_obj(cls, loc[key])
                     else:
                         warnings.warn(
                             "Class '{}' could not be imported.".format(cls_name),
@@ -266,12 +288,7 @@ class hdf5Reader(hdf5IO, Reader):
                     # use importlib to import the correct class
                     cls = pydoc.locate(cls_name)
                     if cls is not None:
-                        thelist.append(
-                            cls.load(
-                                load_from=loc[str(i)],
-                                file_format=self._file_format_,
-                            ),
-                        )
+                        thelist.append(self._load_obj(cls, loc[str(i)]))
                     else:
                         warnings.warn(
                             "Class '{}' could not be imported.".format(cls_name),
@@ -282,11 +299,111 @@ class hdf5Reader(hdf5IO, Reader):
 
         return thelist
 
+    def read_lazy(self, cls, where=None):
+        """Return a proxy for an object of type cls stored in the group where.
+
+        The proxy is an instance of a subclass of ``cls`` that reads each saved
+        attribute from the file the first time it is accessed, either directly or
+        through a property. Objects stored in those attributes are again returned
+        as proxies. Accessing anything else, such as a method, reads all remaining
+        attributes and turns the proxy into a regular instance of ``cls``.
+
+        The file is kept open for as long as any proxy reading from it exists.
+
+        Parameters
+        ----------
+        cls : type
+            Class of the object stored in the group, must have an ``_io_attrs_``
+            attribute.
+        where : None or file instance
+            specifies where to read obj from
+
+        Returns
+        -------
+        obj : cls
+            Proxy for the stored object.
+
+        """
+        loc = self.resolve_where(where)
+        lazy_cls = _lazy_class(cls)
+        obj = lazy_cls.__new__(lazy_cls)
+        obj.__dict__.update(_lazy_reader_=self, _lazy_loc_=loc)
+        return obj
+
+    def _load_obj(self, cls, loc):
+        if self.lazy:
+            return self.read_lazy(cls, where=loc)
+        return cls.load(load_from=loc, file_format=self._file_format_, mmap=self.mmap)
+
+
+def _lazy_getattribute(self, name):
+    # attribute lookup of proxies returned by hdf5Reader.read_lazy
+    if name in ("__class__", "__dict__", "_lazy_materialize"):
+        return object.__getattribute__(self, name)
+    d = object.__getattribute__(self, "__dict__")
+    if name in d:
+        return d[name]
+    cls = type(self)
+    loc = d["_lazy_loc_"]
+    if name in cls._io_attrs_ and name in loc.keys():
+        d["_lazy_reader_"].read_obj(self, where=loc, attrs=[name])
+        if name in d:
+            return d[name]
+    elif name not in cls._io_attrs_:
+        attr = inspect.getattr_static(cls, name, None)
+        # properties are evaluated on the proxy so they only read what they use,
+        # plain class attributes don't need anything from the file.
+        if isinstance(attr, property):
+            return attr.__get__(self, cls)
+        if attr is not None and not callable(attr) and not hasattr(attr, "__get__"):
+            return attr
+    self._lazy_materialize()
+    return getattr(self, name)
+
+
+def _lazy_materialize(self):
+    # read all remaining attributes and turn proxy into an instance of the base class
+    d = object.__getattribute__(self, "__dict__")
+    reader, loc = d.pop("_lazy_reader_"), d.pop("_lazy_loc_")
+    cls = type(self)._lazy_base_
+    self.__class__ = cls
+    reader.read_obj(self, where=loc, attrs=[a for a in cls._io_attrs_ if a not in d])
+    if hasattr(self, "_set_up"):
+        self._set_up()
+
+
+_LAZY_CLASSES = {}
+
+
+def _lazy_class(cls):
+    """Return the lazily loading subclass of cls, creating it if needed."""
+    if cls not in _LAZY_CLASSES:
+        # only methods are added so instances can be turned back into cls
+        _LAZY_CLASSES[cls] = type(cls)(
+            "Lazy" + cls.__name__,
+            (cls,),
+            {
+                "__getattribute__": _lazy_getattribute,
+                "_lazy_materialize": _lazy_materialize,
+                "_lazy_base_": cls,
+                "__module__": cls.__module__,
+            },
+        )
+    return _LAZY_CLASSES[cls]
+
 
 class hdf5Writer(hdf5IO, Writer):
     """Class specifying a writer with hdf5IO."""
 
-    def __init__(self, target, file_mode="w"):
+    def __init__(
+        self,
+        target,
+        file_mode="w",
+        compression="gzip",
+        compression_opts=None,
+        chunks=None,
+        append=False,
+    ):
         """Initialize hdf5Writer class.
 
         Parameters
@@ -294,13 +411,55 @@ class hdf5Writer(hdf5IO, Writer):
         target : str or file instance
             path OR file instance to write to
         file_mode : str
-            mode used when opening file.
+            mode used when opening file. In append mode ``'a'``, saved objects
+            overwrite what is stored at the same place in the file.
+        compression : {``'gzip'``, ``'lzf'``, None} or int
+            Compression filter for arrays, an int is the gzip compression level.
+            ``'lzf'`` is much faster than ``'gzip'`` but compresses less, ``None``
+            writes uncompressed arrays.
+        compression_opts : int, optional
+            Compression level for ``'gzip'``, from 0 to 9. Defaults to 4.
+        chunks : bool or tuple of int, optional
+            Whether to store arrays in chunks, or the chunk shape to use. Defaults to
+            automatic chunking for compressed arrays, uncompressed arrays are stored
+            contiguously so they can be memory mapped when loading.
+        append : bool
+            Only used with ``file_mode='a'``. If True, lists already in the file only
+            get their new items written. The items already stored are assumed to be
+            unchanged and are kept, items beyond the length of the list are deleted.
+            This allows saving a growing ``EquilibriaFamily`` by only writing the
+            latest ``Equilibrium``.
 
         """
         self.target = target
         self.file_mode = file_mode
+        self.append = append and file_mode == "a"
+        self.compression = compression
+        self.compression_opts = compression_opts
+        self.chunks = chunks
         super().__init__()
 
+    def _write_dataset(self, loc, name, data):
+        """Write data to a dataset, replacing any existing one with the same name."""
+        if name in loc:
+            del loc[name]
+        if isinstance(data, np.ndarray) and data.size > 1:
+            loc.create_dataset(
+                name,
+                data=data,
+                compression=self.compression,
+                compression_opts=self.compression_opts,
+                chunks=self.chunks,
+            )
+        else:
+            loc.create_dataset(name, data=data)
+
+    def _write_group(self, loc, name):
+        """Create an empty group, replacing any existing one with the same name."""
+        if name in loc:
+            del loc[name]
+        return loc.create_group(name)
+
     def write_obj(self, obj, where=None):
         """Write object to file in group specified by where argument.
 
@@ -317,11 +476,15 @@ class hdf5Writer(hdf5IO, Writer):
         def isarray(x):
             return hasattr(x, "shape") and hasattr(x, "dtype")
 
+        if "__class__" in loc and loc["__class__"][()].decode("utf-8") != fullname(obj):
+            # a different object was stored here, so nothing can be reused
+            for key in list(loc.keys()):
+                del loc[key]
         # save name of object class
-        loc.create_dataset("__class__", data=fullname(obj))
+        self._write_dataset(loc, "__class__", fullname(obj))
         from desc import __version__
 
-        loc.create_dataset("__version__", data=__version__)
+        self._write_dataset(loc, "__version__", __version__)
         for attr in obj._io_attrs_:
             try:
                 data = getattr(obj, attr)
@@ -342,20 +505,27 @@ class hdf5Writer(hdf5IO, Writer):
                 or isinstance(data, numbers.Number)
                 or isinstance(data, str)
             ):
-                compression = "gzip" if isarray(data) and data.size > 1 else None
-                loc.create_dataset(attr, data=data, compression=compression)
+                self._write_dataset(loc, attr, data)
             elif isinstance(data, dict):
-                group = loc.create_group(attr)
+                group = self._write_group(loc, attr)
                 self.write_dict(data, where=group)
             elif isinstance(data, (list, tuple)):
-                group = loc.create_group(attr)
+                if self.append and isinstance(loc.get(attr), h5py.Group):
+                    group = loc[attr]
+                else:
+                    group = self._write_group(loc, attr)
                 self.write_list(data, where=group)
             else:
                 from .optimizable_io import IOAble
 
                 if isinstance(data, IOAble):
-                    group = loc.create_group(attr)
-                    data.save(group)
+                    group = self._write_group(loc, attr)
+                    data.save(
+                        group,
+                        compression=self.compression,
+                        compression_opts=self.compression_opts,
+                        chunks=self.chunks,
+                    )
                 else:
                     raise TypeError(
                         f"don't know how to save attribute {attr} of type {type(data)}"
@@ -373,30 +543,27 @@ class hdf5Writer(hdf5IO, Writer):
 
         """
         loc = self.resolve_where(where)
-        loc.create_dataset("__class__", data="dict")
+        self._write_dataset(loc, "__class__", "dict")
         for key in thedict.keys():
             if isinstance(thedict[key], list):
-                group = loc.create_group(key)
+                group = self._write_group(loc, key)
                 self.write_list(thedict[key], where=group)
             elif isinstance(thedict[key], dict):
-                group = loc.create_group(key)
+                group = self._write_group(loc, key)
                 self.write_dict(thedict[key], where=group)
             else:
                 try:
-                    data = thedict[key]
-                    compression = (
-                        "gzip"
-                        if isinstance(data, np.ndarray) and np.asarray(data).size > 1
-                        else None
-                    )
-                    loc.create_dataset(key, data=data, compression=compression)
+                    self._write_dataset(loc, key, thedict[key])
                 except TypeError:
-                    group = loc.create_group(key)
+                    group = self._write_group(loc, key)
                     self.write_obj(thedict[key], group)
 
     def write_list(self, thelist, where=None):
         """Write list to file in group specified by where argument.
 
+        If ``append`` is True, items already stored in the group are kept and only
+        the new ones are written.
+
         Parameters
         ----------
         thelist : list
@@ -406,8 +573,17 @@ class hdf5Writer(hdf5IO, Writer):
 
         """
         loc = self.resolve_where(where)
-        loc.create_dataset("__class__", data="list")
-        for i in range(len(thelist)):
+        start = 0
+        if self.append and "__class__" in loc:
+            while str(start) in loc:
+                start += 1
+            for i in range(len(thelist), start):
+                del loc[str(i)]
+        else:
+            for key in list(loc.keys()):
+                del loc[key]
+        self._write_dataset(loc, "__class__", "list")
+        for i in range(start, len(thelist)):
             if isinstance(thelist[i], list):
                 subloc = loc.create_group(str(i))
                 self.write_list(thelist[i], where=subloc)
@@ -416,13 +592,7 @@ class hdf5Writer(hdf5IO, Writer):
                 self.write_dict(thelist[i], where=subloc)
             else:
                 try:
-                    data = thelist[i]
-                    compression = (
-                        "gzip"
-                        if isinstance(data, np.ndarray) and np.asarray(data).size > 1
-                        else None
-                    )
-                    loc.create_dataset(str(i), data=data, compression=compression)
+                    self._write_dataset(loc, str(i), thelist[i])
                 except TypeError:
                     subloc = loc.create_group(str(i))
                     self.write_obj(thelist[i], where=subloc)
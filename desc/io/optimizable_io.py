@@ -13,13 +13,13 @@ import numpy as np
 from termcolor import colored
 
 from desc.backend import register_pytree_node
-from desc.utils import equals
+from desc.utils import equals, errorif
 
 from .hdf5_io import hdf5Reader, hdf5Writer
 from .pickle_io import PickleReader, PickleWriter
 
 
-def load(load_from, file_format=None):
+def load(load_from, file_format=None, lazy=False, mmap=False):
     """Load any DESC object from previously saved file.
 
     Parameters
@@ -28,6 +28,18 @@ def load(load_from, file_format=None):
         file to initialize from
     file_format : {``'hdf5'``, ``'pickle'``} (Default: infer from file name)
         file format of file initializing from
+    lazy : bool
+        Whether to only read attributes from the file when they are first accessed.
+        The returned object is a proxy for the saved one, and so are the objects
+        stored in its attributes, eg the members of an ``EquilibriaFamily`` and the
+        profiles and surface of an ``Equilibrium``. Accessing a saved attribute,
+        directly or through a property such as ``eq.Psi``, reads only that
+        attribute. Accessing anything else, such as a method, reads the rest of
+        the object and turns the proxy into a regular instance. The file stays
+        open until all proxies are fully loaded or deleted. Only for hdf5 files.
+    mmap : bool
+        Whether to return contiguous, uncompressed arrays as read-only memory maps
+        of the file instead of reading them into memory. Only for hdf5 files.
 
     Returns
     -------
@@ -52,6 +64,11 @@ def load(load_from, file_format=None):
                 )
             )
 
+    errorif(
+        (lazy or mmap) and file_format != "hdf5",
+        ValueError,
+        "lazy and mmap loading are only supported for hdf5 files",
+    )
     if file_format == "pickle":
         with open(load_from, "rb") as f:
             obj = pickle.load(f)
@@ -60,16 +77,18 @@ def load(load_from, file_format=None):
             if "__class__" in f.keys():
                 cls_name = f["__class__"][()].decode("utf-8")
                 cls = pydoc.locate(cls_name)
-                obj = cls.__new__(cls)
-                reader = reader_factory(load_from, file_format)
-                reader.read_obj(obj)
-                reader.close()
             else:
                 raise ValueError(
                     "Could not load from {}, no __class__ attribute found".format(
                         load_from
                     )
                 )
+        reader = reader_factory(load_from, file_format, lazy=lazy, mmap=mmap)
+        if lazy:
+            return reader.read_lazy(cls)
+        obj = cls.__new__(cls)
+        reader.read_obj(obj)
+        reader.close()
     else:
         raise ValueError("Unknown file format: {}".format(file_format))
     # to set other secondary stuff that wasn't saved possibly:
@@ -184,7 +203,7 @@ class IOAble(ABC, metaclass=_CombinedMeta):
     """
 
     @classmethod
-    def load(cls, load_from, file_format=None):
+    def load(cls, load_from, file_format=None, lazy=False, mmap=False):
         """Initialize from file.
 
         Parameters
@@ -193,6 +212,13 @@ class IOAble(ABC, metaclass=_CombinedMeta):
             file to initialize from
         file_format : {``'hdf5'``, ``'pickle'``} (Default: infer from file name)
             file format of file initializing from
+        lazy : bool
+            Whether to only read attributes from the file when they are first
+            accessed, see ``desc.io.load``. Only for hdf5 files.
+        mmap : bool
+            Whether to return contiguous, uncompressed arrays as read-only memory
+            maps of the file instead of reading them into memory. Only for hdf5
+            files.
 
         """
         if file_format is None and isinstance(load_from, (str, os.PathLike)):
@@ -212,10 +238,13 @@ class IOAble(ABC, metaclass=_CombinedMeta):
                     )
                 )
         if isinstance(load_from, (str, os.PathLike)):  # load from top level of file
-            self = load(load_from, file_format)
+            self = load(load_from, file_format, lazy=lazy, mmap=mmap)
+        elif lazy:
+            reader = reader_factory(load_from, file_format, lazy=lazy, mmap=mmap)
+            self = reader.read_lazy(cls)
         else:  # being called from within a nested object
             self = cls.__new__(cls)  # create a blank object bypassing init
-            reader = reader_factory(load_from, file_format)
+            reader = reader_factory(load_from, file_format, mmap=mmap)
             reader.read_obj(self)
 
             # to set other secondary stuff that wasn't saved possibly:
@@ -224,7 +253,16 @@ class IOAble(ABC, metaclass=_CombinedMeta):
 
         return self
 
-    def save(self, file_name, file_format=None, file_mode="w"):
+    def save(
+        self,
+        file_name,
+        file_format=None,
+        file_mode="w",
+        compression="gzip",
+        compression_opts=None,
+        chunks=None,
+        append=False,
+    ):
         """Save the object.
 
         Parameters
@@ -234,7 +272,22 @@ class IOAble(ABC, metaclass=_CombinedMeta):
         file_format : str (Default hdf5)
             format of save file. Only used if file_name is a file path
         file_mode : str (Default w - overwrite)
-            mode for save file. Only used if file_name is a file path
+            mode for save file. Only used if file_name is a file path. For hdf5
+            files, ``'a'`` updates an existing file in place.
+        compression : {``'gzip'``, ``'lzf'``, None} or int
+            Compression filter for arrays in hdf5 files, an int is the gzip
+            compression level.
+        compression_opts : int, optional
+            Compression level for ``'gzip'``, from 0 to 9.
+        chunks : bool or tuple of int, optional
+            Whether to store arrays in hdf5 files in chunks, or the chunk shape.
+            Defaults to chunking only compressed arrays.
+        append : bool
+            Only used for hdf5 files with ``file_mode='a'``. If True, lists already
+            saved in the file, such as the members of an ``EquilibriaFamily``, only
+            get their new items written, and the saved items are assumed to be
+            unchanged. Use this to save a list that has only been appended to since
+            it was last saved.
 
         """
         if file_format is None:
@@ -249,7 +302,15 @@ class IOAble(ABC, metaclass=_CombinedMeta):
             else:
                 file_format = "hdf5"
 
-        writer = writer_factory(file_name, file_format=file_format, file_mode=file_mode)
+        writer = writer_factory(
+            file_name,
+            file_format=file_format,
+            file_mode=file_mode,
+            compression=compression,
+            compression_opts=compression_opts,
+            chunks=chunks,
+            append=append,
+        )
         writer.write_obj(self)
         writer.close()
 
@@ -328,7 +389,7 @@ class IOAble(ABC, metaclass=_CombinedMeta):
         return new
 
 
-def reader_factory(load_from, file_format):
+def reader_factory(load_from, file_format, lazy=False, mmap=False):
     """Select and return instance of appropriate reader class for given file format.
 
     Parameters
@@ -337,6 +398,9 @@ def reader_factory(load_from, file_format):
         file path or instance from which to read
     file_format : str
         format of file to be read
+    lazy, mmap : bool
+        Whether to read objects lazily and memory map arrays, see ``hdf5Reader``.
+        Only for hdf5 files.
 
     Returns
     -------
@@ -344,7 +408,7 @@ def reader_factory(load_from, file_format):
 
     """
     if file_format == "hdf5":
-        reader = hdf5Reader(load_from)
+        reader = hdf5Reader(load_from, lazy=lazy, mmap=mmap)
     elif file_format == "pickle":
         reader = PickleReader(load_from)
     else:
@@ -354,7 +418,7 @@ def reader_factory(load_from, file_format):
     return reader
 
 
-def writer_factory(file_name, file_format, file_mode="w"):
+def writer_factory(file_name, file_format, file_mode="w", **kwargs):
     """Select and return instance of appropriate reader class for given file format.
 
     Parameters
@@ -363,6 +427,9 @@ def writer_factory(file_name, file_format, file_mode="w"):
         file path or instance from which to read
     file_format : str
         format of file to be read
+    **kwargs : dict, optional
+        Compression, chunking and append options for ``hdf5Writer``, ignored for
+        pickle.
 
     Returns
     -------
@@ -370,7 +437,7 @@ def writer_factory(file_name, file_format, file_mode="w"):
 
     """
     if file_format == "hdf5":
-        writer = hdf5Writer(file_name, file_mode)
+        writer = hdf5Writer(file_name, file_mode, **kwargs)
     elif file_format == "pickle":
         writer = PickleWriter(file_name, file_mode)
     else:
@@ -14,6 +14,7 @@ from ._core import (
     _MagneticField,
     field_line_integrate,
     read_BNORM_file,
+    trace_field_lines,
 )
 from ._current_potential import CurrentPotentialField, FourierCurrentPotentialField
 from ._dommaschk import DommaschkPotentialField, dommaschk_potential
@@ -1,13 +1,17 @@
 """Classes for magnetic fields."""
 
+import os
+import time
 import warnings
 from abc import ABC, abstractmethod
 from collections.abc import MutableSequence
 
 import numpy as np
+import optimistix as optx
 import scipy.linalg
 from diffrax import (
     DiscreteTerminatingEvent,
+    Event,
     ODETerm,
     PIDController,
     SaveAt,
@@ -23,6 +27,7 @@ from desc.basis import (
     ChebyshevPolynomial,
     DoubleFourierSeries,
 )
+from desc.batching import vmap_chunked
 from desc.compute import compute as compute_fun
 from desc.compute import rpz2xyz, rpz2xyz_vec, xyz2rpz, xyz2rpz_vec
 from desc.compute.utils import get_params, get_transforms
@@ -31,13 +36,14 @@ from desc.equilibrium import EquilibriaFamily, Equilibrium
 from desc.grid import LinearGrid, _Grid
 from desc.integrals import compute_B_plasma
 from desc.io import IOAble
+from desc.magnetic_fields._treecode import biot_savart_tree
 from desc.optimizable import Optimizable, OptimizableCollection, optimizable_parameter
 from desc.transform import Transform
 from desc.utils import copy_coeffs, errorif, flatten_list, setdefault, warnif
 from desc.vmec_utils import ptolemy_identity_fwd, ptolemy_identity_rev
 
 
-def biot_savart_general(re, rs, J, dV):
+def biot_savart_general(re, rs, J, dV, tol=None):
     """Biot-Savart law for arbitrary sources.
 
     Parameters
@@ -50,6 +56,10 @@ def biot_savart_general(re, rs, J, dV):
         current density vector at source points, in cartesian.
     dV : ndarray, shape(n_src_pts)
         volume element at source points
+    tol : float, optional
+        If given, use a tree code with approximately this relative accuracy instead
+        of the direct sum, which is faster for large numbers of source points.
+        See ``desc.magnetic_fields._treecode.biot_savart_tree``.
 
     Returns
     -------
@@ -59,6 +69,8 @@ def biot_savart_general(re, rs, J, dV):
     re, rs, J, dV = map(jnp.asarray, (re, rs, J, dV))
     assert J.shape == rs.shape
     JdV = J * dV[:, None]
+    if tol is not None:
+        return biot_savart_tree(re, rs, JdV, tol, compute_A_or_B="B")
     B = jnp.zeros_like(re)
 
     def body(i, B):
@@ -71,7 +83,7 @@ def biot_savart_general(re, rs, J, dV):
     return 1e-7 * fori_loop(0, J.shape[0], body, B)
 
 
-def biot_savart_general_vector_potential(re, rs, J, dV):
+def biot_savart_general_vector_potential(re, rs, J, dV, tol=None):
     """Biot-Savart law for arbitrary sources for vector potential.
 
     Parameters
@@ -84,6 +96,10 @@ def biot_savart_general_vector_potential(re, rs, J, dV):
         current density vector at source points, in cartesian.
     dV : ndarray, shape(n_src_pts)
         volume element at source points
+    tol : float, optional
+        If given, use a tree code with approximately this relative accuracy instead
+        of the direct sum, which is faster for large numbers of source points.
+        See ``desc.magnetic_fields._treecode.biot_savart_tree``.
 
     Returns
     -------
@@ -93,6 +109,8 @@ def biot_savart_general_vector_potential(re, rs, J, dV):
     re, rs, J, dV = map(jnp.asarray, (re, rs, J, dV))
     assert J.shape == rs.shape
     JdV = J * dV[:, None]
+    if tol is not None:
+        return biot_savart_tree(re, rs, JdV, tol, compute_A_or_B="A")
     A = jnp.zeros_like(re)
 
     def body(i, A):
@@ -183,6 +201,120 @@ def read_BNORM_file(fname, surface, eval_grid=None, scale_by_curpol=True):
     return Bnorm
 
 
+def _symmetric_nodes(phi, Z, NFP):
+    """Indices of the nodes at -phi and -Z, and whether the nodes are symmetric."""
+    period = 2 * np.pi / NFP
+    dphi = (phi[:, None] + phi[None, :]) % period
+    dphi = np.minimum(dphi, period - dphi)
+    mirror_phi = np.argmin(dphi, axis=1)
+    mirror_Z = np.argmin(np.abs(Z[:, None] + Z[None, :]), axis=1)
+    symmetric = np.all(
+        dphi[np.arange(phi.size), mirror_phi] < 1e-10 * period
+    ) and np.allclose(Z[mirror_Z], -Z, atol=1e-10 * (np.ptp(Z) + 1))
+    return mirror_phi, mirror_Z, bool(symmetric)
+
+
+def _create_mgrid_file(
+    path, Rmin, Rmax, Zmin, Zmax, nR, nZ, nphi, NFP, save_vector_potential
+):
+    """Create an mgrid file in "raw" format, with the field variables left empty."""
+    file = Dataset(path, mode="w", format="NETCDF3_64BIT_OFFSET")
+
+    # dimensions
+    file.createDimension("dim_00001", 1)
+    file.createDimension("stringsize", 30)
+    file.createDimension("external_coil_groups", 1)
+    file.createDimension("external_coils", 1)
+    file.createDimension("rad", nR)
+    file.createDimension("zee", nZ)
+    file.createDimension("phi", nphi)
+
+    # variables
+    mgrid_mode = file.createVariable("mgrid_mode", "S1", ("dim_00001",))
+    mgrid_mode[:] = stringtochar(
+        np.array(["R"], "S" + str(file.dimensions["dim_00001"].size))
+    )
+
+    coil_group = file.createVariable(
+        "coil_group", "S1", ("external_coil_groups", "stringsize")
+    )
+    coil_group[:] = stringtochar(
+        np.array(
+            ["single coil representing field"],
+            "S" + str(file.dimensions["stringsize"].size),
+        )
+    )
+
+    ir = file.createVariable("ir", np.int32)
+    ir.long_name = "Number of grid points in the R coordinate."
+    ir[:] = nR
+
+    jz = file.createVariable("jz", np.int32)
+    jz.long_name = "Number of grid points in the Z coordinate."
+    jz[:] = nZ
+
+    kp = file.createVariable("kp", np.int32)
+    kp.long_name = "Number of grid points in the phi coordinate."
+    kp[:] = nphi
+
+    nfp = file.createVariable("nfp", np.int32)
+    nfp.long_name = "Number of field periods."
+    nfp[:] = NFP
+
+    nextcur = file.createVariable("nextcur", np.int32)
+    nextcur.long_name = "Number of coils (external currents)."
+    nextcur[:] = 1
+
+    rmin = file.createVariable("rmin", np.float64)
+    rmin.long_name = "Minimum R coordinate (m)."
+    rmin[:] = Rmin
+
+    rmax = file.createVariable("rmax", np.float64)
+    rmax.long_name = "Maximum R coordinate (m)."
+    rmax[:] = Rmax
+
+    zmin = file.createVariable("zmin", np.float64)
+    zmin.long_name = "Minimum Z coordinate (m)."
+    zmin[:] = Zmin
+
+    zmax = file.createVariable("zmax", np.float64)
+    zmax.long_name = "Maximum Z coordinate (m)."
+    zmax[:] = Zmax
+
+    raw_coil_cur = file.createVariable("raw_coil_cur", np.float64, ("external_coils",))
+    raw_coil_cur.long_name = "Raw coil currents (A)."
+    raw_coil_cur[:] = np.array([1])  # this is 1 because mgrid_mode = "raw"
+
+    br_001 = file.createVariable("br_001", np.float64, ("phi", "zee", "rad"))
+    br_001.long_name = "B_R = radial component of magnetic field in lab frame (T)."
+
+    bp_001 = file.createVariable("bp_001", np.float64, ("phi", "zee", "rad"))
+    bp_001.long_name = "B_phi = toroidal component of magnetic field in lab frame (T)."
+
+    bz_001 = file.createVariable("bz_001", np.float64, ("phi", "zee", "rad"))
+    bz_001.long_name = "B_Z = vertical component of magnetic field in lab frame (T)."
+
+    if save_vector_potential:
+        ar_001 = file.createVariable("ar_001", np.float64, ("phi", "zee", "rad"))
+        ar_001.long_name = (
+            "A_R = radial component of magnetic vector potential in lab frame (T/m)."
+        )
+
+        ap_001 = file.createVariable("ap_001", np.float64, ("phi", "zee", "rad"))
+        ap_001.long_name = (
+            "A_phi = toroidal component of magnetic vector potential "
+            "in lab frame (T/m)."
+        )
+
+        az_001 = file.createVariable("az_001", np.float64, ("phi", "zee", "rad"))
+        az_001.long_name = (
+            "A_Z = vertical component of magnetic vector potential "
+            "in lab frame (T/m)."
+        )
+
+    return file
+
+
 class _MagneticField(IOAble, ABC):
     """Base class for all magnetic fields.
 
@@ -483,9 +615,16 @@ class _MagneticField(IOAble, ABC):
         nZ=101,
         nphi=90,
         save_vector_potential=True,
+        chunk_size=None,
+        sym=False,
+        resume=False,
+        verbose=0,
     ):
         """Save the magnetic field to an mgrid NetCDF file in "raw" format.
 
+        The field is evaluated in one field period, ``chunk_size`` toroidal planes at
+        a time, and each chunk is written to the file as soon as it is computed.
+
         Parameters
         ----------
         path : str
@@ -507,144 +646,228 @@ class _MagneticField(IOAble, ABC):
         save_vector_potential : bool, optional
             Whether or not to save the magnetic vector potential to the mgrid
             file, in addition to the magnetic field. Defaults to True.
+        chunk_size : int, optional
+            Number of toroidal planes to evaluate and write at once, which bounds the
+            memory used. Defaults to all of them.
+        sym : bool, optional
+            Whether the field is stellarator symmetric, in which case only the planes
+            in half a field period are evaluated and the rest are found by symmetry.
+            Only used if Zmin = -Zmax. Defaults to False. This is not inferred from
+            the field, since eg the symmetry of the winding surface of a current
+            potential field does not imply that of the field.
+        resume : bool, optional
+            If True and ``path`` is a partly written mgrid file with the same grid,
+            only evaluate and write the toroidal planes that are missing from it.
+        verbose : int, optional
+            Level of output. 1 prints the progress after each chunk.
 
         Returns
         -------
         None
 
         """
-        # cylindrical coordinates grid
         NFP = self.NFP if hasattr(self, "_NFP") else 1
         R = np.linspace(Rmin, Rmax, nR)
         Z = np.linspace(Zmin, Zmax, nZ)
         phi = np.linspace(0, 2 * np.pi / NFP, nphi, endpoint=False)
-        [PHI, ZZ, RR] = np.meshgrid(phi, Z, R, indexing="ij")
-        grid = np.array([RR.flatten(), PHI.flatten(), ZZ.flatten()]).T
-
-        # evaluate magnetic field on grid
-        field = self.compute_magnetic_field(grid, basis="rpz")
-        B_R = field[:, 0].reshape(nphi, nZ, nR)
-        B_phi = field[:, 1].reshape(nphi, nZ, nR)
-        B_Z = field[:, 2].reshape(nphi, nZ, nR)
-
-        # evaluate magnetic vector potential on grid
+        mirror_phi, mirror_Z, symmetric = _symmetric_nodes(phi, Z, NFP)
+        if not (sym and symmetric):
+            # every plane has to be evaluated, as if it were its own mirror image
+            mirror_phi = np.arange(nphi)
+        names = ["br_001", "bp_001", "bz_001"]
+        funs = [self.compute_magnetic_field]
         if save_vector_potential:
-            field = self.compute_magnetic_vector_potential(grid, basis="rpz")
-            A_R = field[:, 0].reshape(nphi, nZ, nR)
-            A_phi = field[:, 1].reshape(nphi, nZ, nR)
-            A_Z = field[:, 2].reshape(nphi, nZ, nR)
+            names += ["ar_001", "ap_001", "az_001"]
+            funs += [self.compute_magnetic_vector_potential]
+
+        if resume and os.path.exists(path):
+            file = Dataset(path, mode="a")
+            same_grid = (
+                file.dimensions["rad"].size == nR
+                and file.dimensions["zee"].size == nZ
+                and file.dimensions["phi"].size == nphi
+                and int(file["nfp"][:]) == NFP
+                and np.allclose(
+                    [file[name][:] for name in ["rmin", "rmax", "zmin", "zmax"]],
+                    [Rmin, Rmax, Zmin, Zmax],
+                )
+                and all(name in file.variables for name in names)
+            )
+            if not same_grid:
+                file.close()
+            errorif(
+                not same_grid,
+                ValueError,
+                f"Cannot resume writing {path}, it has a different grid.",
+            )
+            # planes are written in order of the variables, so a plane is complete
+            # once the last variable has no missing values
+            done = [not np.ma.is_masked(file[names[-1]][k]) for k in range(nphi)]
         else:
-            A_R = None
-
-        # write mgrid file
-        file = Dataset(path, mode="w", format="NETCDF3_64BIT_OFFSET")
-
-        # dimensions
-        file.createDimension("dim_00001", 1)
-        file.createDimension("stringsize", 30)
-        file.createDimension("external_coil_groups", 1)
-        file.createDimension("external_coils", 1)
-        file.createDimension("rad", nR)
-        file.createDimension("zee", nZ)
-        file.createDimension("phi", nphi)
-
-        # variables
-        mgrid_mode = file.createVariable("mgrid_mode", "S1", ("dim_00001",))
-        mgrid_mode[:] = stringtochar(
-            np.array(["R"], "S" + str(file.dimensions["dim_00001"].size))
-        )
-
-        coil_group = file.createVariable(
-            "coil_group", "S1", ("external_coil_groups", "stringsize")
-        )
-        coil_group[:] = stringtochar(
-            np.array(
-                ["single coil representing field"],
-                "S" + str(file.dimensions["stringsize"].size),
+            file = _create_mgrid_file(
+                path, Rmin, Rmax, Zmin, Zmax, nR, nZ, nphi, NFP, save_vector_potential
             )
-        )
-
-        ir = file.createVariable("ir", np.int32)
-        ir.long_name = "Number of grid points in the R coordinate."
-        ir[:] = nR
-
-        jz = file.createVariable("jz", np.int32)
-        jz.long_name = "Number of grid points in the Z coordinate."
-        jz[:] = nZ
-
-        kp = file.createVariable("kp", np.int32)
-        kp.long_name = "Number of grid points in the phi coordinate."
-        kp[:] = nphi
-
-        nfp = file.createVariable("nfp", np.int32)
-        nfp.long_name = "Number of field periods."
-        nfp[:] = NFP
-
-        nextcur = file.createVariable("nextcur", np.int32)
-        nextcur.long_name = "Number of coils (external currents)."
-        nextcur[:] = 1
-
-        rmin = file.createVariable("rmin", np.float64)
-        rmin.long_name = "Minimum R coordinate (m)."
-        rmin[:] = Rmin
-
-        rmax = file.createVariable("rmax", np.float64)
-        rmax.long_name = "Maximum R coordinate (m)."
-        rmax[:] = Rmax
-
-        zmin = file.createVariable("zmin", np.float64)
-        zmin.long_name = "Minimum Z coordinate (m)."
-        zmin[:] = Zmin
+            done = [False] * nphi
 
-        zmax = file.createVariable("zmax", np.float64)
-        zmax.long_name = "Maximum Z coordinate (m)."
-        zmax[:] = Zmax
+        planes = [
+            k
+            for k in range(nphi)
+            if k <= mirror_phi[k] and not (done[k] and done[mirror_phi[k]])
+        ]
+        chunk_size = max(setdefault(chunk_size, len(planes)), 1)
+        try:
+            for i in range(0, len(planes), chunk_size):
+                ks = planes[i : i + chunk_size]
+                PHI, ZZ, RR = np.meshgrid(phi[ks], Z, R, indexing="ij")
+                grid = np.array([RR.flatten(), PHI.flatten(), ZZ.flatten()]).T
+                # planes in the other half of the field period, in increasing order
+                mirrors = [(j, mirror_phi[k]) for j, k in enumerate(ks)][::-1]
+                mirrors = [(j, m) for j, m in mirrors if m != ks[j]]
+                j, m = map(list, zip(*mirrors)) if mirrors else ([], [])
+                for n, fun in enumerate(funs):
+                    AB = np.asarray(fun(grid, basis="rpz")).T
+                    AB = AB.reshape(3, len(ks), nZ, nR)
+                    for c in range(3):
+                        file[names[3 * n + c]][ks] = AB[c]
+                        if m:
+                            # B(R, -phi, -Z) = (-B_R, B_phi, B_Z)(R, phi, Z), same for A
+                            parity = -1 if c == 0 else 1
+                            file[names[3 * n + c]][m] = parity * AB[c][j][:, mirror_Z]
+                file.sync()
+                if verbose > 0:
+                    written = min(i + chunk_size, len(planes))
+                    print(f"Wrote {written}/{len(planes)} toroidal planes to {path}")
+        finally:
+            file.close()
+
+    def to_interpolated(
+        self,
+        R,
+        phi,
+        Z,
+        params=None,
+        source_grid=None,
+        NFP=None,
+        sym=False,
+        method="cubic",
+        extrap=False,
+        compute_vector_potential=True,
+        chunk_size=None,
+    ):
+        """Precompute the field on a grid and return a spline interpolant of it.
 
-        raw_coil_cur = file.createVariable(
-            "raw_coil_cur", np.float64, ("external_coils",)
-        )
-        raw_coil_cur.long_name = "Raw coil currents (A)."
-        raw_coil_cur[:] = np.array([1])  # this is 1 because mgrid_mode = "raw"
+        The field is evaluated one toroidal plane at a time, and when the field is
+        stellarator symmetric only the planes in half a field period are evaluated.
+        Repeated evaluations of the returned field, eg for field line tracing or
+        quadratic flux, then cost an interpolation instead of eg a Biot-Savart sum.
 
-        br_001 = file.createVariable("br_001", np.float64, ("phi", "zee", "rad"))
-        br_001.long_name = "B_R = radial component of magnetic field in lab frame (T)."
-        br_001[:] = B_R
+        Parameters
+        ----------
+        R, Z : array-like
+            1d arrays of interpolation nodes in R and Z.
+        phi : array-like or int
+            1d array of interpolation nodes in phi, within one field period. If an
+            integer, use that many equally spaced nodes in [0, 2π/NFP).
+        params : dict, optional
+            Parameters to pass to the field, eg field.params_dict.
+        source_grid : Grid, int or None, optional
+            Grid used to discretize the field sources, if any.
+        NFP : int, optional
+            Number of field periods of the field. Defaults to self.NFP if it exists,
+            otherwise 1.
+        sym : bool, optional
+            Whether the field is stellarator symmetric, so that the field at
+            (R, -phi, -Z) can be found from the field at (R, phi, Z). Only used if the
+            phi and Z nodes are symmetric as well. Defaults to False. This is not
+            inferred from the field, since eg the symmetry of the winding surface of a
+            current potential field does not imply that of the field.
+        method : str
+            Spline method for SplineMagneticField.
+        extrap : bool
+            Whether to extrapolate splines beyond specified R, phi, Z.
+        compute_vector_potential : bool, optional
+            Whether to also interpolate the magnetic vector potential, if the field
+            can compute it.
+        chunk_size : int or None, optional
+            Number of points in each toroidal plane to evaluate at once. Defaults to
+            all of them.
 
-        bp_001 = file.createVariable("bp_001", np.float64, ("phi", "zee", "rad"))
-        bp_001.long_name = (
-            "B_phi = toroidal component of magnetic field in lab frame (T)."
-        )
-        bp_001[:] = B_phi
+        Returns
+        -------
+        field : SplineMagneticField
+            Interpolant of the field on the given grid.
 
-        bz_001 = file.createVariable("bz_001", np.float64, ("phi", "zee", "rad"))
-        bz_001.long_name = (
-            "B_Z = vertical component of magnetic field in lab frame (T)."
+        """
+        NFP = setdefault(NFP, self.NFP if hasattr(self, "_NFP") else 1)
+        period = 2 * np.pi / NFP
+        if np.isscalar(phi):
+            phi = np.linspace(0, period, int(phi), endpoint=False)
+        R, phi, Z = map(np.atleast_1d, map(np.asarray, (R, phi, Z)))
+        RR, ZZ = np.meshgrid(R, Z, indexing="ij")
+
+        mirror_phi, mirror_Z, symmetric_grid = _symmetric_nodes(phi, Z, NFP)
+        warnif(
+            sym and not symmetric_grid,
+            UserWarning,
+            "phi and Z nodes are not stellarator symmetric, "
+            "evaluating the field in the full field period.",
         )
-        bz_001[:] = B_Z
-
-        if save_vector_potential:
-            ar_001 = file.createVariable("ar_001", np.float64, ("phi", "zee", "rad"))
-            ar_001.long_name = (
-                "A_R = radial component of magnetic vector potential "
-                "in lab frame (T/m)."
-            )
-            ar_001[:] = A_R
-
-            ap_001 = file.createVariable("ap_001", np.float64, ("phi", "zee", "rad"))
-            ap_001.long_name = (
-                "A_phi = toroidal component of magnetic vector potential "
-                "in lab frame (T/m)."
-            )
-            ap_001[:] = A_phi
-
-            az_001 = file.createVariable("az_001", np.float64, ("phi", "zee", "rad"))
-            az_001.long_name = (
-                "A_Z = vertical component of magnetic vector potential "
-                "in lab frame (T/m)."
+        sym = sym and symmetric_grid
+        planes = [i for i in range(phi.size) if not sym or i <= mirror_phi[i]]
+
+        def _fun(name):
+            fun = getattr(self, name)
+            return jit(
+                vmap_chunked(
+                    lambda x: fun(
+                        x[None], params, basis="rpz", source_grid=source_grid
+                    )[0],
+                    chunk_size=chunk_size,
+                )
             )
-            az_001[:] = A_Z
 
-        file.close()
+        def _coords(i):
+            return np.array([RR.flatten(), np.full(RR.size, phi[i]), ZZ.flatten()]).T
+
+        funs = [_fun("compute_magnetic_field")]
+        if compute_vector_potential:
+            funs.append(_fun("compute_magnetic_vector_potential"))
+
+        values = np.zeros((3 * len(funs), R.size, phi.size, Z.size))
+        for i in planes:
+            coords = _coords(i)
+            for j, fun in enumerate(funs):
+                try:
+                    values[3 * j : 3 * j + 3, :, i, :] = np.asarray(
+                        fun(coords)
+                    ).T.reshape(3, R.size, Z.size)
+                except NotImplementedError:
+                    # the field can't compute the vector potential, this is found
+                    # on the first plane so nothing has been computed for it yet
+                    funs = funs[:1]
+                    values = values[:3].copy()
+                    break
+        if sym:
+            # B(R, -phi, -Z) = (-B_R, B_phi, B_Z)(R, phi, Z), and the same for A
+            parity = np.tile([-1, 1, 1], len(funs))[:, None, None]
+            for i in range(phi.size):
+                if i > mirror_phi[i]:
+                    values[:, :, i, :] = (
+                        parity * values[:, :, mirror_phi[i], :][:, :, mirror_Z]
+                    )
+
+        A = values[3:] if len(funs) > 1 else [None] * 3
+        return SplineMagneticField(
+            R,
+            phi,
+            Z,
+            *values[:3],
+            *A,
+            currents=1.0,
+            NFP=NFP,
+            method=method,
+            extrap=extrap,
+        )
 
 
 class MagneticFieldFromUser(_MagneticField, Optimizable):
@@ -2295,6 +2518,202 @@ def field_line_integrate(
     return r, z
 
 
+def trace_field_lines(
+    r0,
+    z0,
+    field,
+    phi=0.0,
+    ntransit=100,
+    NFP=None,
+    phi0=0.0,
+    params=None,
+    source_grid=None,
+    rtol=1e-8,
+    atol=1e-8,
+    maxstep=1000,
+    min_step_size=1e-8,
+    solver=Tsit5(),
+    bounds_R=(0, np.inf),
+    bounds_Z=(-np.inf, np.inf),
+    chunk_size=None,
+    verbose=0,
+    **kwargs,
+):
+    """Trace many field lines and record their crossings of toroidal planes.
+
+    Each field line is integrated separately with its own adaptive step size, in
+    chunks of ``chunk_size`` lines that are vectorized together to bound memory use.
+    Since the toroidal angle φ is the independent variable, the crossings of the
+    planes φ = ``phi`` (mod 2π/NFP) are at known points along each line, and are
+    found by interpolating the steps taken rather than forcing the solver to stop
+    there. Lines are stopped exactly where they leave the bounding box, by finding
+    the root of the distance to its walls, which gives accurate connection lengths.
+
+    Parameters
+    ----------
+    r0, z0 : array-like
+        Initial coordinates for R, Z on the φ = ``phi0`` plane.
+    field : MagneticField
+        Source of magnetic field to integrate.
+    phi : float or array-like
+        Toroidal angles of the planes to record crossings of. Taken modulo 2π/NFP.
+    ntransit : int
+        Number of field periods to trace each field line for.
+    NFP : int, optional
+        Number of field periods. By default attempts to infer from ``field``,
+        otherwise uses NFP=1.
+    phi0 : float
+        Toroidal angle of the starting points.
+    params: dict, optional
+        Parameters passed to field.
+    source_grid : Grid, optional
+        Collocation points used to discretize source field.
+    rtol, atol : float
+        Relative and absolute tolerances for ode integration.
+    maxstep : int
+        Maximum number of steps per field period.
+    min_step_size: float
+        Minimum step size (in φ) that the integration can take.
+    solver: diffrax.Solver
+        diffrax Solver object to use in integration, defaults to Tsit5(), a RK45
+        explicit solver.
+    bounds_R, bounds_Z : tuple of (float,float), optional
+        R and Z bounds of the bounding box. Field lines are stopped where they leave
+        the box, and NaN is returned for crossings after that.
+    chunk_size : int, optional
+        Number of field lines to trace at once. Defaults to all of them.
+    verbose : int
+        Level of output. If greater than 0, prints the number of field evaluations
+        per second.
+    kwargs: dict
+        Keyword arguments to be passed into ``diffrax.diffeqsolve``.
+
+    Returns
+    -------
+    data : dict
+        Dictionary with the following keys:
+
+        * ``"R"``, ``"Z"``: ndarray, shape(ntransit, nplanes, *r0.shape). Coordinates
+          of the crossings of each plane in each field period.
+        * ``"phi"``: ndarray, shape(ntransit, nplanes). Toroidal angle of each
+          crossing, increasing in the direction of the field.
+        * ``"length"``: ndarray, shape(r0.shape). Length of each field line until it
+          left the bounding box or the end of the last field period.
+        * ``"lost"``: ndarray of bool, shape(r0.shape). Whether each field line left
+          the bounding box.
+        * ``"num_field_evals"``: int. Number of evaluations of the field at a point.
+        * ``"time"``: float. Wall clock time in seconds, including compilation.
+        * ``"field_evals_per_second"``: float. Throughput of the tracing.
+
+    """
+    r0, z0 = map(jnp.asarray, (r0, z0))
+    assert r0.shape == z0.shape, "r0 and z0 must have the same shape"
+    rshape = r0.shape
+    r0 = r0.flatten()
+    z0 = z0.flatten()
+    NFP = setdefault(NFP, getattr(field, "NFP", 1))
+    period = 2 * np.pi / NFP
+    phi = np.atleast_1d(phi)
+
+    # lines are parameterized by the toroidal angle traveled along the field, so
+    # the crossings of the planes in each field period are at known values of it
+    Bphi = field.compute_magnetic_field(
+        jnp.array([r0[0], phi0, z0[0]]), params, basis="rpz", source_grid=source_grid
+    )[0, 1]
+    direction = float(np.sign(Bphi))
+    errorif(direction == 0, ValueError, "Toroidal field is zero at the first point.")
+    ts = (
+        np.mod(direction * (phi - phi0), period) + period * np.arange(ntransit)[:, None]
+    )
+    order = np.argsort(ts, axis=None)
+    ts_sorted = jnp.asarray(ts.flatten()[order])
+    t1 = period * ntransit
+
+    def odefun(s, y, args):
+        rpz = y[:3]
+        B = field.compute_magnetic_field(
+            rpz, params, basis="rpz", source_grid=source_grid
+        )[0]
+        br, bp, bz = B
+        # field line length per unit toroidal angle is |B| / |B_phi| * R
+        dl = jnp.linalg.norm(B) / jnp.abs(bp) * rpz[0]
+        return jnp.array(
+            [rpz[0] * br / jnp.abs(bp), jnp.sign(bp), rpz[0] * bz / jnp.abs(bp), dl]
+        )
+
+    def distance_to_wall(t, y, args, **kwargs):
+        return jnp.min(
+            jnp.array(
+                [
+                    y[0] - bounds_R[0],
+                    bounds_R[1] - y[0],
+                    y[2] - bounds_Z[0],
+                    bounds_Z[1] - y[2],
+                ]
+            )
+        )
+
+    kwargs.setdefault(
+        "stepsize_controller", PIDController(rtol=rtol, atol=atol, dtmin=min_step_size)
+    )
+    kwargs.setdefault(
+        "event", Event(distance_to_wall, root_finder=optx.Newton(rtol=rtol, atol=atol))
+    )
+    kwargs.setdefault("throw", False)
+
+    def intfun(y0):
+        sol = diffeqsolve(
+            ODETerm(odefun),
+            solver,
+            y0=y0,
+            t0=0.0,
+            t1=t1,
+            saveat=SaveAt(ts=ts_sorted, t1=True),
+            max_steps=maxstep * ntransit,
+            dt0=min_step_size,
+            **kwargs,
+        )
+        # after an event the final state is saved in the next free slot
+        saved = jnp.isfinite(sol.ts)
+        final = sol.ys[jnp.sum(saved) - 1]
+        crossed = saved[:-1] & (sol.ts[:-1] == ts_sorted)
+        ys = jnp.where(crossed[:, None], sol.ys[:-1], jnp.nan)
+        return ys, final[3], sol.event_mask, sol.stats["num_steps"]
+
+    y0 = jnp.array([r0, phi0 * jnp.ones_like(r0), z0, jnp.zeros_like(r0)]).T
+    t_start = time.perf_counter()
+    ys, length, lost, num_steps = vmap_chunked(intfun, chunk_size=chunk_size)(y0)
+    ys.block_until_ready()
+    elapsed = time.perf_counter() - t_start
+
+    # each step evaluates the field at every stage of the solver
+    tableau = getattr(solver, "tableau", None)
+    evals_per_step = (
+        1
+        if tableau is None
+        else tableau.num_stages - tableau.fsal  # first same as last
+    )
+    num_field_evals = int(np.sum(num_steps)) * evals_per_step + r0.size
+    if verbose > 0:
+        print(
+            f"Traced {r0.size} field lines with {num_field_evals} field evaluations "
+            + f"in {elapsed:.3e} s ({num_field_evals / elapsed:.3e} evaluations/s)"
+        )
+
+    out = jnp.zeros((r0.size, ts.size, 4)).at[:, order].set(ys)
+    out = jnp.moveaxis(out.reshape((-1, *ts.shape, 4)), 0, -2)
+    return {
+        "R": out[..., 0].reshape((*ts.shape, *rshape)),
+        "Z": out[..., 2].reshape((*ts.shape, *rshape)),
+        "phi": phi0 + direction * ts,
+        "length": length.reshape(rshape),
+        "lost": lost.reshape(rshape),
+        "num_field_evals": num_field_evals,
+        "time": elapsed,
+        "field_evals_per_second": num_field_evals / elapsed,
+    }
+
+
 class OmnigenousField(Optimizable, IOAble):
     """A magnetic field with perfect omnigenity (but is not necessarily analytic).
 
@@ -161,7 +161,7 @@ class CurrentPotentialField(_MagneticField, FourierRZToroidalSurface):
             assert callable(new), "Potential derivative must be callable!"
             self._potential_dzeta = new
 
-    def save(self, file_name, file_format=None, file_mode="w"):
+    def save(self, file_name, file_format=None, file_mode="w", **kwargs):
         """Save the object.
 
         **Not supported for this object!**
@@ -174,6 +174,8 @@ class CurrentPotentialField(_MagneticField, FourierRZToroidalSurface):
             format of save file. Only used if file_name is a file path
         file_mode : str (Default w - overwrite)
             mode for save file. Only used if file_name is a file path
+        **kwargs : dict, optional
+            Compression and chunking options, see ``IOAble.save``.
 
         """
         raise OSError(
@@ -0,0 +1,317 @@
+"""Tree code for fast evaluation of the Biot-Savart law from many source points."""
+
+import numpy as np
+
+from desc.backend import cond, fori_loop, jax, jnp
+from desc.utils import errorif
+
+
+def _kd_sort(rs, src, num_splits):
+    """Reorder sources so that each of 2**num_splits equal blocks is compact.
+
+    Each block of points rs is split in half along its widest dimension, recursively,
+    so that the clusters at every level of the tree are the nodes of a k-d tree. The
+    source data src, shape(n, ...), is reordered along with the points.
+    """
+    for level in range(num_splits):
+        x = rs.reshape(2**level, -1, 3)
+        q = src.reshape(2**level, -1, *src.shape[1:])
+        dim = jnp.argmax(x.max(axis=1) - x.min(axis=1), axis=-1)
+        key = jnp.take_along_axis(x, dim[:, None, None], axis=2)[..., 0]
+        idx = jnp.argsort(key, axis=1)
+        blocks = jnp.arange(2**level)[:, None]
+        rs = x[blocks, idx].reshape(-1, 3)
+        src = q[blocks, idx].reshape(src.shape)
+    return rs, src
+
+
+def _multi_indices(p):
+    """All multi-indices k with |k| <= p, ordered by degree."""
+    return np.array(
+        [
+            (i, j, n - i - j)
+            for n in range(p + 1)
+            for i in range(n, -1, -1)
+            for j in range(n - i, -1, -1)
+        ]
+    )
+
+
+class _Expansion:
+    """Cartesian Taylor expansion of the Biot-Savart kernel up to a given order.
+
+    The vector potential of a cluster of current elements Q_j at offsets s_j from its
+    center is expanded as A(d) = sum_k a_k(d) M_k, where M_k = sum_j s_j^k Q_j are the
+    moments of the cluster and a_k(d) = 1/k! D_s^k (1/|d-s|) at s=0 are computed
+    with the recurrence of Duan & Krasny (2001). Since D_d a_k = -(k_i+1) a_{k+e_i},
+    the field B = curl(A) only needs the coefficients to one order higher.
+    """
+
+    def __init__(self, order):
+        self.order = order
+        K = _multi_indices(order + 1)
+        lookup = {tuple(k): i for i, k in enumerate(K)}
+        zero = len(K)  # index of an extra zero coefficient
+        self.num_moments = len(_multi_indices(order))
+        self.K = K[: self.num_moments]
+        eye = np.eye(3, dtype=int)
+        self.minus1 = np.array(
+            [[lookup.get(tuple(k - e), zero) for e in eye] for k in K]
+        )
+        self.minus2 = np.array(
+            [[lookup.get(tuple(k - 2 * e), zero) for e in eye] for k in K]
+        )
+        self.plus1 = np.array([[lookup[tuple(k + e)] for e in eye] for k in self.K])
+        degree = K.sum(axis=-1)
+        self.slices = [
+            (
+                n,
+                slice(
+                    np.argmax(degree == n), np.argmax(degree == n) + np.sum(degree == n)
+                ),
+            )
+            for n in range(1, order + 2)
+        ]
+        self.num_coeffs = len(K)
+
+    def moments(self, s, dl):
+        """Moments M_k of current elements dl at offsets s, shape(..., nmoments, 3)."""
+        sk = jnp.prod(s[..., None, :] ** self.K, axis=-1)
+        return jnp.einsum("...jk,...ja->...ka", sk, dl)
+
+    def coefficients(self, d):
+        """Taylor coefficients a_k(d) for |k| <= order + 1."""
+        r2 = jnp.dot(d, d)
+        a = jnp.zeros(self.num_coeffs + 1).at[0].set(1 / jnp.sqrt(r2))
+        for n, sl in self.slices:
+            a1 = jnp.sum(d * a[self.minus1[sl]], axis=-1)
+            a2 = jnp.sum(a[self.minus2[sl]], axis=-1)
+            a = a.at[sl].set(((2 * n - 1) * a1 - (n - 1) * a2) / (n * r2))
+        return a
+
+    def A(self, d, M):
+        """Vector potential at offset d from the center, without mu_0/4pi."""
+        a = self.coefficients(d)
+        return a[: self.num_moments] @ M
+
+    def B(self, d, M):
+        """Magnetic field at offset d from the center, without mu_0/4pi."""
+        a = self.coefficients(d)
+        # grad[i, a] = d A_a / d d_i
+        grad = -jnp.einsum("ki,ka->ia", a[self.plus1] * (self.K + 1), M)
+        return jnp.array(
+            [grad[1, 2] - grad[2, 1], grad[2, 0] - grad[0, 2], grad[0, 1] - grad[1, 0]]
+        )
+
+
+def _clusters(src, expansion):
+    """Center, radius and moments of clusters of segments, src.shape=(..., k, 3, 3).
+
+    The moments are integrated along each segment with Gauss-Legendre quadrature,
+    which is exact for the polynomials of the expansion.
+    """
+    r0, r1, dl = src[..., 0, :], src[..., 1, :], src[..., 2, :]
+    lo = jnp.minimum(r0, r1).min(axis=-2)
+    hi = jnp.maximum(r0, r1).max(axis=-2)
+    center = (lo + hi) / 2
+    radius = jnp.maximum(
+        jnp.linalg.norm(r0 - center[..., None, :], axis=-1),
+        jnp.linalg.norm(r1 - center[..., None, :], axis=-1),
+    ).max(axis=-1)
+    t, w = np.polynomial.legendre.leggauss(expansion.order // 2 + 1)
+    t, w = (t + 1) / 2, w / 2
+    offset = r0 - center[..., None, :]
+    s = offset[..., None, :] + t[:, None] * (r1 - r0)[..., None, :]
+    q = w[:, None] * dl[..., None, :]
+    shape = (*s.shape[:-3], -1, 3)
+    return center, radius, expansion.moments(s.reshape(shape), q.reshape(shape))
+
+
+def _direct(re, src, compute_A_or_B):
+    """Direct sum over segments at evaluation points, without mu_0/4pi.
+
+    Uses the exact expressions of Hanson & Hirshman for straight segments, as in
+    ``desc.coils.biot_savart_hh``. For segments of zero length these reduce to the
+    field of a point current element.
+    """
+    r0, r1, dl = src[:, 0], src[:, 1], src[:, 2]
+    L = jnp.linalg.norm(r1 - r0, axis=-1)
+    Ri_vec = re[:, None, :] - r0[None, :, :]
+    Ri = jnp.linalg.norm(Ri_vec, axis=-1)
+    Rf = jnp.linalg.norm(re[:, None, :] - r1[None, :, :], axis=-1)
+    Ri_p_Rf = Ri + Rf
+    den = Ri * Rf * (Ri_p_Rf * Ri_p_Rf - L * L)
+    bad = den == 0
+    safe_den = jnp.where(bad, 1, den)
+    safe_sum = jnp.where(bad, 1, Ri_p_Rf)
+    if compute_A_or_B == "B":
+        num = jnp.cross(dl[None, :, :], Ri_vec, axis=-1)
+        out = (2 * Ri_p_Rf / safe_den)[..., None] * num
+    else:
+        eps = jnp.where(bad, 0, L / safe_sum)
+        safe_L = jnp.where(L == 0, 1, L)
+        # log((1 + eps) / (1 - eps)) / L, which is 2 / (Ri + Rf) as L -> 0
+        coef = jnp.where(L == 0, 2 / safe_sum, 2 * jnp.arctanh(eps) / safe_L)
+        out = coef[..., None] * dl[None, :, :]
+    return jnp.where(bad[..., None], 0, out).sum(axis=1)
+
+
+def biot_savart_tree(
+    re,
+    rs,
+    dl,
+    tol=1e-6,
+    compute_A_or_B="B",
+    order=6,
+    leaf_size=64,
+    branch=8,
+    max_near=64,
+    chunk_size=64,
+    rs_end=None,
+):
+    """Biot-Savart law for many sources using a hierarchical tree code.
+
+    Sources are sorted into a k-d tree and grouped into leaves of ``leaf_size``
+    points, which are grouped ``branch`` at a time into larger clusters until only a
+    few remain. For each evaluation point the tree is traversed from the
+    top: clusters that are far away compared to their size are replaced by a Taylor
+    expansion of their field, and the children of nearby clusters are visited next.
+    Sources in nearby leaves are summed directly, so close to the sources this
+    reduces to the direct sum. This costs O(n_eval log(n_src)) rather than
+    O(n_eval n_src), though with a larger constant, so it is only faster than the
+    direct sum for more than about 1e5 source points.
+
+    Parameters
+    ----------
+    re : ndarray, shape(n_eval_pts, 3)
+        Evaluation points, in cartesian coordinates.
+    rs : ndarray, shape(n_src_pts, 3)
+        Source points, in cartesian coordinates.
+    dl : ndarray, shape(n_src_pts, 3)
+        Current element at each source point, ie current times tangent times
+        quadrature weight for filaments, or current density times volume element.
+    tol : float
+        Approximate relative error, compared to the direct sum over the same sources,
+        allowed in the contribution of each cluster that is replaced by its
+        expansion. A cluster of radius ρ is treated as far from a
+        point at distance d if ρ/d < tol**(1/(order+1)).
+    compute_A_or_B: {"A", "B"}, optional
+        Whether to compute the magnetic vector potential "A" or the magnetic field "B".
+    order : int
+        Order of the Taylor expansion used for far clusters. Higher orders allow
+        more clusters to be treated as far for a given ``tol``, at a higher cost per
+        cluster.
+    leaf_size : int
+        Number of source points per leaf.
+    branch : int
+        Number of child clusters per cluster.
+    max_near : int
+        Maximum number of clusters at each level of the tree that can be near a
+        single evaluation point. Chunks of evaluation points with more near clusters
+        than this fall back to the direct sum.
+    chunk_size : int
+        Number of evaluation points to process at once.
+    rs_end : ndarray, shape(n_src_pts, 3), optional
+        If given, each source is a straight filament from rs to rs_end and dl is
+        the current times (rs_end - rs). The field of nearby filaments is computed
+        with the exact expression of Hanson & Hirshman, as in
+        ``desc.coils.biot_savart_hh``. Default is point sources at rs.
+
+    Returns
+    -------
+    AB : ndarray, shape(n_eval_pts, 3)
+        Magnetic field or vector potential in cartesian components.
+
+    """
+    errorif(
+        compute_A_or_B not in ["A", "B"],
+        ValueError,
+        f'Expected "A" or "B" for compute_A_or_B, instead got {compute_A_or_B}',
+    )
+    errorif(tol <= 0, ValueError, f"tol should be positive, got {tol}")
+    re, rs, dl = map(jnp.atleast_2d, map(jnp.asarray, (re, rs, dl)))
+    rs_end = rs if rs_end is None else jnp.atleast_2d(jnp.asarray(rs_end))
+    assert rs.shape == dl.shape == rs_end.shape
+    theta = float(np.clip(tol ** (1 / (order + 1)), 1e-3, 0.5))
+    expansion = _Expansion(order)
+    far_field = {"B": expansion.B, "A": expansion.A}[compute_A_or_B]
+
+    errorif(
+        branch < 2 or branch & (branch - 1),
+        ValueError,
+        f"branch should be a power of 2, got {branch}",
+    )
+    # the tree is built from binary splits, with the clusters visited at each level
+    # of the traversal having branch children
+    num_splits = int(np.ceil(np.log2(max(-(-rs.shape[0] // leaf_size), 1))))
+    n_leaves = 2**num_splits
+    step = int(np.log2(branch))
+    depths = list(range(num_splits, 0, -step))[::-1] or [0]
+    n_top = 2 ** depths[0]
+
+    # each source is a segment [start, end, current element], pad with zero current
+    # elements to fill the tree
+    src = jnp.stack([rs, rs_end, dl], axis=1)
+    pad = n_leaves * leaf_size - src.shape[0]
+    src = jnp.concatenate([src, jnp.repeat(src[-1:].at[:, 2].set(0), pad, axis=0)])
+    _, src = _kd_sort((src[:, 0] + src[:, 1]) / 2, src, num_splits)
+
+    # clusters at each level, from the top down. A dummy cluster with no current
+    # is added at the end of each level, to fill the fixed size near lists
+    levels = []
+    for depth in depths:
+        n = 2**depth
+        center, radius, M = _clusters(src.reshape(n, -1, 3, 3), expansion)
+        levels.append(
+            (
+                jnp.concatenate([center, center[-1:]]),
+                jnp.concatenate([radius, jnp.zeros(1)]),
+                jnp.concatenate([M, jnp.zeros_like(M[-1:])]),
+                n,
+            )
+        )
+    leaf_src = jnp.concatenate([src, src[-leaf_size:].at[:, 2].set(0)]).reshape(
+        -1, leaf_size, 3, 3
+    )
+
+    def tree_point(x):
+        AB = jnp.zeros(3)
+        overflow = False
+        ids = jnp.arange(n_top)
+        for center, radius, M, n in levels:
+            d = x - center[ids]
+            far = (radius[ids] < theta * jnp.linalg.norm(d, axis=-1)) & (ids < n)
+            # evaluate the expansion at a safe distance for near clusters
+            d = jnp.where(far[:, None], d, 1.0)
+            AB += jnp.sum(
+                jnp.where(far[:, None], jax.vmap(far_field)(d, M[ids]), 0), axis=0
+            )
+            near = ~far & (ids < n)
+            cap = min(max_near, n)
+            overflow = overflow | (near.sum() > cap)
+            (k,) = jnp.nonzero(near, size=cap, fill_value=0)
+            ids = jnp.where(jnp.arange(cap) < near.sum(), ids[k], n)
+            if n < n_leaves:
+                # children of the near clusters, dummy cluster has dummy children
+                child = ids[:, None] * branch + jnp.arange(branch)
+                ids = jnp.where(ids[:, None] < n, child, n * branch).flatten()
+        AB += _direct(x[None], leaf_src[ids].reshape(-1, 3, 3), compute_A_or_B)[0]
+        return AB, overflow
+
+    def direct_chunk(x):
+        def body(i, AB):
+            return AB + _direct(x, leaf_src[i], compute_A_or_B)
+
+        return fori_loop(0, n_leaves, body, jnp.zeros_like(x))
+
+    def eval_chunk(x):
+        AB, overflow = jax.vmap(tree_point)(x)
+        return cond(overflow.any(), direct_chunk, lambda _: AB, x)
+
+    n_eval = re.shape[0]
+    chunk_size = min(chunk_size, n_eval)
+    n_chunks = -(-n_eval // chunk_size)
+    pad = n_chunks * chunk_size - n_eval
+    x = jnp.concatenate([re, jnp.repeat(re[-1:], pad, axis=0)])
+    AB = jax.lax.map(eval_chunk, x.reshape(n_chunks, chunk_size, 3))
+    return 1e-7 * AB.reshape(-1, 3)[:n_eval]
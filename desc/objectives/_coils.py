@@ -3,13 +3,14 @@ import numbers
 import numpy as np
 
 from desc.backend import (
-    fori_loop,
+    cond,
     jnp,
     tree_flatten,
     tree_leaves,
     tree_map,
     tree_unflatten,
 )
+from desc.batching import vmap_chunked
 from desc.compute import get_profiles, get_transforms, rpz2xyz
 from desc.compute.utils import _compute as compute_fun
 from desc.grid import LinearGrid, _Grid
@@ -600,12 +601,222 @@ class CoilCurrentLength(CoilLength):
         return out
 
 
+# number of points per tile used for culling in the min distance objectives
+_DIST_TILE_SIZE = 8
+
+
+def _symmetry_index(coil):
+    """Find the coils of a coilset that are not images of another coil.
+
+    Parameters
+    ----------
+    coil : Coil or CoilSet
+        Coil(s) to find the symmetry-unique coils of.
+
+    Returns
+    -------
+    unique : ndarray of int
+        Indices of the symmetry-unique coils.
+    inverse : ndarray of int, shape(coil.num_coils,)
+        Position in ``unique`` of the coil each coil is an image of.
+
+    """
+    from desc.coils import CoilSet, MixedCoilSet
+
+    if not isinstance(coil, CoilSet) or isinstance(coil, MixedCoilSet):
+        index = np.arange(coil.num_coils)
+        return index, index
+    n = len(coil)
+    # each field period holds the unique coils followed by their flipped reflections
+    block = np.arange(n * (int(coil.sym) + 1))
+    block = np.where(block < n, block, 2 * n - 1 - block)
+    return np.arange(n), np.tile(block, coil.NFP)
+
+
+def _grid_has_symmetry(grid, eq, coil):
+    """Whether the plasma grid nodes are invariant under the symmetries of a coilset.
+
+    Parameters
+    ----------
+    grid : Grid
+        Grid of the plasma surface.
+    eq : Equilibrium or FourierRZToroidalSurface
+        Plasma the grid is on.
+    coil : CoilSet
+        Coilset whose field period and stellarator symmetry are used.
+
+    Returns
+    -------
+    symmetric : bool
+        True if each symmetry of the coilset maps the plasma points onto themselves.
+
+    """
+    if (eq.NFP % coil.NFP) or (coil.sym and not eq.sym):
+        return False
+
+    def keys(rho, theta, zeta):
+        nodes = np.mod([theta, zeta], 2 * np.pi)
+        nodes = np.where(np.isclose(nodes, 2 * np.pi), 0, nodes)
+        return set(zip(*np.round(np.vstack([rho, nodes]), 8)))
+
+    rho, theta, zeta = grid.nodes.T
+    nodes = keys(rho, theta, zeta)
+    symmetric = nodes == keys(rho, theta, zeta + 2 * np.pi / coil.NFP)
+    if coil.sym:
+        symmetric &= nodes == keys(rho, -theta, 2 * np.pi / coil.NFP - zeta)
+    return bool(symmetric)
+
+
+def _tile(pts, tile_size=_DIST_TILE_SIZE):
+    """Split sets of points into tiles of at most ``tile_size`` points.
+
+    The last point of each set is repeated to fill the tiles, which does not change
+    any minimum distance.
+
+    Parameters
+    ----------
+    pts : ndarray, shape(..., num_pts, 3)
+        Points to split along the second to last axis.
+    tile_size : int
+        Maximum number of points per tile.
+
+    Returns
+    -------
+    tiles : ndarray, shape(..., num_tiles, size, 3)
+        Tiles of points, with ``size <= tile_size``.
+
+    """
+    num_pts = pts.shape[-2]
+    num_tiles = -(-num_pts // tile_size)
+    size = -(-num_pts // num_tiles)
+    pad = [(0, 0)] * (pts.ndim - 2) + [(0, num_tiles * size - num_pts), (0, 0)]
+    pts = jnp.pad(pts, pad, mode="edge")
+    return pts.reshape(*pts.shape[:-2], num_tiles, size, 3)
+
+
+def _lower_bound(x, y, x_label=None, y_label=None):
+    """Lower bound on the distance between tiles from their bounding spheres.
+
+    Parameters
+    ----------
+    x : ndarray, shape(n, size, 3)
+        Tiles to find the distance from.
+    y : ndarray, shape(m, size, 3)
+        Tiles to find the distance to.
+    x_label, y_label : ndarray of int, shape(n,) and shape(m,), optional
+        Pairs of tiles with the same label are excluded and get a bound of infinity.
+
+    Returns
+    -------
+    lower : ndarray, shape(n, m)
+        Lower bound on the distance between each pair of tiles.
+
+    """
+    x_center = x.mean(axis=-2)
+    y_center = y.mean(axis=-2)
+    x_radius = jnp.max(safenorm(x - x_center[:, None], axis=-1), axis=-1)
+    y_radius = jnp.max(safenorm(y - y_center[:, None], axis=-1), axis=-1)
+    lower = safenorm(x_center[:, None] - y_center[None], axis=-1)
+    lower = jnp.maximum(lower - x_radius[:, None] - y_radius[None], 0)
+    if x_label is not None:
+        lower = jnp.where(x_label[:, None] == y_label[None], jnp.inf, lower)
+    return lower
+
+
+def _min_distance(x, y, num_candidates, x_label=None, y_label=None, chunk_size=None):
+    """Minimum distance from groups of tiles to a set of tiles.
+
+    Each tile in ``x`` is only compared against the ``num_candidates`` tiles in ``y``
+    with the smallest bounding sphere distance. If the result can not be guaranteed
+    to be exact that way, every pair of tiles is compared instead.
+
+    Parameters
+    ----------
+    x : ndarray, shape(n, num_tiles, size, 3)
+        Groups of tiles to find the distance from, eg the segments of each coil.
+    y : ndarray, shape(m, size, 3)
+        Tiles to find the distance to.
+    num_candidates : int
+        Number of tiles in ``y`` to compare each tile in ``x`` with.
+    x_label, y_label : ndarray of int, shape(n,) and shape(m,), optional
+        Groups in ``x`` are not compared with tiles in ``y`` that have the same label.
+    chunk_size : int, optional
+        Number of pairs of tiles to compute point distances between at once.
+        Defaults to ``m``.
+
+    Returns
+    -------
+    d : ndarray, shape(n,)
+        Minimum distance from each group of tiles in ``x`` to the tiles in ``y``.
+
+    """
+    n, num_tiles = x.shape[:2]
+    m = y.shape[0]
+    x = x.reshape(n * num_tiles, *x.shape[2:])
+    if x_label is not None:
+        x_label = np.repeat(x_label, num_tiles)
+    lower = _lower_bound(x, y, x_label, y_label)
+    order = jnp.argsort(lower, axis=-1)
+    k = min(num_candidates, m)
+
+    def tile_distance(i, j):
+        return jnp.min(safenorm(x[i][:, None] - y[j][None], axis=-1))
+
+    def distance(candidates):
+        i = jnp.broadcast_to(jnp.arange(n * num_tiles)[:, None], candidates.shape)
+        d = vmap_chunked(tile_distance, (0, 0), chunk_size=chunk_size or m)(
+            i.flatten(), candidates.flatten()
+        ).reshape(candidates.shape)
+        d = jnp.where(jnp.take_along_axis(lower, candidates, -1) < jnp.inf, d, jnp.inf)
+        return d.min(axis=-1).reshape(n, num_tiles).min(axis=-1)
+
+    d = distance(order[:, :k])
+    if k == m:
+        return d
+    # pairs that were not compared are at least as far apart as their lower bound
+    bound = jnp.take_along_axis(lower, order[:, k, None], -1).reshape(n, num_tiles)
+    return cond(jnp.all(d[:, None] <= bound), lambda: d, lambda: distance(order))
+
+
+def _num_candidates(x, y, x_label=None, y_label=None):
+    """Number of candidate tiles that gives exact distances with some margin.
+
+    Parameters
+    ----------
+    x : ndarray, shape(n, num_tiles, size, 3)
+        Groups of tiles to find the distance from, eg the segments of each coil.
+    y : ndarray, shape(m, size, 3)
+        Tiles to find the distance to.
+    x_label, y_label : ndarray of int, shape(n,) and shape(m,), optional
+        Groups in ``x`` are not compared with tiles in ``y`` that have the same label.
+
+    Returns
+    -------
+    num_candidates : int
+        Number of tiles in ``y`` to compare each tile in ``x`` with.
+
+    """
+    n, num_tiles = x.shape[:2]
+    m = y.shape[0]
+    d = _min_distance(x, y, m, x_label, y_label)
+    if x_label is not None:
+        x_label = np.repeat(x_label, num_tiles)
+    lower = _lower_bound(x.reshape(n * num_tiles, *x.shape[2:]), y, x_label, y_label)
+    needed = np.max(np.sum(lower < np.repeat(d, num_tiles)[:, None], axis=-1))
+    # leave room for the geometry to change during an optimization
+    return int(min(2 * needed + 1, m))
+
+
 class CoilSetMinDistance(_Objective):
     """Target the minimum distance between coils in a coilset.
 
     Will yield one value per coil in the coilset, which is the minimum distance to
     another coil in that coilset.
 
+    Distances are only computed for the coils that are not images of another coil
+    under the field period and stellarator symmetry of the coilset, and only between
+    nearby segments of the coils, found from their bounding spheres.
+
     Parameters
     ----------
     coil : CoilSet
@@ -614,6 +825,10 @@ class CoilSetMinDistance(_Objective):
         Collocation grid used to discretize each coil. Defaults to the default grid
         for the given coil-type, see ``coils.py`` and ``curve.py`` for more details.
         If a list, must have the same structure as coils.
+    dist_chunk_size : int, optional
+        Number of pairs of coil segments to compute point distances between at once.
+        Bounds the memory used by the objective and its derivatives. Defaults to the
+        total number of coil segments.
 
     """
 
@@ -640,12 +855,14 @@ class CoilSetMinDistance(_Objective):
         grid=None,
         name="coil-coil minimum distance",
         jac_chunk_size=None,
+        dist_chunk_size=None,
     ):
         from desc.coils import CoilSet
 
         if target is None and bounds is None:
             bounds = (1, np.inf)
         self._grid = grid
+        self._dist_chunk_size = dist_chunk_size
         errorif(
             not isinstance(coil, CoilSet),
             ValueError,
@@ -681,6 +898,16 @@ class CoilSetMinDistance(_Objective):
         self._dim_f = coilset.num_coils
         self._constants = {"coilset": coilset, "grid": grid, "quad_weights": 1.0}
 
+        self._unique, self._inverse = _symmetry_index(coilset)
+        pts = _tile(coilset._compute_position(grid=grid, basis="xyz"))
+        self._labels = np.repeat(np.arange(self._dim_f), pts.shape[1])
+        self._num_candidates = _num_candidates(
+            pts[self._unique],
+            pts.reshape(-1, *pts.shape[2:]),
+            self._unique,
+            self._labels,
+        )
+
         if self._normalize:
             coils = tree_leaves(coilset, is_leaf=lambda x: not hasattr(x, "__len__"))
             scales = [compute_scaling_factors(coil)["a"] for coil in coils]
@@ -710,23 +937,19 @@ class CoilSetMinDistance(_Objective):
         pts = constants["coilset"]._compute_position(
             params=params, grid=constants["grid"], basis="xyz"
         )
-
-        def body(k):
-            # dist btwn all pts; shape(ncoils,num_nodes,num_nodes)
-            # dist[i,j,n] is the distance from the jth point on the kth coil
-            # to the nth point on the ith coil
-            dist = safenorm(pts[k][None, :, None] - pts[:, None, :], axis=-1)
-            # exclude distances between points on the same coil
-            mask = jnp.ones(self.dim_f).at[k].set(0)[:, None, None]
-            return jnp.min(dist, where=mask, initial=jnp.inf)
-
-        min_dist_per_coil = fori_loop(
-            0,
-            self.dim_f,
-            lambda k, min_dist: min_dist.at[k].set(body(k)),
-            jnp.zeros(self.dim_f),
+        # coil segments; shape(ncoils,num_tiles,tile_size,3)
+        pts = _tile(pts)
+        # symmetric images of a coil are the same distance from the other coils,
+        # and distances between points on the same coil are excluded
+        min_dist_per_coil = _min_distance(
+            pts[self._unique],
+            pts.reshape(-1, *pts.shape[2:]),
+            self._num_candidates,
+            self._unique,
+            self._labels,
+            self._dist_chunk_size,
         )
-        return min_dist_per_coil
+        return min_dist_per_coil[self._inverse]
 
 
 class PlasmaCoilSetMinDistance(_Objective):
@@ -768,6 +991,10 @@ class PlasmaCoilSetMinDistance(_Objective):
         during optimization, and self.things = [eq] only.
         If False, the coil coordinates are computed at every iteration.
         False by default, so that self.things = [coil, eq].
+    dist_chunk_size : int, optional
+        Number of pairs of coil segments and patches of the plasma grid to compute
+        point distances between at once. Bounds the memory used by the objective and
+        its derivatives. Defaults to the number of patches of the plasma grid.
 
     """
 
@@ -798,6 +1025,7 @@ class PlasmaCoilSetMinDistance(_Objective):
         coils_fixed=False,
         name="plasma-coil minimum distance",
         jac_chunk_size=None,
+        dist_chunk_size=None,
     ):
         if target is None and bounds is None:
             bounds = (1, np.inf)
@@ -807,6 +1035,7 @@ class PlasmaCoilSetMinDistance(_Objective):
         self._coil_grid = coil_grid
         self._eq_fixed = eq_fixed
         self._coils_fixed = coils_fixed
+        self._dist_chunk_size = dist_chunk_size
         errorif(eq_fixed and coils_fixed, ValueError, "Cannot fix both eq and coil")
         things = []
         if not eq_fixed:
@@ -869,21 +1098,32 @@ class PlasmaCoilSetMinDistance(_Objective):
             "quad_weights": 1.0,
         }
 
+        data = compute_fun(
+            eq,
+            self._eq_data_keys,
+            params=eq.params_dict,
+            transforms=eq_transforms,
+            profiles=eq_profiles,
+        )
+        plasma_pts = rpz2xyz(jnp.array([data["R"], data["phi"], data["Z"]]).T)
+        coils_pts = coil._compute_position(params=coil.params_dict, grid=coil_grid)
         if self._eq_fixed:
             # precompute the equilibrium surface coordinates
-            data = compute_fun(
-                eq,
-                self._eq_data_keys,
-                params=eq.params_dict,
-                transforms=eq_transforms,
-                profiles=eq_profiles,
-            )
-            plasma_pts = rpz2xyz(jnp.array([data["R"], data["phi"], data["Z"]]).T)
             self._constants["plasma_coords"] = plasma_pts
         if self._coils_fixed:
-            coils_pts = coil._compute_position(params=coil.params_dict, grid=coil_grid)
             self._constants["coil_coords"] = coils_pts
 
+        # symmetric images of a coil are the same distance from the plasma only if
+        # the plasma grid has the same symmetry
+        self._unique, self._inverse = _symmetry_index(coil)
+        if self._unique.size < self._dim_f and not _grid_has_symmetry(
+            plasma_grid, eq, coil
+        ):
+            self._unique = self._inverse = np.arange(self._dim_f)
+        self._num_candidates = _num_candidates(
+            _tile(coils_pts[self._unique]), _tile(plasma_pts)
+        )
+
         if self._normalize:
             scales = compute_scaling_factors(eq)
             self._normalization = scales["a"]
@@ -944,18 +1184,14 @@ class PlasmaCoilSetMinDistance(_Objective):
             )
             plasma_pts = rpz2xyz(jnp.array([data["R"], data["phi"], data["Z"]]).T)
 
-        def body(k):
-            # dist btwn all pts; shape(ncoils,plasma_grid.num_nodes,coil_grid.num_nodes)
-            dist = safenorm(coils_pts[k][None, :, :] - plasma_pts[:, None, :], axis=-1)
-            return jnp.min(dist, initial=jnp.inf)
-
-        min_dist_per_coil = fori_loop(
-            0,
-            self.dim_f,
-            lambda k, min_dist: min_dist.at[k].set(body(k)),
-            jnp.zeros(self.dim_f),
+        # distances between coil segments and patches of the plasma surface
+        min_dist_per_coil = _min_distance(
+            _tile(coils_pts[self._unique]),
+            _tile(plasma_pts),
+            self._num_candidates,
+            chunk_size=self._dist_chunk_size,
         )
-        return min_dist_per_coil
+        return min_dist_per_coil[self._inverse]
 
 
 class CoilArclengthVariance(_CoilObjective):
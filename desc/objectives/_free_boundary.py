@@ -1,7 +1,5 @@
 """Objectives for solving free boundary equilibria."""
 
-import warnings
-
 import numpy as np
 from scipy.constants import mu_0
 
@@ -9,7 +7,7 @@ from desc.backend import jnp
 from desc.compute import get_params, get_profiles, get_transforms
 from desc.compute.utils import _compute as compute_fun
 from desc.grid import LinearGrid
-from desc.integrals import DFTInterpolator, FFTInterpolator, virtual_casing_biot_savart
+from desc.integrals import get_interpolator, virtual_casing_biot_savart
 from desc.nestor import Nestor
 from desc.objectives.objective_funs import _Objective, collect_docs
 from desc.utils import PRINT_WIDTH, Timer, errorif, parse_argname_change, warnif
@@ -364,6 +362,10 @@ class BoundaryError(_Objective):
     loop : bool
         If True, evaluate integral using loops, as opposed to vmap. Slower, but uses
         less memory.
+    B_plasma_chunk_size : int or None
+        Number of evaluation points or polar nodes to evaluate the virtual casing
+        kernel at at once. Smaller values use less memory. If given, ``loop`` is
+        ignored.
 
     """
 
@@ -415,6 +417,7 @@ class BoundaryError(_Objective):
         loop=True,
         name="Boundary error",
         jac_chunk_size=None,
+        B_plasma_chunk_size=None,
     ):
         if target is None and bounds is None:
             target = 0
@@ -425,6 +428,7 @@ class BoundaryError(_Objective):
         self._field = field
         self._field_grid = field_grid
         self._loop = loop
+        self._B_plasma_chunk_size = B_plasma_chunk_size
         self._sheet_current = hasattr(eq.surface, "Phi_mn")
         if field_fixed:
             things = [eq]
@@ -499,14 +503,7 @@ class BoundaryError(_Objective):
             k = min(source_grid.num_theta, source_grid.num_zeta * source_grid.NFP)
             self._q = k // 2 + int(np.sqrt(k))
 
-        try:
-            interpolator = FFTInterpolator(eval_grid, source_grid, self._s, self._q)
-        except AssertionError as e:
-            warnings.warn(
-                "Could not built fft interpolator, switching to dft method which is"
-                " much slower. Reason: " + str(e)
-            )
-            interpolator = DFTInterpolator(eval_grid, source_grid, self._s, self._q)
+        interpolator = get_interpolator(eval_grid, source_grid, self._s, self._q)
 
         edge_pres = np.max(np.abs(eq.compute("p", grid=eval_grid)["p"]))
         warnif(
@@ -651,6 +648,7 @@ class BoundaryError(_Objective):
             source_data,
             constants["interpolator"],
             loop=self._loop,
+            chunk_size=self._B_plasma_chunk_size,
         )
         # need extra factor of B/2 bc we're evaluating on plasma surface
         Bplasma = Bplasma + eval_data["B"] / 2
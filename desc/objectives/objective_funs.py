@@ -18,9 +18,11 @@ from desc.backend import (
     use_jax,
 )
 from desc.batching import batched_vectorize
+from desc.compilation_cache import _report, get_compilation_cache, hash_structure
 from desc.derivatives import Derivative
 from desc.io import IOAble
 from desc.optimizable import Optimizable
+from desc.transform import get_matrix_cache
 from desc.utils import (
     PRINT_WIDTH,
     Timer,
@@ -218,10 +220,19 @@ class ObjectiveFunction(IOAble):
         accurately estimate the available device memory, so the "auto" chunk_size
         option will yield a larger chunk size than may be needed. It is recommended
         to manually choose a chunk_size if an OOM error is experienced in this case.
+    jac_devices : {None, "all"}, int or list of jax devices, optional
+        If `"batched"` deriv_mode is used, split the columns of the Jacobian across
+        these devices: "all" uses all local devices, an int uses the first
+        ``jac_devices`` local devices. Each device computes its share of columns in
+        chunks of ``jac_chunk_size``, so ``jac_chunk_size`` is a per-device chunk
+        size. Default None computes everything on the default device. To use
+        several CPU devices, set
+        ``XLA_FLAGS=--xla_force_host_platform_device_count=N`` before importing JAX.
 
     """
 
     _io_attrs_ = ["_objectives"]
+    _static_attrs = ["_jac_devices"]
 
     def __init__(
         self,
@@ -230,6 +241,7 @@ class ObjectiveFunction(IOAble):
         deriv_mode="auto",
         name="ObjectiveFunction",
         jac_chunk_size="auto",
+        jac_devices=None,
     ):
         if not isinstance(objectives, (tuple, list)):
             objectives = (objectives,)
@@ -252,7 +264,16 @@ class ObjectiveFunction(IOAble):
         assert deriv_mode in {"auto", "batched", "blocked"}
         assert jac_chunk_size in ["auto", None] or isposint(jac_chunk_size)
 
+        assert (
+            jac_devices in [None, "all"]
+            or isposint(jac_devices)
+            or isinstance(jac_devices, (list, tuple))
+        )
+
         self._jac_chunk_size = jac_chunk_size
+        self._jac_devices = (
+            tuple(jac_devices) if isinstance(jac_devices, list) else jac_devices
+        )
         self._objectives = objectives
         self._use_jit = use_jit
         self._deriv_mode = deriv_mode
@@ -306,12 +327,20 @@ class ObjectiveFunction(IOAble):
 
         # build objectives
         self._dim_f = 0
+        bytes_saved = get_matrix_cache().bytes_saved
         for objective in self.objectives:
             if not objective.built:
                 if verbose > 0:
                     print("Building objective: " + objective.name)
                 objective.build(use_jit=self.use_jit, verbose=verbose)
             self._dim_f += objective.dim_f
+        bytes_saved = get_matrix_cache().bytes_saved - bytes_saved
+        if verbose > 0 and bytes_saved > 0:
+            print(
+                "Reused {:.1f} MB of cached transform matrices".format(
+                    bytes_saved / 1e6
+                )
+            )
         if self._dim_f == 1:
             self._scalar = True
         else:
@@ -703,12 +732,18 @@ class ObjectiveFunction(IOAble):
         if len(v) == 1:
             jvpfun = lambda dx: Derivative.compute_jvp(fun, 0, dx, x)
             return batched_vectorize(
-                jvpfun, signature="(n)->(k)", chunk_size=self._jac_chunk_size
+                jvpfun,
+                signature="(n)->(k)",
+                chunk_size=self._jac_chunk_size,
+                devices=self._jac_devices,
             )(v[0])
         elif len(v) == 2:
             jvpfun = lambda dx1, dx2: Derivative.compute_jvp2(fun, 0, 0, dx1, dx2, x)
             return batched_vectorize(
-                jvpfun, signature="(n),(n)->(k)", chunk_size=self._jac_chunk_size
+                jvpfun,
+                signature="(n),(n)->(k)",
+                chunk_size=self._jac_chunk_size,
+                devices=self._jac_devices,
             )(v[0], v[1])
         elif len(v) == 3:
             jvpfun = lambda dx1, dx2, dx3: Derivative.compute_jvp3(
@@ -718,6 +753,7 @@ class ObjectiveFunction(IOAble):
                 jvpfun,
                 signature="(n),(n),(n)->(k)",
                 chunk_size=self._jac_chunk_size,
+                devices=self._jac_devices,
             )(v[0], v[1], v[2])
         else:
             raise NotImplementedError("Cannot compute JVP higher than 3rd order.")
@@ -870,6 +906,7 @@ class ObjectiveFunction(IOAble):
                 "Compiling objective function and derivatives: "
                 + f"{[obj.name for obj in self.objectives]}"
             )
+        finish = self._track_compilation(mode, verbose)
         timer.start("Total compilation time")
 
         if mode in ["scalar", "bfgs", "all"]:
@@ -904,8 +941,56 @@ class ObjectiveFunction(IOAble):
         timer.stop("Total compilation time")
         if verbose > 1:
             timer.disp("Total compilation time")
+        finish()
         self._compiled = True
 
+    def _track_compilation(self, mode, verbose):
+        """Record compilation in the persistent cache, if it is enabled.
+
+        Returns a function to call once compilation is done.
+        """
+        cache = get_compilation_cache()
+        if cache is None:
+            return lambda: None
+        key = self._compilation_cache_key(mode)
+        hit, snapshot = cache.begin(key)
+        _report(key, hit, verbose)
+        return lambda: cache.end(key, snapshot)
+
+    def _compilation_cache_key(self, mode):
+        """Stable hash of everything that determines the compiled computation.
+
+        Includes the objective types, their dimensions, the resolution of all grids,
+        bases and things used, and the derivative mode and chunk size.
+        """
+        import desc
+        from desc.backend import jax
+
+        structure = {
+            "desc": desc.__version__,
+            "jax": jax.__version__ if use_jax else None,
+            "mode": mode,
+            "deriv_mode": self._deriv_mode,
+            "jac_chunk_size": self._jac_chunk_size,
+            "jac_devices": self._jac_devices,
+            "dim_x": self.dim_x,
+            "dim_f": self.dim_f,
+            "things": [_structure_summary(t) for t in self.things],
+            "objectives": [
+                {
+                    "type": type(obj).__name__,
+                    "dim_f": obj.dim_f,
+                    "deriv_mode": obj._deriv_mode,
+                    "jac_chunk_size": obj._jac_chunk_size,
+                    "loss_function": getattr(obj._loss_function, "__name__", None),
+                    "attrs": _structure_summary(obj.__dict__),
+                    "constants": _structure_summary(obj.constants),
+                }
+                for obj in self.objectives
+            ],
+        }
+        return hash_structure(structure)
+
     @property
     def constants(self):
         """list: constant parameters for each sub-objective."""
@@ -1634,6 +1719,64 @@ class _Objective(IOAble, ABC):
         self._built = False
 
 
+def _structure_summary(x, depth=0):
+    """Summarize resolution-like information of x as nested basic types.
+
+    Grids and bases are reduced to their type and resolution, arrays to their shape
+    and dtype, so that two objectives with the same structure have the same summary
+    regardless of the values of their parameters.
+    """
+    from desc.basis import _Basis
+    from desc.grid import _Grid
+    from desc.transform import Transform
+
+    if depth > 4:
+        return type(x).__name__
+    if isinstance(x, _Grid):
+        return (
+            type(x).__name__,
+            x.num_nodes,
+            x.L,
+            x.M,
+            x.N,
+            x.NFP,
+            x.sym,
+            x.node_pattern,
+        )
+    if isinstance(x, _Basis):
+        return (type(x).__name__, x.num_modes, x.L, x.M, x.N, x.NFP, x.sym)
+    if isinstance(x, Transform):
+        return (
+            "Transform",
+            _structure_summary(x.grid),
+            _structure_summary(x.basis),
+            np.asarray(x.derivatives).tolist(),
+            x.method,
+        )
+    if isinstance(x, Optimizable):
+        summary = {"type": type(x).__name__, "dim_x": x.dim_x}
+        for attr in ["L", "M", "N", "NFP", "sym"]:
+            val = getattr(x, attr, None)
+            if isinstance(val, (bool, int, np.integer)):
+                summary[attr] = int(val)
+        return summary
+    if isinstance(x, dict):
+        return {
+            str(k): _structure_summary(v, depth + 1)
+            for k, v in x.items()
+            if not callable(v) or isinstance(v, (Transform, Optimizable))
+        }
+    if isinstance(x, (list, tuple)):
+        return [_structure_summary(v, depth + 1) for v in x]
+    if isinstance(x, (np.ndarray, jnp.ndarray)):
+        return ("array", tuple(x.shape), str(x.dtype))
+    if isinstance(x, (str, bool, int, float, type(None))):
+        return x
+    if isinstance(x, (np.integer, np.floating, np.bool_)):
+        return x.item()
+    return type(x).__name__
+
+
 # local functions assigned as attributes aren't hashable so they cause stuff to
 # recompile, so instead we define a hashable class to do the same thing.
 
@@ -3,14 +3,16 @@
 Functions in this module should not depend on any other submodules in desc.objectives.
 """
 
+import functools
+
 import numpy as np
 
 from desc.backend import cond, jit, jnp, logsumexp, put
 from desc.io import IOAble
-from desc.utils import Index, errorif, flatten_list, svd_inv_null, unique_list, warnif
+from desc.utils import errorif, flatten_list, svd_inv_null, unique_list, warnif
 
 
-def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa: C901
+def factorize_linear_constraints(objective, constraint, x_scale="auto"):
     """Compute and factorize A to get pseudoinverse and nullspace.
 
     Given constraints of the form Ax=b, factorize A to find a particular solution xp
@@ -46,6 +48,24 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
         Functions to project full vector x into reduced vector y,
         and to recover x from y.
 
+    Notes
+    -----
+    Only the columns of A coupled by some constraint are factorized, so the cost of
+    the factorization scales with the number of coupled variables. A and Z are still
+    returned as dense arrays, so memory scales with the size of the state vector
+    times the number of constraints or reduced variables. ``project`` and
+    ``recover`` only store the coupled block of Z.
+
+    """
+    return _factorize_linear_constraints(objective, constraint, x_scale)[:-1]
+
+
+def _factorize_linear_constraints(objective, constraint, x_scale="auto"):
+    """Factorize the linear constraints, see ``factorize_linear_constraints``.
+
+    Also returns ``particular``, a function that maps the right hand side b of all
+    the constraints to the particular solution xp and the reduced b, reusing the
+    factorization. Used to update the targets of the constraints.
     """
     for con in constraint.objectives:
         errorif(
@@ -97,83 +117,20 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
     # which are duplicate rows of A that also have duplicate entries of b,
     # if the entries of b aren't the same then the constraints are actually
     # incompatible and so we will leave those to be caught later.
+    A = np.asarray(A)
     A_augmented = np.hstack([A, np.reshape(b, (A.shape[0], 1))])
-    row_idx_to_delete = np.array([], dtype=int)
-    for row_idx in range(A_augmented.shape[0]):
-        # find all rows equal to this row
-        rows_equal_to_this_row = np.where(
-            np.all(A_augmented[row_idx, :] == A_augmented, axis=1)
-        )[0]
-        # find the rows equal to this row that are not this row
-        rows_equal_to_this_row_but_not_this_row = rows_equal_to_this_row[
-            rows_equal_to_this_row != row_idx
-        ]
-        # if there are rows equal to this row that aren't this row, AND this particular
-        # row has not already been detected as a duplicate of an earlier one and slated
-        # for deletion, add the duplicate row indices to the array of
-        # rows to be deleted
-        if (
-            rows_equal_to_this_row_but_not_this_row.size
-            and row_idx not in row_idx_to_delete
-        ):
-            row_idx_to_delete = np.append(row_idx_to_delete, rows_equal_to_this_row[1:])
-    # delete the affected rows, and also the corresponding rows of b
-    A_augmented = np.delete(A_augmented, row_idx_to_delete, axis=0)
-    A = A_augmented[:, :-1]
-    b = np.atleast_1d(A_augmented[:, -1].squeeze())
-
-    # will store the global index of the unfixed rows, idx
-    indices_row = np.arange(A.shape[0])
-    indices_idx = np.arange(A.shape[1])
+    # keep only the first occurrence of each row, in the original order
+    _, first_idx = np.unique(A_augmented, axis=0, return_index=True)
+    del A_augmented
+    rows = np.sort(first_idx)
 
-    # while loop has problems updating JAX arrays, convert them to numpy arrays
-    A = np.array(A)
-    b = np.array(b)
-    while len(np.where(np.count_nonzero(A, axis=1) == 1)[0]):
-        # fixed just means there is a single element in A, so A_ij*x_j = b_i
-        fixed_rows = np.where(np.count_nonzero(A, axis=1) == 1)[0]
-        # indices of x that are fixed = cols of A where rows have 1 nonzero val.
-        _, fixed_idx = np.where(A[fixed_rows])
-        unfixed_rows = np.setdiff1d(np.arange(A.shape[0]), fixed_rows)
-        unfixed_idx = np.setdiff1d(np.arange(A.shape[1]), fixed_idx)
-
-        # find the global index of the fixed variables of this iteration
-        global_fixed_idx = indices_idx[fixed_idx]
-        # find the global index of the unfixed variables by removing the fixed variables
-        # from the indices arrays.
-        indices_idx = np.delete(indices_idx, fixed_idx)  # fixed indices are removed
-        indices_row = np.delete(indices_row, fixed_rows)  # fixed rows are removed
-
-        if len(fixed_rows):
-            # something like 0.5 x1 = 2 is the same as x1 = 4
-            b = put(b, fixed_rows, b[fixed_rows] / np.sum(A[fixed_rows], axis=1))
-            A = put(
-                A,
-                Index[fixed_rows, :],
-                A[fixed_rows] / np.sum(A[fixed_rows], axis=1)[:, None],
-            )
-            xp = put(xp, global_fixed_idx, b[fixed_rows])
-            # Some values might be fixed, but they still show up in other constraints
-            # this is where the fixed cols have >1 nonzero val.
-            # For fixed variables, we delete that row and col of A, but that means
-            # we need to subtract the fixed value from b so that the equation is
-            # balanced.
-            # e.g., 2 x1 + 3 x2 + 1 x3 = 4 ; 4 x1 = 2
-            # combining gives 3 x2 + 1 x3 = 3, with x1 now removed
-            b = put(
-                b,
-                unfixed_rows,
-                b[unfixed_rows] - A[unfixed_rows][:, fixed_idx] @ b[fixed_rows],
-            )
-        A = A[unfixed_rows][:, unfixed_idx]
-        b = b[unfixed_rows]
-
-    unfixed_idx = indices_idx
-    fixed_idx = np.delete(np.arange(xp.size), unfixed_idx)
+    # while loop has problems updating JAX arrays, so work with numpy arrays
+    A, steps, unfixed_idx = _eliminate_fixed_rows(A[rows])
 
     # compute x_scale if not provided
-    if x_scale == "auto":
+    if isinstance(x_scale, str) and x_scale == "auto":
         x_scale = objective.x(*objective.things)
+    x_scale = np.asarray(x_scale)
     errorif(
         x_scale.shape != xp.shape,
         ValueError,
@@ -183,25 +140,41 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
     D = np.where(np.abs(x_scale) < 1e2, 1, np.abs(x_scale))
 
     # null space & particular solution
-    A = A * D[None, unfixed_idx]
-    if A.size:
-        A_inv, Z = svd_inv_null(A)
-    else:
-        A_inv = A.T
-        Z = np.eye(A.shape[1])
-    xp = put(xp, unfixed_idx, A_inv @ b)
-    xp = put(xp, fixed_idx, ((1 / D) * xp)[fixed_idx])
+    A *= D[None, unfixed_idx]
+    # Most constraints are of the form x_i = b_i and have been removed above. The
+    # remaining ones usually couple only a few of the unfixed variables, so only the
+    # block of columns that appear in some constraint needs to be factorized. The
+    # other (free) variables map directly to the reduced vector.
+    free_idx, coupled_idx, A_inv, Zc = _factorize_coupled_block(A)
+    # the particular solution is linear in b, and is found by repeating the same
+    # elimination on b, so that new targets don't need a new factorization
+    particular = functools.partial(
+        _particular_solution,
+        rows=rows,
+        steps=steps,
+        A_inv=A_inv,
+        coupled_idx=coupled_idx,
+        unfixed_idx=unfixed_idx,
+        D=D,
+    )
+    xp, b = particular(b)
+    Z = np.zeros((unfixed_idx.size, free_idx.size + Zc.shape[1]))
+    Z[free_idx, np.arange(free_idx.size)] = 1
+    Z[np.ix_(coupled_idx, free_idx.size + np.arange(Zc.shape[1]))] = Zc
     # cast to jnp arrays
-    xp = jnp.asarray(xp)
     A = jnp.asarray(A)
-    b = jnp.asarray(b)
     Z = jnp.asarray(Z)
     D = jnp.asarray(D)
 
-    project = _Project(Z, D, xp, unfixed_idx)
-    recover = _Recover(Z, D, xp, unfixed_idx, objective.dim_x)
+    project = _Project(Zc, D, xp, unfixed_idx, free_idx, coupled_idx)
+    recover = _Recover(Zc, D, xp, unfixed_idx, free_idx, coupled_idx, objective.dim_x)
+    _check_linear_constraints(objective, constraint, xp, D)
 
-    # check that all constraints are actually satisfiable
+    return xp, A, b, Z, D, unfixed_idx, project, recover, particular
+
+
+def _check_linear_constraints(objective, constraint, xp, D):
+    """Check that the particular solution satisfies all linear constraints."""
     params = objective.unpack_state(D * xp, False)
     for con in constraint.objectives:
         xpi = [params[i] for i, t in enumerate(objective.things) if t in con.things]
@@ -244,40 +217,178 @@ def factorize_linear_constraints(objective, constraint, x_scale="auto"):  # noqa
                 "or be due to floating point error.",
             )
 
-    return xp, A, b, Z, D, unfixed_idx, project, recover
+
+def _eliminate_fixed_rows(A):
+    """Remove the constraints that fix a single variable.
+
+    Something like 0.5 x1 = 2 is the same as x1 = 4. The fixed variables still show
+    up in other constraints, so their columns are removed and the fixed values are
+    subtracted from the right hand side of those constraints instead, eg
+    2 x1 + 3 x2 + 1 x3 = 4 ; 4 x1 = 2 gives 3 x2 + 1 x3 = 3, with x1 now removed.
+
+    Parameters
+    ----------
+    A : ndarray
+        Constraint matrix, shape (num_constraints, num_variables).
+
+    Returns
+    -------
+    A : ndarray
+        Constraint matrix of the remaining constraints and unfixed variables.
+    steps : list of tuple
+        For each round of elimination, the fixed rows, their nonzero values, the
+        variables they fix, the remaining rows and the coupling of the remaining
+        rows to the fixed variables. Used to apply the same elimination to b.
+    unfixed_idx : ndarray of int
+        Indices of the variables that are not fixed.
+
+    """
+    # will store the global index of the unfixed variables
+    indices_idx = np.arange(A.shape[1])
+    steps = []
+    while len(np.where(np.count_nonzero(A, axis=1) == 1)[0]):
+        # fixed just means there is a single element in A, so A_ij*x_j = b_i
+        fixed_rows = np.where(np.count_nonzero(A, axis=1) == 1)[0]
+        # indices of x that are fixed = cols of A where rows have 1 nonzero val.
+        _, fixed_idx = np.where(A[fixed_rows])
+        unfixed_rows = np.setdiff1d(np.arange(A.shape[0]), fixed_rows)
+        unfixed_idx = np.setdiff1d(np.arange(A.shape[1]), fixed_idx)
+        steps.append(
+            (
+                fixed_rows,
+                np.sum(A[fixed_rows], axis=1),
+                indices_idx[fixed_idx],
+                unfixed_rows,
+                A[unfixed_rows][:, fixed_idx],
+            )
+        )
+        indices_idx = np.delete(indices_idx, fixed_idx)  # fixed indices are removed
+        A = A[unfixed_rows][:, unfixed_idx]
+    return A, steps, indices_idx
+
+
+def _particular_solution(b, rows, steps, A_inv, coupled_idx, unfixed_idx, D):
+    """Find the particular solution of Ax=b for a factorized A.
+
+    Parameters
+    ----------
+    b : ndarray
+        Right hand side of all the constraints, before removing any.
+    rows : ndarray of int
+        Constraints that are kept after removing duplicates.
+    steps : list of tuple
+        Elimination of the fixed variables, from ``_eliminate_fixed_rows``.
+    A_inv : ndarray
+        Pseudo-inverse of the coupled block of the remaining constraints.
+    coupled_idx : ndarray of int
+        Indices of the coupled variables among the unfixed ones.
+    unfixed_idx : ndarray of int
+        Indices of the variables that are not fixed.
+    D : ndarray
+        Scale of the full state vector.
+
+    Returns
+    -------
+    xp : ndarray
+        Particular solution to Ax=b, in the scaled variables x / D.
+    b : ndarray
+        Right hand side of the remaining constraints.
+
+    """
+    b = np.array(b)[rows]
+    xp = np.zeros(np.size(D))
+    for fixed_rows, scale, fixed_idx, unfixed_rows, coupling in steps:
+        b_fixed = b[fixed_rows] / scale
+        xp[fixed_idx] = b_fixed
+        b = b[unfixed_rows] - coupling @ b_fixed
+    xp_unfixed = np.zeros(unfixed_idx.size)
+    xp_unfixed[coupled_idx] = A_inv @ b
+    fixed_idx = np.delete(np.arange(xp.size), unfixed_idx)
+    xp[fixed_idx] = xp[fixed_idx] / np.asarray(D)[fixed_idx]
+    xp[unfixed_idx] = xp_unfixed
+    return jnp.asarray(xp), jnp.asarray(b)
+
+
+def _factorize_coupled_block(A):
+    """Factorize only the columns of A that are coupled by some constraint.
+
+    Parameters
+    ----------
+    A : ndarray
+        Constraint matrix, shape (num_constraints, num_variables).
+
+    Returns
+    -------
+    free_idx : ndarray of int
+        Indices of columns of A that are identically zero.
+    coupled_idx : ndarray of int
+        Indices of columns of A with at least one nonzero.
+    A_inv : ndarray
+        Pseudo-inverse of ``A[:, coupled_idx]``.
+    Zc : ndarray
+        Null space of ``A[:, coupled_idx]``.
+
+    Notes
+    -----
+    The null space of the full A is then spanned by the unit vectors of the free
+    columns together with ``Zc`` embedded in the coupled columns. The SVD only
+    costs O(num_constraints * num_coupled**2) instead of O(num_variables**3).
+
+    """
+    coupled = np.any(A != 0, axis=0)
+    coupled_idx = np.flatnonzero(coupled)
+    free_idx = np.flatnonzero(~coupled)
+    if coupled_idx.size:
+        A_inv, Zc = svd_inv_null(A[:, coupled_idx])
+    else:
+        A_inv = np.zeros((0, A.shape[0]))
+        Zc = np.zeros((0, 0))
+    return free_idx, coupled_idx, A_inv, Zc
 
 
 class _Project(IOAble):
-    _io_attrs_ = ["Z", "D", "xp", "unfixed_idx"]
+    _io_attrs_ = ["Zc", "D", "xp", "unfixed_idx", "free_idx", "coupled_idx"]
 
-    def __init__(self, Z, D, xp, unfixed_idx):
-        self.Z = Z
+    def __init__(self, Zc, D, xp, unfixed_idx, free_idx, coupled_idx):
+        self.Zc = jnp.asarray(Zc)
         self.D = D
         self.xp = xp
         self.unfixed_idx = unfixed_idx
+        self.free_idx = free_idx
+        self.coupled_idx = coupled_idx
 
     @jit
     def __call__(self, x_full):
         """Project a full state vector into the reduced optimization vector."""
-        x_reduced = self.Z.T @ ((1 / self.D) * x_full - self.xp)[self.unfixed_idx]
+        dx = ((1 / self.D) * x_full - self.xp)[self.unfixed_idx]
+        x_reduced = jnp.concatenate(
+            [dx[self.free_idx], self.Zc.T @ dx[self.coupled_idx]]
+        )
         return jnp.atleast_1d(jnp.squeeze(x_reduced))
 
 
 class _Recover(IOAble):
-    _io_attrs_ = ["Z", "D", "xp", "unfixed_idx", "dim_x"]
+    _io_attrs_ = ["Zc", "D", "xp", "unfixed_idx", "free_idx", "coupled_idx", "dim_x"]
     _static_attrs = ["dim_x"]
 
-    def __init__(self, Z, D, xp, unfixed_idx, dim_x):
-        self.Z = Z
+    def __init__(self, Zc, D, xp, unfixed_idx, free_idx, coupled_idx, dim_x):
+        self.Zc = jnp.asarray(Zc)
         self.D = D
         self.xp = xp
         self.unfixed_idx = unfixed_idx
+        self.free_idx = free_idx
+        self.coupled_idx = coupled_idx
         self.dim_x = dim_x
 
     @jit
     def __call__(self, x_reduced):
         """Recover the full state vector from the reduced optimization vector."""
-        dx = put(jnp.zeros(self.dim_x), self.unfixed_idx, self.Z @ x_reduced)
+        x_reduced = jnp.atleast_1d(x_reduced)
+        num_free = self.free_idx.size
+        dx = jnp.zeros(self.unfixed_idx.size)
+        dx = put(dx, self.free_idx, x_reduced[:num_free])
+        dx = put(dx, self.coupled_idx, self.Zc @ x_reduced[num_free:])
+        dx = put(jnp.zeros(self.dim_x), self.unfixed_idx, dx)
         x_full = self.D * (self.xp + dx)
         return jnp.atleast_1d(jnp.squeeze(x_full))
 
@@ -6,5 +6,5 @@ from .aug_lagrangian import fmin_auglag
 from .aug_lagrangian_ls import lsq_auglag
 from .fmin_scalar import fmintr
 from .least_squares import lsqtr
-from .optimizer import Optimizer, optimizers, register_optimizer
+from .optimizer import Optimizer, OptimizerCheckpoint, optimizers, register_optimizer
 from .stochastic import sgd
@@ -13,10 +13,15 @@ from desc.objectives import (
     get_fixed_boundary_constraints,
     maybe_add_self_consistency,
 )
-from desc.objectives.utils import factorize_linear_constraints
+from desc.objectives.utils import (
+    _check_linear_constraints,
+    _factorize_linear_constraints,
+    _Project,
+    _Recover,
+)
 from desc.utils import Timer, errorif, get_instance, setdefault
 
-from .utils import f_where_x
+from .utils import ArrayLRUCache
 
 
 class LinearConstraintProjection(ObjectiveFunction):
@@ -99,34 +104,108 @@ class LinearConstraintProjection(ObjectiveFunction):
 
         self._dim_f = self._objective.dim_f
         self._scalar = self._objective.scalar
+        self._factorize()
+
+        self._built = True
+        timer.stop("Linear constraint projection build")
+        if verbose > 1:
+            timer.disp("Linear constraint projection build")
+
+    def _factorize(self, x_scale="auto"):
+        # A is not needed after the factorization, so it isn't kept
         (
             self._xp,
-            self._A,
+            _,
             self._b,
             self._Z,
             self._D,
             self._unfixed_idx,
             self._project,
             self._recover,
-        ) = factorize_linear_constraints(
+            self._particular,
+        ) = _factorize_linear_constraints(
             self._objective,
             self._constraint,
+            x_scale,
         )
         self._dim_x = self._objective.dim_x
         self._dim_x_reduced = self._Z.shape[1]
+        # Z is the identity on the free variables, so the only part of Z**2 needed
+        # to project a scale onto the reduced variables is the coupled block
+        self._Zc2 = np.asarray(self._project.Zc) ** 2
 
         # equivalent matrix for A[unfixed_idx] @ D @ Z == A @ unfixed_idx_mat
-        self._unfixed_idx_mat = jnp.diag(self._D)[:, self._unfixed_idx] @ self._Z
+        self._unfixed_idx_mat = (
+            jnp.zeros((self._dim_x, self._dim_x_reduced))
+            .at[self._unfixed_idx]
+            .set(self._D[self._unfixed_idx, None] * self._Z)
+        )
 
-        self._built = True
-        timer.stop("Linear constraint projection build")
-        if verbose > 1:
-            timer.disp("Linear constraint projection build")
+    def update_constraint_target(self, *things):
+        """Update the targets of the linear constraints and the particular solution.
+
+        Only the right hand side of the constraints changes, so the factorization
+        from when the projection was built (including the scale D of the full state
+        vector and the null space Z) is reused and only the particular solution is
+        recomputed. The reduced variables (and the Jacobians with respect to them)
+        keep the same meaning, only shifted by the new particular solution.
+
+        Parameters
+        ----------
+        things : Optimizable
+            Optimizable objects with the new parameters to use as targets, in the
+            same order as ``self.things``.
+
+        """
+        errorif(
+            not self.built,
+            RuntimeError,
+            "LinearConstraintProjection must be built first.",
+        )
+        for con in self._constraint.objectives:
+            if hasattr(con, "update_target"):
+                thing = things[self.things.index(con.things[0])]
+                con.update_target(thing)
+        b = -self._constraint.compute_scaled_error(jnp.zeros(self._constraint.dim_x))
+        self._xp, self._b = self._particular(b)
+        _check_linear_constraints(self._objective, self._constraint, self._xp, self._D)
+        p = self._project
+        self._project = _Project(
+            p.Zc, p.D, self._xp, p.unfixed_idx, p.free_idx, p.coupled_idx
+        )
+        self._recover = _Recover(
+            p.Zc, p.D, self._xp, p.unfixed_idx, p.free_idx, p.coupled_idx, self._dim_x
+        )
 
     def project(self, x):
         """Project full vector x into x_reduced that satisfies constraints."""
         return self._project(x)
 
+    def _project_x_scale(self, x_scale):
+        """Project the scale of the full state vector onto the reduced variables.
+
+        Equivalent to ``diag(Z.T @ diag(x_scale[unfixed_idx]) @ Z)``, ie the column
+        norms of Z weighted by ``x_scale``, without forming any dense matrices.
+
+        Parameters
+        ----------
+        x_scale : array_like
+            Scale of each variable in the full state vector.
+
+        Returns
+        -------
+        x_scale_reduced : ndarray
+            Scale of each variable in the reduced state vector.
+
+        """
+        x_scale = np.broadcast_to(x_scale, self._dim_x)[self._unfixed_idx]
+        return np.concatenate(
+            [
+                x_scale[self._project.free_idx],
+                x_scale[self._project.coupled_idx] @ self._Zc2,
+            ]
+        )
+
     def recover(self, x_reduced):
         """Recover the full state vector from the reduced optimization vector."""
         return self._recover(x_reduced)
@@ -463,6 +542,12 @@ class ProximalProjection(ObjectiveFunction):
     is perturbed and re-solved to bring it back into force balance. This is analogous
     to a proximal method where each iterate is projected back onto the feasible set.
 
+    The linear constraint projection used to re-solve the equilibrium is kept between
+    steps and only updated with the new boundary, and when re-solving with
+    ``"lsq-exact"`` the force balance Jacobian from the last accepted step is used as
+    the initial Jacobian of the solve. It is replaced by the true Jacobian as soon as
+    a step taken with it fails to reduce the residual.
+
     Parameters
     ----------
     objective : ObjectiveFunction
@@ -478,6 +563,10 @@ class ProximalProjection(ObjectiveFunction):
         during the projection step.
     name : str
         Name of the objective function.
+    cache_size : int, optional
+        Number of recently evaluated values of the optimization variables for which
+        the solved equilibrium is kept, so that it does not need to be solved for
+        again. None to keep all of them.
     """
 
     def __init__(
@@ -488,6 +577,7 @@ class ProximalProjection(ObjectiveFunction):
         perturb_options=None,
         solve_options=None,
         name="ProximalProjection",
+        cache_size=32,
     ):
         assert isinstance(objective, ObjectiveFunction), (
             "objective should be instance of ObjectiveFunction." ""
@@ -525,6 +615,7 @@ class ProximalProjection(ObjectiveFunction):
         self._compiled = False
         self._eq = eq
         self._name = name
+        self._cache_size = cache_size
 
     def _set_eq_state_vector(self):
         full_args = self._eq.optimizable_params.copy()
@@ -533,9 +624,15 @@ class ProximalProjection(ObjectiveFunction):
             self._args.remove(arg)
         linear_constraint = ObjectiveFunction(self._linear_constraints)
         linear_constraint.build()
-        _, _, _, self._Z, self._D, self._unfixed_idx, _, _ = (
-            factorize_linear_constraints(self._constraint, linear_constraint)
+        # the equilibrium is re-solved at each step with this projection, which is
+        # only updated with the new boundary etc. instead of being rebuilt
+        self._eq_solve_objective = LinearConstraintProjection(
+            self._constraint, linear_constraint
         )
+        self._eq_solve_objective.build(verbose=0)
+        self._Z = self._eq_solve_objective._Z
+        self._D = self._eq_solve_objective._D
+        self._unfixed_idx = self._eq_solve_objective._unfixed_idx
 
         # dx/dc - goes from the full state to optimization variables for eq
         dxdc = []
@@ -618,23 +715,44 @@ class ProximalProjection(ObjectiveFunction):
         )
         self._dimx_per_thing = [t.dim_x for t in self.things]
 
-        # equivalent matrix for A[unfixed_idx] @ D @ Z == A @ unfixed_idx_mat
-        self._unfixed_idx_mat = jnp.eye(self._objective.dim_x)
-        self._unfixed_idx_mat = jnp.split(
-            self._unfixed_idx_mat, np.cumsum([t.dim_x for t in self.things]), axis=-1
-        )
-        self._unfixed_idx_mat[self._eq_idx] = self._unfixed_idx_mat[self._eq_idx][
-            :, self._unfixed_idx
-        ] @ (self._Z * self._D[self._unfixed_idx, None])
-        self._unfixed_idx_mat = np.concatenate(
-            [np.atleast_2d(foo) for foo in self._unfixed_idx_mat], axis=-1
+        # equivalent matrix for A[unfixed_idx] @ D @ Z == A @ unfixed_idx_mat,
+        # ie the identity for other things and D @ Z in the rows of the eq
+        offsets = np.cumsum([0] + [t.dim_x for t in self.things])
+        blocks = []
+        for i, t in enumerate(self.things):
+            rows = np.arange(offsets[i], offsets[i + 1])
+            if i == self._eq_idx:
+                block = np.zeros((self._objective.dim_x, self._Z.shape[1]))
+                block[rows[self._unfixed_idx]] = (
+                    self._Z * self._D[self._unfixed_idx, None]
+                )
+            else:
+                block = np.zeros((self._objective.dim_x, t.dim_x))
+                block[rows, np.arange(t.dim_x)] = 1
+            blocks.append(block)
+        self._unfixed_idx_mat = np.concatenate(blocks, axis=-1)
+
+        # the force balance Jacobian from the last accepted step is recycled as the
+        # initial Jacobian of the next equilibrium solve, if the solver can use it
+        optimizer = self._solve_options.get("optimizer", "lsq-exact")
+        solver_options = self._solve_options.get("options") or {}
+        self._recycle_jac = (
+            getattr(optimizer, "method", optimizer) == "lsq-exact"
+            and solver_options.get("tr_method", "qr") != "cg"
         )
+        self._inner_jac = None
 
         # history and caching
         self._x_old = self.x(self.things)
-        self._allx = [self._x_old]
-        self._allxopt = [self._objective.x(*self.things)]
-        self._allxeq = [self._eq.pack_params(self._eq.params_dict)]
+        # maps optimization variables to (xopt, xeq)
+        self._cache = ArrayLRUCache(self._cache_size)
+        self._cache.put(
+            self._x_old,
+            (
+                self._objective.x(*self.things),
+                self._eq.pack_params(self._eq.params_dict),
+            ),
+        )
         self.history = [[t.params_dict.copy() for t in self.things]]
 
         self._built = True
@@ -749,10 +867,9 @@ class ProximalProjection(ObjectiveFunction):
         """
         # first check if its something we've seen before, if it is just return
         # cached value, no need to perturb + resolve
-        xopt = f_where_x(x, self._allx, self._allxopt)
-        xeq = f_where_x(x, self._allx, self._allxeq)
-        if xopt.size > 0 and xeq.size > 0:
-            pass
+        cached = self._cache.get(x)
+        if cached is not None:
+            xopt, xeq = cached
         else:
             x_list = self.unpack_state(x, False)
             x_list_old = self.unpack_state(self._x_old, False)
@@ -765,19 +882,24 @@ class ProximalProjection(ObjectiveFunction):
                 deltas=deltas,
                 **self._perturb_options,
             )
+            self._eq_solve_objective.update_constraint_target(self._eq)
+            solve_options = self._solve_options.copy()
+            solve_options["options"] = options = dict(
+                solve_options.get("options") or {}
+            )
+            if self._recycle_jac and self._inner_jac is not None:
+                options["initial_jac"] = (
+                    self._inner_jac @ self._eq_solve_objective._unfixed_idx_mat
+                )
             self._eq.solve(
-                objective=self._constraint,
-                constraints=self._linear_constraints,
-                **self._solve_options,
+                objective=self._eq_solve_objective, constraints=(), **solve_options
             )
             xeq = self._eq.pack_params(self._eq.params_dict)
             x_list[self._eq_idx] = self._eq.params_dict.copy()
             xopt = jnp.concatenate(
                 [t.pack_params(xi) for t, xi in zip(self.things, x_list)]
             )
-            self._allx.append(x)
-            self._allxopt.append(xopt)
-            self._allxeq.append(xeq)
+            self._cache.put(x, (xopt, xeq))
 
         if store:
             self._x_old = x
@@ -796,6 +918,59 @@ class ProximalProjection(ObjectiveFunction):
 
         return xopt, xeq
 
+    def _get_checkpoint_state(self):
+        """Get the history and cached solutions needed to restart an optimization.
+
+        Returns
+        -------
+        state : dict
+            Previously seen values of the optimization variables, the corresponding
+            equilibrium solutions, and the history of accepted parameters.
+
+        """
+        # cached solutions, from least to most recently used
+        allx, allxopt_xeq = zip(*self._cache.items())
+        allxopt, allxeq = zip(*allxopt_xeq)
+        state = {
+            "x_old": np.asarray(self._x_old),
+            "allx": np.asarray(allx),
+            "allxopt": np.asarray(allxopt),
+            "allxeq": np.asarray(allxeq),
+            "history": self.history,
+        }
+        if self._inner_jac is not None:
+            state["inner_jac"] = np.asarray(self._inner_jac)
+        return state
+
+    def _set_checkpoint_state(self, state):
+        """Restore the state saved by ``_get_checkpoint_state``.
+
+        Parameters
+        ----------
+        state : dict
+            Previously seen values of the optimization variables, the corresponding
+            equilibrium solutions, and the history of accepted parameters.
+
+        """
+        errorif(
+            np.shape(state["x_old"]) != (self.dim_x,),
+            ValueError,
+            "Checkpoint does not match the optimization variables, expected "
+            + f"{self.dim_x} got {np.size(state['x_old'])}.",
+        )
+        self._x_old = jnp.asarray(state["x_old"])
+        self._cache.clear()
+        for x, xopt, xeq in zip(state["allx"], state["allxopt"], state["allxeq"]):
+            self._cache.put(x, (jnp.asarray(xopt), jnp.asarray(xeq)))
+        self.history = state["history"]
+        self._inner_jac = state.get("inner_jac", None)
+        if self._inner_jac is not None:
+            self._inner_jac = jnp.asarray(self._inner_jac)
+        self._eq.params_dict = self.history[-1][self._eq_idx]
+        for con in self._linear_constraints:
+            if hasattr(con, "update_target"):
+                con.update_target(self._eq)
+
     def compute_scaled(self, x, constants=None):
         """Compute the objective function and apply weights/normalization.
 
@@ -972,9 +1147,13 @@ class ProximalProjection(ObjectiveFunction):
         v = v[0] if isinstance(v, (tuple, list)) else v
         constants = setdefault(constants, self.constants)
         xg, xf = self._update_equilibrium(x, store=True)
-        jvpfun = lambda u: self._jvp(u, xf, xg, constants, op="scaled")
+        Fx, Fxh_inv = self._factorize_constraint(xf, constants, op="scaled")
+        jvpfun = lambda u: self._jvp(u, xg, Fx, Fxh_inv, constants, op="scaled")
         return batched_vectorize(
-            jvpfun, signature="(n)->(k)", chunk_size=self._objective._jac_chunk_size
+            jvpfun,
+            signature="(n)->(k)",
+            chunk_size=self._objective._jac_chunk_size,
+            devices=self._objective._jac_devices,
         )(v)
 
     def jvp_scaled_error(self, v, x, constants=None):
@@ -994,9 +1173,13 @@ class ProximalProjection(ObjectiveFunction):
         v = v[0] if isinstance(v, (tuple, list)) else v
         constants = setdefault(constants, self.constants)
         xg, xf = self._update_equilibrium(x, store=True)
-        jvpfun = lambda u: self._jvp(u, xf, xg, constants, op="scaled_error")
+        Fx, Fxh_inv = self._factorize_constraint(xf, constants, op="scaled_error")
+        jvpfun = lambda u: self._jvp(u, xg, Fx, Fxh_inv, constants, op="scaled_error")
         return batched_vectorize(
-            jvpfun, signature="(n)->(k)", chunk_size=self._objective._jac_chunk_size
+            jvpfun,
+            signature="(n)->(k)",
+            chunk_size=self._objective._jac_chunk_size,
+            devices=self._objective._jac_devices,
         )(v)
 
     def jvp_unscaled(self, v, x, constants=None):
@@ -1016,12 +1199,32 @@ class ProximalProjection(ObjectiveFunction):
         v = v[0] if isinstance(v, (tuple, list)) else v
         constants = setdefault(constants, self.constants)
         xg, xf = self._update_equilibrium(x, store=True)
-        jvpfun = lambda u: self._jvp(u, xf, xg, constants, op="unscaled")
+        Fx, Fxh_inv = self._factorize_constraint(xf, constants, op="unscaled")
+        jvpfun = lambda u: self._jvp(u, xg, Fx, Fxh_inv, constants, op="unscaled")
         return batched_vectorize(
-            jvpfun, signature="(n)->(k)", chunk_size=self._objective._jac_chunk_size
+            jvpfun,
+            signature="(n)->(k)",
+            chunk_size=self._objective._jac_chunk_size,
+            devices=self._objective._jac_devices,
         )(v)
 
-    def _jvp(self, v, xf, xg, constants, op):
+    def _factorize_constraint(self, xf, constants, op):
+        # the same Jacobian and pseudo-inverse of the constraint are used for every
+        # jvp at this point, so they are computed once rather than for each vector
+        Fx, Fxh_inv = _proximal_factorize_f_pure(
+            self._constraint,
+            xf,
+            constants[1],
+            self._unfixed_idx,
+            self._Z,
+            self._D,
+            op,
+        )
+        if op != "unscaled":
+            self._inner_jac = Fx
+        return Fx, Fxh_inv
+
+    def _jvp(self, v, xg, Fx, Fxh_inv, constants, op):
         # we're replacing stuff like this with jvps
         # Fx_reduced = Fx[:, unfixed_idx] @ Z               # noqa: E800
         # Gx_reduced = Gx[:, unfixed_idx] @ Z               # noqa: E800
@@ -1033,17 +1236,7 @@ class ProximalProjection(ObjectiveFunction):
         # want jvp_f to only get parts from equilibrium, not other things
         vs = jnp.split(v, np.cumsum(self._dimc_per_thing))
         # this is Fx_reduced_inv @ Fc
-        dfdc = _proximal_jvp_f_pure(
-            self._constraint,
-            xf,
-            constants[1],
-            vs[self._eq_idx],
-            self._unfixed_idx,
-            self._Z,
-            self._D,
-            self._dxdc,
-            op,
-        )
+        dfdc = Fxh_inv @ (Fx @ (self._dxdc @ vs[self._eq_idx]))
         # broadcasting against multiple things
         dfdcs = [jnp.zeros(dim) for dim in self._dimc_per_thing]
         dfdcs[self._eq_idx] = dfdc
@@ -1073,6 +1266,18 @@ class ProximalProjection(ObjectiveFunction):
         """list: constant parameters for each sub-objective."""
         return [self._objective.constants, self._constraint.constants]
 
+    def cache_info(self):
+        """Return statistics of the cache of solved equilibria.
+
+        Returns
+        -------
+        info : CacheInfo
+            Named tuple of the number of hits and misses, the maximum size and the
+            current size of the cache, similar to ``functools.lru_cache``.
+
+        """
+        return self._cache.cache_info()
+
     def __getattr__(self, name):
         """For other attributes we defer to the base objective."""
         return getattr(self._objective, name)
@@ -1086,17 +1291,16 @@ class ProximalProjection(ObjectiveFunction):
 
 
 @functools.partial(jit, static_argnames=["op"])
-def _proximal_jvp_f_pure(constraint, xf, constants, dc, unfixed_idx, Z, D, dxdc, op):
+def _proximal_factorize_f_pure(constraint, xf, constants, unfixed_idx, Z, D, op):
     Fx = getattr(constraint, "jac_" + op)(xf, constants)
-    Fx_reduced = Fx @ jnp.diag(D)[:, unfixed_idx] @ Z
-    Fc = Fx @ (dxdc @ dc)
+    Fx_reduced = Fx[:, unfixed_idx] @ (D[unfixed_idx, None] * Z)
     Fxh = Fx_reduced
     cutoff = jnp.finfo(Fxh.dtype).eps * max(Fxh.shape)
     uf, sf, vtf = jnp.linalg.svd(Fxh, full_matrices=False)
     sf += sf[-1]  # add a tiny bit of regularization
     sfi = jnp.where(sf < cutoff * sf[0], 0, 1 / sf)
     Fxh_inv = vtf.T @ (sfi[..., None] * uf.T)
-    return Fxh_inv @ Fc
+    return Fx, Fxh_inv
 
 
 @functools.partial(jit, static_argnames=["op"])
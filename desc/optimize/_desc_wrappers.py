@@ -1,6 +1,7 @@
 from scipy.optimize import NonlinearConstraint
 
 from desc.backend import jnp
+from desc.utils import errorif
 
 from .aug_lagrangian import fmin_auglag
 from .aug_lagrangian_ls import lsq_auglag
@@ -266,6 +267,15 @@ def _optimize_desc_least_squares(
     elif options.get("initial_trust_radius", "scipy") == "scipy":
         options.setdefault("initial_trust_ratio", 0.1)
     options["max_nfev"] = stoptol["max_nfev"]
+    if options.get("tr_method", "qr") == "cg":
+        errorif(
+            not hasattr(objective, "vjp_scaled_error"),
+            ValueError,
+            f"tr_method='cg' requires vector-Jacobian products, which {objective} "
+            "does not provide.",
+        )
+        options.setdefault("jvp", objective.jvp_scaled_error)
+        options.setdefault("vjp", objective.vjp_scaled_error)
 
     result = lsqtr(
         objective.compute_scaled_error,
@@ -173,6 +173,14 @@ def lsq_auglag(  # noqa: C901 - FIXME: simplify this
           value decomposition. ``"cho"`` is generally the fastest for large systems,
           especially on GPU, but may be less accurate for badly scaled systems.
           ``"svd"`` is the most accurate but significantly slower. Default ``"qr"``.
+        - ``"checkpoint"`` : (callable) Called at the end of each iteration with a
+          dictionary of arrays holding the full state of the solver, including the
+          multipliers and penalty parameters, which can be passed back in as
+          ``"restart"`` to continue the optimization from there. The Jacobian is not
+          included, it is recomputed on restart.
+        - ``"restart"`` : (dict) State of the solver saved by ``"checkpoint"``. If
+          given, ``x0`` is ignored and the optimization continues exactly as it would
+          have from where the state was saved, without recomputing the residual.
 
     Returns
     -------
@@ -232,22 +240,29 @@ def lsq_auglag(  # noqa: C901 - FIXME: simplify this
     nfev = 0
     njev = 0
     iteration = 0
-
-    z = z0.copy()
-    f = fun_wrapped(z, *args)
-    cost = 1 / 2 * jnp.dot(f, f)
-    c = constraint_wrapped.fun(z, *args)
-    constr_violation = jnp.linalg.norm(c, ord=jnp.inf)
-    nfev += 1
+    checkpoint = options.pop("checkpoint", None)
+    restart = options.pop("restart", None)
 
     lb, ub = zbounds
     bounded = jnp.any(lb != -jnp.inf) | jnp.any(ub != jnp.inf)
-    assert in_bounds(z, lb, ub), "x0 is infeasible"
-    z = make_strictly_feasible(z, lb, ub)
+    if restart is not None:
+        z0, z, f, c = map(jnp.asarray, (restart[k] for k in ["z0", "z", "f", "c"]))
+        nfev, njev = int(restart["nfev"]), int(restart["njev"])
+    else:
+        z = z0.copy()
+        f = fun_wrapped(z, *args)
+        c = constraint_wrapped.fun(z, *args)
+        nfev += 1
+        assert in_bounds(z, lb, ub), "x0 is infeasible"
+        z = make_strictly_feasible(z, lb, ub)
+    cost = 1 / 2 * jnp.dot(f, f)
+    constr_violation = jnp.linalg.norm(c, ord=jnp.inf)
 
     mu = options.pop("initial_penalty_parameter", 10 * jnp.ones_like(c))
     y = options.pop("initial_multipliers", jnp.zeros_like(c))
-    if y == "least_squares":  # use least squares multiplier estimates
+    if restart is not None:
+        y, mu = jnp.asarray(restart["y"]), jnp.asarray(restart["mu"])
+    elif y == "least_squares":  # use least squares multiplier estimates
         _J = constraint_wrapped.jac(z, *args)
         _g = f @ jac_wrapped(z, *args)
         y = jnp.linalg.lstsq(_J.T, _g)[0]
@@ -263,13 +278,21 @@ def lsq_auglag(  # noqa: C901 - FIXME: simplify this
     beta_eta = options.pop("beta_eta", 0.9)
     tau = options.pop("tau", 10)
 
-    gtolk = max(omega / jnp.mean(mu) ** alpha_omega, gtol)
-    ctolk = max(eta / jnp.mean(mu) ** alpha_eta, ctol)
+    if restart is not None:
+        gtolk, ctolk = jnp.asarray(restart["gtolk"]), jnp.asarray(restart["ctolk"])
+    else:
+        gtolk = max(omega / jnp.mean(mu) ** alpha_omega, gtol)
+        ctolk = max(eta / jnp.mean(mu) ** alpha_eta, ctol)
 
     L = lagfun(f, c, y, mu)
-    J = lagjac(z, y, mu, *args)
+    if restart is not None:
+        # same as the Jacobian at the time of the checkpoint, so it isn't counted
+        # as a new evaluation
+        J, g = lagjac(z, y, mu, *args), jnp.asarray(restart["g"])
+    else:
+        J = lagjac(z, y, mu, *args)
+        g = L @ J
     Lcost = 1 / 2 * jnp.dot(L, L)
-    g = L @ J
 
     allx = []
 
@@ -278,7 +301,11 @@ def lsq_auglag(  # noqa: C901 - FIXME: simplify this
     max_dx = options.pop("max_dx", jnp.inf)
 
     jac_scale = isinstance(x_scale, str) and x_scale in ["jac", "auto"]
-    if jac_scale:
+    if restart is not None:
+        scale, scale_inv = jnp.asarray(restart["scale"]), jnp.asarray(
+            restart["scale_inv"]
+        )
+    elif jac_scale:
         scale, scale_inv = compute_jac_scale(J)
     else:
         x_scale = jnp.broadcast_to(x_scale, z.shape)
@@ -310,6 +337,8 @@ def lsq_auglag(  # noqa: C901 - FIXME: simplify this
     trust_radius = init_tr.get(trust_radius, trust_radius)
     trust_radius *= tr_ratio
     trust_radius = trust_radius if (trust_radius > 0) else 1.0
+    if restart is not None:
+        trust_radius = jnp.asarray(restart["trust_radius"])
 
     max_trust_radius = options.pop("max_trust_radius", jnp.inf)
     min_trust_radius = options.pop("min_trust_radius", jnp.finfo(z.dtype).eps)
@@ -342,6 +371,11 @@ def lsq_auglag(  # noqa: C901 - FIXME: simplify this
 
     allx = [z]
     alltr = [trust_radius]
+    if restart is not None:
+        iteration = int(restart["iteration"])
+        alpha = jnp.asarray(restart["alpha"])
+        allx = list(jnp.asarray(restart["allx"]))
+        alltr = list(jnp.asarray(restart["alltr"]))
     if g_norm < gtol and constr_violation < ctol:
         success, message = True, STATUS_MESSAGES["gtol"]
 
@@ -374,9 +408,14 @@ def lsq_auglag(  # noqa: C901 - FIXME: simplify this
             tall = J_a.shape[0] >= J_a.shape[1]
             if tall:
                 Q, R = qr(J_a, mode="economic")
-                p_newton = solve_triangular_regularized(R, -Q.T @ L_a)
+                # ||J_a p + f_a|| = ||R p + Q.T f_a|| + const, so when the step is
+                # rejected and the subproblem solved again with a smaller radius
+                # we can reuse the factorization and only work with the small R
+                J_r, f_r = R, Q.T @ L_a
+                p_newton = solve_triangular_regularized(R, -f_r)
             else:
                 Q, R = qr(J_a.T, mode="economic")
+                J_r, f_r = J_a, L_a
                 p_newton = Q @ solve_triangular_regularized(R.T, -L_a, lower=True)
 
         actual_reduction = -1
@@ -400,7 +439,7 @@ def lsq_auglag(  # noqa: C901 - FIXME: simplify this
                 )
             elif tr_method == "qr":
                 step_h, hits_boundary, alpha = trust_region_step_exact_qr(
-                    p_newton, L_a, J_a, trust_radius, alpha
+                    p_newton, f_r, J_r, trust_radius, alpha
                 )
 
             step = d * step_h  # Trust-region solution in the original space.
@@ -546,6 +585,30 @@ def lsq_auglag(  # noqa: C901 - FIXME: simplify this
                 jnp.mean(mu),
                 jnp.max(jnp.abs(y)),
             )
+        if checkpoint is not None and success is None:
+            checkpoint(
+                {
+                    "z0": z0,
+                    "z": z,
+                    "f": f,
+                    "c": c,
+                    "y": y,
+                    "mu": mu,
+                    "g": g,
+                    "gtolk": gtolk,
+                    "ctolk": ctolk,
+                    "scale": scale,
+                    "scale_inv": scale_inv,
+                    "trust_radius": trust_radius,
+                    "alpha": alpha,
+                    "iteration": iteration,
+                    "nfev": nfev,
+                    "njev": njev,
+                    "allx": jnp.asarray(allx),
+                    "alltr": jnp.asarray(alltr),
+                    "recompute_jac": True,
+                }
+            )
 
     if g_norm < gtol and constr_violation < ctol:
         success, message = True, STATUS_MESSAGES["gtol"]
@@ -13,6 +13,7 @@ from .bound_utils import (
     select_step,
 )
 from .tr_subproblems import (
+    trust_region_step_cg,
     trust_region_step_exact_cho,
     trust_region_step_exact_qr,
     trust_region_step_exact_svd,
@@ -20,8 +21,10 @@ from .tr_subproblems import (
 )
 from .utils import (
     STATUS_MESSAGES,
+    ScaledJacobianOperator,
     check_termination,
     compute_jac_scale,
+    compute_jac_scale_matfree,
     print_header_nonlinear,
     print_iteration_nonlinear,
     solve_triangular_regularized,
@@ -68,7 +71,10 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
         be achieved by setting ``x_scale`` such that a step of a given size
         along any of the scaled variables has a similar effect on the cost
         function. If set to ``'jac'``, the scale is iteratively updated using the
-        inverse norms of the columns of the Jacobian matrix.
+        inverse norms of the columns of the Jacobian matrix. With ``tr_method="cg"``
+        the column norms are estimated from vector-Jacobian products, and the
+        resulting scaling acts as a diagonal preconditioner for the conjugate
+        gradient iteration.
     ftol : float or None, optional
         Tolerance for termination by the change of the cost function.
         The optimization process is stopped when ``dF < ftol * F``,
@@ -133,12 +139,47 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
         - ``"tr_decrease_ratio"`` : (0 < float < 1) Factor to decrease the trust region
           radius by when  the ratio of actual to predicted reduction falls below
           threshold. Default 0.25.
-        - ``"tr_method"`` : (``"qr"``, ``"svd"``, ``"cho"``) Method to use for solving
-          the trust region subproblem. ``"qr"`` and ``"cho"`` uses a sequence of QR or
-          Cholesky factorizations (generally 2-3), while ``"svd"`` uses one singular
-          value decomposition. ``"cho"`` is generally the fastest for large systems,
-          especially on GPU, but may be less accurate for badly scaled systems.
-          ``"svd"`` is the most accurate but significantly slower. Default ``"qr"``.
+        - ``"tr_method"`` : (``"qr"``, ``"svd"``, ``"cho"``, ``"cg"``) Method to use
+          for solving the trust region subproblem. ``"qr"`` and ``"cho"`` uses a
+          sequence of QR or Cholesky factorizations (generally 2-3), while ``"svd"``
+          uses one singular value decomposition. ``"cho"`` is generally the fastest
+          for large systems, especially on GPU, but may be less accurate for badly
+          scaled systems. ``"svd"`` is the most accurate but significantly slower.
+          ``"cg"`` uses the Steihaug-Toint conjugate gradient method with only
+          Jacobian-vector and vector-Jacobian products, so the Jacobian is never
+          formed. Requires the ``"jvp"`` and ``"vjp"`` options. Default ``"qr"``.
+        - ``"jvp"``, ``"vjp"`` : (callable) Functions to compute Jacobian-vector and
+          vector-Jacobian products, with signatures ``jvp(v, x, *args) -> J @ v``
+          and ``vjp(v, x, *args) -> v.T @ J``. Only used if ``tr_method="cg"``, in
+          which case ``jac`` is ignored.
+        - ``"cg_maxiter"`` : (int > 0) Maximum number of conjugate gradient
+          iterations per subproblem when ``tr_method="cg"``. Default ``x0.size``.
+        - ``"cg_rtol"`` : (float > 0) Relative tolerance on the residual of the
+          Newton equations when ``tr_method="cg"``. Default
+          ``min(0.5, sqrt(norm(g)))``.
+        - ``"jac_scale_num_probes"`` : (int > 0) Number of random vectors used to
+          estimate the Jacobian column norms when ``tr_method="cg"`` and
+          ``x_scale="jac"``. Default 16.
+        - ``"max_broyden_updates"`` : (int >= 0) Number of accepted steps after a
+          Jacobian evaluation for which the Jacobian is approximated by Broyden
+          rank-one updates instead of being recomputed. If a step taken with an
+          approximate Jacobian is rejected, the true Jacobian is computed before
+          trying again. Useful when the Jacobian is much more expensive than the
+          residual. Default 0, so the Jacobian is recomputed after every step.
+        - ``"initial_jac"`` : (ndarray) Approximate Jacobian at ``x0``, for example
+          from a previous solve of a nearby problem, used in place of evaluating the
+          Jacobian at the start. It is treated like a Broyden approximation, so the
+          true Jacobian is computed once ``"max_broyden_updates"`` steps have been
+          accepted, or as soon as a step taken with it is rejected. Not supported
+          with ``tr_method="cg"``.
+        - ``"checkpoint"`` : (callable) Called at the end of each iteration with a
+          dictionary of arrays holding the full state of the solver, which can be
+          passed back in as ``"restart"`` to continue the optimization from there.
+          The Jacobian is only included if it is a Broyden approximation, otherwise
+          it is recomputed on restart.
+        - ``"restart"`` : (dict) State of the solver saved by ``"checkpoint"``. If
+          given, ``x0`` is ignored and the optimization continues exactly as it would
+          have from where the state was saved, without recomputing the residual.
 
     Returns
     -------
@@ -173,19 +214,90 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
     assert in_bounds(x, lb, ub), "x0 is infeasible"
     x = make_strictly_feasible(x, lb, ub)
 
-    f = fun(x, *args)
-    nfev += 1
+    tr_method = options.pop("tr_method", "qr")
+    errorif(
+        tr_method not in ["cho", "svd", "qr", "cg"],
+        ValueError,
+        "tr_method should be one of 'cho', 'svd', 'qr', 'cg', got {}".format(tr_method),
+    )
+    matfree = tr_method == "cg"
+    jvp = options.pop("jvp", None)
+    vjp = options.pop("vjp", None)
+    cg_maxiter = options.pop("cg_maxiter", None)
+    cg_rtol = options.pop("cg_rtol", None)
+    num_probes = options.pop("jac_scale_num_probes", 16)
+    max_broyden_updates = options.pop("max_broyden_updates", 0)
+    errorif(
+        matfree and (jvp is None or vjp is None),
+        ValueError,
+        "tr_method='cg' requires the 'jvp' and 'vjp' options.",
+    )
+    errorif(
+        matfree and max_broyden_updates > 0,
+        ValueError,
+        "Broyden updates of the Jacobian are not supported with tr_method='cg'.",
+    )
+    initial_jac = options.pop("initial_jac", None)
+    errorif(
+        matfree and initial_jac is not None,
+        ValueError,
+        "initial_jac is not supported with tr_method='cg'.",
+    )
+    checkpoint = options.pop("checkpoint", None)
+    restart = options.pop("restart", None)
+    jac_age = 0  # number of accepted steps since the Jacobian was last computed
+    stale = False  # whether J is a Broyden approximation
+
+    if restart is not None:
+        x0, x, f, g = map(jnp.asarray, (restart[k] for k in ["x0", "x", "f", "g"]))
+        nfev, njev = int(restart["nfev"]), int(restart["njev"])
+        if matfree:
+            J = None
+        elif restart["recompute_jac"]:
+            # same as the saved Jacobian, which is only saved if it is a Broyden
+            # approximation, so it isn't counted as a new evaluation
+            J = jac(x, *args)
+        else:
+            J = jnp.asarray(restart["J"])
+    elif matfree:
+        f = fun(x, *args)
+        nfev += 1
+        J = None
+        g = vjp(f, x, *args)
+        njev += 1
+    elif initial_jac is not None:
+        f = fun(x, *args)
+        nfev += 1
+        J = jnp.asarray(initial_jac)
+        errorif(
+            J.shape != (f.size, x.size),
+            ValueError,
+            f"initial_jac should have shape {(f.size, x.size)}, got {J.shape}.",
+        )
+        g = jnp.dot(J.T, f)
+        stale = True
+    else:
+        f = fun(x, *args)
+        nfev += 1
+        J = jac(x, *args)
+        g = jnp.dot(J.T, f)
+        njev += 1
     cost = 0.5 * jnp.dot(f, f)
-    J = jac(x, *args)
-    njev += 1
-    g = jnp.dot(J.T, f)
 
     maxiter = setdefault(maxiter, n * 100)
     max_nfev = options.pop("max_nfev", 5 * maxiter + 1)
     max_dx = options.pop("max_dx", jnp.inf)
 
     jac_scale = isinstance(x_scale, str) and x_scale in ["jac", "auto"]
-    if jac_scale:
+    if restart is not None:
+        scale, scale_inv = jnp.asarray(restart["scale"]), jnp.asarray(
+            restart["scale_inv"]
+        )
+    elif jac_scale and matfree:
+        scale, scale_inv = compute_jac_scale_matfree(
+            vjp, x, f.size, args, num_probes=num_probes
+        )
+    elif jac_scale:
         scale, scale_inv = compute_jac_scale(J)
     else:
         x_scale = jnp.broadcast_to(x_scale, x.shape)
@@ -197,16 +309,16 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
     diag_h = g * dv * scale
 
     g_h = g * d
-    J_h = J * d
+    J_h = ScaledJacobianOperator(jvp, vjp, x, d, args) if matfree else J * d
     g_norm = jnp.linalg.norm(g * v, ord=jnp.inf)
 
     # conngould : norm of the cauchy point, as recommended in ch17 of Conn & Gould
     # scipy : norm of the scaled x, as used in scipy
     # mix : geometric mean of conngould and scipy
     init_tr = {
-        "scipy": jnp.linalg.norm(x * scale_inv / v**0.5),
-        "conngould": jnp.sum(g_h**2) / jnp.sum((J_h @ g_h) ** 2),
-        "mix": jnp.sqrt(
+        "scipy": lambda: jnp.linalg.norm(x * scale_inv / v**0.5),
+        "conngould": lambda: jnp.sum(g_h**2) / jnp.sum((J_h @ g_h) ** 2),
+        "mix": lambda: jnp.sqrt(
             jnp.sum(g_h**2)
             / jnp.sum((J_h @ g_h) ** 2)
             * jnp.linalg.norm(x * scale_inv / v**0.5)
@@ -214,9 +326,14 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
     }
     trust_radius = options.pop("initial_trust_radius", "scipy")
     tr_ratio = options.pop("initial_trust_ratio", 1.0)
-    trust_radius = init_tr.get(trust_radius, trust_radius)
-    trust_radius *= tr_ratio
-    trust_radius = trust_radius if (trust_radius > 0) else 1.0
+    if restart is not None:
+        trust_radius = jnp.asarray(restart["trust_radius"])
+    else:
+        trust_radius = (
+            init_tr[trust_radius]() if trust_radius in init_tr else trust_radius
+        )
+        trust_radius *= tr_ratio
+        trust_radius = trust_radius if (trust_radius > 0) else 1.0
 
     max_trust_radius = options.pop("max_trust_radius", jnp.inf)
     min_trust_radius = options.pop("min_trust_radius", jnp.finfo(x0.dtype).eps)
@@ -224,18 +341,12 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
     tr_decrease_threshold = options.pop("tr_decrease_threshold", 0.25)
     tr_increase_ratio = options.pop("tr_increase_ratio", 2)
     tr_decrease_ratio = options.pop("tr_decrease_ratio", 0.25)
-    tr_method = options.pop("tr_method", "qr")
 
     errorif(
         len(options) > 0,
         ValueError,
         "Unknown options: {}".format([key for key in options]),
     )
-    errorif(
-        tr_method not in ["cho", "svd", "qr"],
-        ValueError,
-        "tr_method should be one of 'cho', 'svd', 'qr', got {}".format(tr_method),
-    )
 
     callback = setdefault(callback, lambda *args: False)
 
@@ -254,16 +365,29 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
 
     allx = [x]
     alltr = [trust_radius]
-    if g_norm < gtol:
+    if g_norm < gtol and not stale:
         success, message = True, STATUS_MESSAGES["gtol"]
 
     alpha = None  # "Levenberg-Marquardt" parameter
 
+    if restart is not None:
+        iteration = int(restart["iteration"])
+        jac_age, stale = int(restart["jac_age"]), bool(restart["stale"])
+        alpha = jnp.asarray(restart["alpha"])
+        allx = list(jnp.asarray(restart["allx"]))
+        alltr = list(jnp.asarray(restart["alltr"]))
+
     while iteration < maxiter and success is None:
 
-        # we don't want to factorize the extra stuff if we don't need to
-        J_a = jnp.vstack([J_h, jnp.diag(diag_h**0.5)]) if bounded else J_h
-        f_a = jnp.concatenate([f, jnp.zeros(diag_h.size)]) if bounded else f
+        if matfree:
+            # B = J_h.T @ J_h + diag(diag_h), never formed explicitly
+            hvp = lambda p, J_h=J_h, diag_h=diag_h: J_h.rdot(J_h.dot(p)) + (
+                diag_h * p if bounded else 0
+            )
+        else:
+            # we don't want to factorize the extra stuff if we don't need to
+            J_a = jnp.vstack([J_h, jnp.diag(diag_h**0.5)]) if bounded else J_h
+            f_a = jnp.concatenate([f, jnp.zeros(diag_h.size)]) if bounded else f
 
         if tr_method == "svd":
             U, s, Vt = jnp.linalg.svd(J_a, full_matrices=False)
@@ -274,9 +398,14 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
             tall = J_a.shape[0] >= J_a.shape[1]
             if tall:
                 Q, R = qr(J_a, mode="economic")
-                p_newton = solve_triangular_regularized(R, -Q.T @ f_a)
+                # ||J_a p + f_a|| = ||R p + Q.T f_a|| + const, so when the step is
+                # rejected and the subproblem solved again with a smaller radius
+                # we can reuse the factorization and only work with the small R
+                J_r, f_r = R, Q.T @ f_a
+                p_newton = solve_triangular_regularized(R, -f_r)
             else:
                 Q, R = qr(J_a.T, mode="economic")
+                J_r, f_r = J_a, f_a
                 p_newton = Q @ solve_triangular_regularized(R.T, -f_a, lower=True)
 
         actual_reduction = -1
@@ -299,7 +428,11 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
                 )
             elif tr_method == "qr":
                 step_h, hits_boundary, alpha = trust_region_step_exact_qr(
-                    p_newton, f_a, J_a, trust_radius, alpha
+                    p_newton, f_r, J_r, trust_radius, alpha
+                )
+            elif tr_method == "cg":
+                step_h, hits_boundary, alpha = trust_region_step_cg(
+                    g_h, hvp, trust_radius, alpha, cg_rtol, cg_maxiter
                 )
             step = d * step_h  # Trust-region solution in the original space.
 
@@ -344,6 +477,9 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
             )
             alltr.append(trust_radius)
             alpha *= tr_old / trust_radius
+            if stale and actual_reduction <= 0:
+                # model from the approximate Jacobian wasn't good enough
+                break
             # TODO: does this need to move to the outer loop?
             success, message = check_termination(
                 actual_reduction,
@@ -366,33 +502,58 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
             if success is not None:
                 break
 
-        # if reduction was enough, accept the step
-        if actual_reduction > 0:
-            x = x_new
-            allx.append(x)
-            f = f_new
-            cost = cost_new
-            J = jac(x, *args)
-            njev += 1
-            g = jnp.dot(J.T, f)
-
-            if jac_scale:
-                scale, scale_inv = compute_jac_scale(J, scale_inv)
-
-            v, dv = cl_scaling_vector(x, g, lb, ub)
-            v = jnp.where(dv != 0, v * scale_inv, v)
-            d = v**0.5 * scale
-            diag_h = g * dv * scale
-
-            g_h = g * d
-            J_h = J * d
-            x_norm = jnp.linalg.norm(x, ord=2)
-            g_norm = jnp.linalg.norm(g * v, ord=jnp.inf)
+        # if reduction was enough, accept the step. If the step was rejected with
+        # an approximate Jacobian, compute the true one before trying again.
+        if actual_reduction > 0 or stale:
+            if actual_reduction > 0:
+                dx, df = x_new - x, f_new - f
+                x = x_new
+                allx.append(x)
+                f = f_new
+                cost = cost_new
+                jac_age += 1
+            refresh = not (actual_reduction > 0 and jac_age <= max_broyden_updates)
+            while True:
+                if matfree:
+                    g = vjp(f, x, *args)
+                    njev += 1
+                elif refresh:
+                    J = jac(x, *args)
+                    g = jnp.dot(J.T, f)
+                    njev += 1
+                    jac_age = 0
+                    stale = False
+                else:
+                    # Broyden rank one update, such that J @ dx == df
+                    J = J + jnp.outer(df - J @ dx, dx) / jnp.dot(dx, dx)
+                    g = jnp.dot(J.T, f)
+                    stale = True
+
+                if jac_scale and matfree:
+                    scale, scale_inv = compute_jac_scale_matfree(
+                        vjp, x, f.size, args, scale_inv, num_probes
+                    )
+                elif jac_scale:
+                    scale, scale_inv = compute_jac_scale(J, scale_inv)
+
+                v, dv = cl_scaling_vector(x, g, lb, ub)
+                v = jnp.where(dv != 0, v * scale_inv, v)
+                d = v**0.5 * scale
+                diag_h = g * dv * scale
+
+                g_h = g * d
+                J_h = ScaledJacobianOperator(jvp, vjp, x, d, args) if matfree else J * d
+                x_norm = jnp.linalg.norm(x, ord=2)
+                g_norm = jnp.linalg.norm(g * v, ord=jnp.inf)
+                if not (stale and g_norm < gtol):
+                    break
+                # don't trust convergence based on an approximate Jacobian
+                refresh = True
 
             if g_norm < gtol:
                 success, message = True, STATUS_MESSAGES["gtol"]
 
-            if callback(jnp.copy(x), *args):
+            if actual_reduction > 0 and callback(jnp.copy(x), *args):
                 success, message = False, STATUS_MESSAGES["callback"]
 
         else:
@@ -403,6 +564,28 @@ def lsqtr(  # noqa: C901 - FIXME: simplify this
             print_iteration_nonlinear(
                 iteration, nfev, cost, actual_reduction, step_norm, g_norm
             )
+        if checkpoint is not None and success is None:
+            state = {
+                "x0": x0,
+                "x": x,
+                "f": f,
+                "g": g,
+                "scale": scale,
+                "scale_inv": scale_inv,
+                "trust_radius": trust_radius,
+                "alpha": alpha,
+                "iteration": iteration,
+                "nfev": nfev,
+                "njev": njev,
+                "jac_age": jac_age,
+                "stale": stale,
+                "allx": jnp.asarray(allx),
+                "alltr": jnp.asarray(alltr),
+                "recompute_jac": not (matfree or stale),
+            }
+            if stale:
+                state["J"] = J
+            checkpoint(state)
 
     if g_norm < gtol:
         success, message = True, STATUS_MESSAGES["gtol"]
@@ -1,5 +1,6 @@
 """Class for wrapping a number of common optimization methods."""
 
+import os
 import warnings
 
 import numpy as np
@@ -91,6 +92,9 @@ class Optimizer(IOAble):
         maxiter=None,
         options=None,
         copy=False,
+        checkpoint=None,
+        checkpoint_every=10,
+        restart_from=None,
     ):
         """Optimize an objective function.
 
@@ -141,6 +145,17 @@ class Optimizer(IOAble):
         copy : bool
             Whether to return the current things or a copy (leaving the original
             unchanged).
+        checkpoint : str or path-like, optional
+            File to periodically save the state of the optimizer to, so that it can
+            be restarted if interrupted. Only supported for methods based on
+            ``lsq-exact`` and ``lsq-auglag``.
+        checkpoint_every : int
+            Number of iterations between saving checkpoints.
+        restart_from : str or path-like, optional
+            Checkpoint file to restart the optimization from. The optimization should
+            be set up the same way as the one that saved the checkpoint, with the same
+            method, objective, constraints and initial ``things``. The result is then
+            the same as if the optimization had never been interrupted.
 
         Returns
         -------
@@ -209,7 +224,7 @@ class Optimizer(IOAble):
         objective, nonlinear_constraints = _maybe_wrap_nonlinear_constraints(
             eq, objective, nonlinear_constraints, self.method, options
         )
-        if not isinstance(objective, ProximalProjection):
+        if not isinstance(objective, (ProximalProjection, LinearConstraintProjection)):
             for t in things:
                 linear_constraints = maybe_add_self_consistency(t, linear_constraints)
         linear_constraint = _combine_constraints(linear_constraints)
@@ -250,13 +265,11 @@ class Optimizer(IOAble):
                 )
                 nonlinear_constraint.build(verbose=verbose)
 
-        if linear_constraint is not None and not isinstance(x_scale, str):
+        if isinstance(objective, LinearConstraintProjection) and not isinstance(
+            x_scale, str
+        ):
             # need to project x_scale down to correct size
-            Z = objective._Z
-            x_scale = np.broadcast_to(x_scale, objective._objective.dim_x)
-            x_scale = np.abs(
-                np.diag(Z.T @ np.diag(x_scale[objective._unfixed_idx]) @ Z)
-            )
+            x_scale = np.abs(objective._project_x_scale(x_scale))
             x_scale = np.where(x_scale < np.finfo(x_scale.dtype).eps, 1, x_scale)
 
         if objective.scalar and (not optimizers[method]["scalar"]):
@@ -302,6 +315,17 @@ class Optimizer(IOAble):
         if verbose > 1:
             timer.disp("Initializing the optimization")
 
+        _setup_checkpoint(
+            self.method,
+            objective,
+            x0,
+            options,
+            checkpoint,
+            checkpoint_every,
+            restart_from,
+            verbose,
+        )
+
         if verbose > 0:
             print("\nStarting optimization")
             print("Using method: " + str(self.method))
@@ -329,6 +353,12 @@ class Optimizer(IOAble):
             if eq is not None:
                 eq.params_dict = eq_params_init
             result["history"] = objective.history
+            if verbose > 1:
+                info = objective.cache_info()
+                print(
+                    f"Equilibrium cache: {info.hits} hits, {info.misses} misses, "
+                    + f"{info.currsize}/{info.maxsize} entries"
+                )
             objective = objective._objective
         else:
             result["history"] = [
@@ -385,6 +415,117 @@ class Optimizer(IOAble):
         return things, result
 
 
+class OptimizerCheckpoint(IOAble):
+    """State of an optimization, saved so that it can be restarted later.
+
+    Parameters
+    ----------
+    method : str
+        Name of the optimization method.
+    dim_x : int
+        Number of optimization variables.
+    solver_state : dict
+        Iterate, trust region, scaling, multipliers and counters of the solver.
+    wrapper_state : dict
+        Internal state of a ``ProximalProjection``, or empty if not used.
+
+    """
+
+    _io_attrs_ = ["method", "dim_x", "solver_state", "wrapper_state"]
+
+    def __init__(self, method, dim_x, solver_state, wrapper_state):
+        self.method = method
+        self.dim_x = dim_x
+        self.solver_state = solver_state
+        self.wrapper_state = wrapper_state
+
+    def save(self, file_name, file_format=None, file_mode="w", **kwargs):
+        """Save the checkpoint.
+
+        When saving to a file path, the checkpoint is first written to a temporary
+        file which then replaces the previous one, so that an interruption while
+        saving doesn't corrupt the last good checkpoint.
+
+        Parameters
+        ----------
+        file_name : str file path OR file instance
+            location to save object
+        file_format : str (Default hdf5)
+            format of save file. Only used if file_name is a file path
+        file_mode : str (Default w - overwrite)
+            mode for save file. Only used if file_name is a file path
+        **kwargs : dict, optional
+            Compression and chunking options, see ``IOAble.save``.
+
+        """
+        if not isinstance(file_name, (str, os.PathLike)):
+            return super().save(file_name, file_format, file_mode, **kwargs)
+        root, ext = os.path.splitext(os.fspath(file_name))
+        tmp = root + ".tmp" + ext
+        super().save(tmp, file_format, file_mode, **kwargs)
+        os.replace(tmp, file_name)
+
+
+def _setup_checkpoint(
+    method, objective, x0, options, checkpoint, checkpoint_every, restart_from, verbose
+):
+    """Add options to save and restore the solver state, and restore the wrapper."""
+    if checkpoint is None and restart_from is None:
+        return
+    errorif(
+        _parse_method(method)[1] not in ["lsq-exact", "lsq-auglag"],
+        NotImplementedError,
+        "Checkpointing is only supported for methods based on lsq-exact and "
+        + f"lsq-auglag, got {method}.",
+    )
+    proximal = objective
+    if isinstance(proximal, LinearConstraintProjection):
+        proximal = proximal._objective
+    if not isinstance(proximal, ProximalProjection):
+        proximal = None
+
+    if restart_from is not None:
+        restart = OptimizerCheckpoint.load(restart_from)
+        errorif(
+            restart.method != method,
+            ValueError,
+            f"Checkpoint was saved with method {restart.method}, got {method}.",
+        )
+        errorif(
+            restart.dim_x != x0.size,
+            ValueError,
+            "Checkpoint does not match the optimization variables, expected "
+            + f"{x0.size} got {restart.dim_x}.",
+        )
+        if proximal is not None:
+            proximal._set_checkpoint_state(restart.wrapper_state)
+            if restart.solver_state["recompute_jac"]:
+                # the Jacobian is recomputed at the restart point, which stores
+                # that point in the history again
+                proximal.history = proximal.history[:-1]
+        options["restart"] = restart.solver_state
+        if verbose > 0:
+            print(
+                "Restarting from iteration {} of {}".format(
+                    restart.solver_state["iteration"], restart_from
+                )
+            )
+
+    if checkpoint is not None:
+
+        def save_checkpoint(state):
+            if state["iteration"] % checkpoint_every:
+                return
+            OptimizerCheckpoint(
+                method,
+                x0.size,
+                {key: np.asarray(val) for key, val in state.items()},
+                {} if proximal is None else proximal._get_checkpoint_state(),
+            ).save(checkpoint)
+
+        options["checkpoint"] = save_checkpoint
+
+
 def _parse_method(method):
     """Split string into wrapper and method parts."""
     wrapper = None
@@ -486,12 +627,14 @@ def _maybe_wrap_nonlinear_constraints(
     if wrapper is not None and wrapper.lower() in ["prox", "proximal"]:
         perturb_options = options.pop("perturb_options", {})
         solve_options = options.pop("solve_options", {})
+        cache_size = options.pop("cache_size", 32)
         objective = ProximalProjection(
             objective,
             constraint=_combine_constraints(nonlinear_constraints),
             perturb_options=perturb_options,
             solve_options=solve_options,
             eq=eq,
+            cache_size=cache_size,
         )
         nonlinear_constraints = ()
     return objective, nonlinear_constraints
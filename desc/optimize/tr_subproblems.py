@@ -482,6 +482,91 @@ def trust_region_step_exact_qr(
     return cond(jnp.linalg.norm(p_newton) <= trust_radius, truefun, falsefun, None)
 
 
+def trust_region_step_cg(
+    g, hvp, trust_radius, initial_alpha=None, rtol=None, max_iter=None
+):
+    """Solve a trust-region problem using the Steihaug-Toint conjugate gradient method.
+
+    Solves problems of the form
+        min_p g.T*p + 0.5 * p.T*B*p,  ||p|| < trust_radius
+
+    using only products with B, so that B never needs to be formed. For least squares
+    problems B = J.T*J and the products can be computed from Jacobian-vector and
+    vector-Jacobian products.
+
+    Parameters
+    ----------
+    g : ndarray
+        Gradient of the objective function.
+    hvp : callable
+        Function to compute the product of B with a vector, ``hvp(p) -> B @ p``.
+    trust_radius : float
+        Radius of a trust region.
+    initial_alpha : float, optional
+        Unused by this method, returned unchanged for consistency with the other
+        subproblem solvers.
+    rtol : float, optional
+        Relative tolerance on the residual of the Newton equations. Iteration is
+        stopped once ``norm(B*p + g) < rtol * norm(g)``. If None, uses
+        ``min(0.5, sqrt(norm(g)))``.
+    max_iter : int, optional
+        Maximum number of conjugate gradient iterations. Defaults to ``g.size``.
+
+    Returns
+    -------
+    p : ndarray, shape (n,)
+        Found solution of a trust-region problem.
+    hits_boundary : bool
+        True if the proposed step is on the boundary of the trust region.
+    alpha : float
+        ``initial_alpha``, or 0 if not given.
+
+    References
+    ----------
+    .. [1] Steihaug, Trond. "The conjugate gradient method and trust regions in
+           large scale optimization." SIAM Journal on Numerical Analysis 20.3 (1983).
+    .. [2] Nocedal, Jorge, and Wright, Stephen. "Numerical optimization",
+           algorithm 7.2 (2006).
+
+    """
+    alpha = setdefault(initial_alpha, 0.0)
+    max_iter = setdefault(max_iter, g.size)
+    g_norm = jnp.linalg.norm(g)
+    rtol = setdefault(rtol, jnp.minimum(0.5, jnp.sqrt(g_norm)))
+    tol = rtol * g_norm
+
+    def to_boundary(z, d):
+        # positive root of ||z + t d|| == trust_radius
+        return z + get_boundaries_intersections(z, d, trust_radius)[1] * d
+
+    def loop_cond(state):
+        z, r, d, k, done, hits = state
+        return (~done) & (k < max_iter)
+
+    def loop_body(state):
+        z, r, d, k, done, hits = state
+        Bd = hvp(d)
+        dBd = jnp.dot(d, Bd)
+        rr = jnp.dot(r, r)
+        a = rr / jnp.where(dBd > 0, dBd, 1)
+        z_new = z + a * d
+        # negative curvature or leaving the trust region, so go to the boundary
+        exits = (dBd <= 0) | (jnp.linalg.norm(z_new) >= trust_radius)
+        r_new = r + a * Bd
+        converged = jnp.linalg.norm(r_new) < tol
+        beta = jnp.dot(r_new, r_new) / rr
+        d_new = -r_new + beta * d
+        z = jnp.where(exits, to_boundary(z, d), z_new)
+        r = jnp.where(exits, r, r_new)
+        d = jnp.where(exits, d, d_new)
+        return z, r, d, k + 1, exits | converged, exits
+
+    z = jnp.zeros_like(g)
+    state = (z, g, -g, 0, g_norm <= tol, False)
+    z, r, d, k, done, hits = while_loop(loop_cond, loop_body, state)
+    return z, hits, alpha
+
+
 def update_tr_radius(
     trust_radius,
     actual_reduction,
@@ -2,11 +2,12 @@
 
 import copy
 import functools
+from collections import OrderedDict, namedtuple
 
 import numpy as np
 
-from desc.backend import cond, jit, jnp, put, solve_triangular
-from desc.utils import Index
+from desc.backend import cond, jit, jnp, put, register_pytree_node, solve_triangular
+from desc.utils import Index, errorif, setdefault
 
 
 def inequality_to_bounds(x0, fun, grad, hess, constraint, bounds, *args):
@@ -487,6 +488,97 @@ def compute_jac_scale(A, prev_scale_inv=None):
     return 1 / scale_inv, scale_inv
 
 
+def compute_jac_scale_matfree(vjp, x, m, args=(), prev_scale_inv=None, num_probes=16):
+    """Estimate scaling factor based on column norm of Jacobian without forming it.
+
+    Uses the fact that E[(J.T @ z)**2] = sum(J**2, axis=0) for random vectors z
+    with entries of +/-1 (Hutchinson's estimator).
+
+    Parameters
+    ----------
+    vjp : callable
+        Function to compute vector-Jacobian products, ``vjp(v, x, *args) -> v.T @ J``.
+    x : ndarray
+        Point at which the Jacobian is evaluated.
+    m : int
+        Number of rows of the Jacobian.
+    args : tuple
+        Additional arguments passed to vjp.
+    prev_scale_inv : ndarray, optional
+        Previous inverse scale, the new one will be no smaller than this.
+    num_probes : int
+        Number of random vectors to average over.
+
+    Returns
+    -------
+    scale, scale_inv : ndarray
+        Estimated inverse column norms of the Jacobian and the column norms.
+
+    """
+    # fixed seed so that repeated runs give the same scaling
+    rng = np.random.default_rng(0)
+    col_norms_sq = 0
+    for _ in range(num_probes):
+        z = jnp.asarray(rng.choice([-1.0, 1.0], size=m))
+        col_norms_sq += vjp(z, x, *args) ** 2
+    scale_inv = (col_norms_sq / num_probes) ** 0.5
+    scale_inv = jnp.where(
+        scale_inv < jnp.finfo(scale_inv.dtype).eps * max(m, x.size), 1, scale_inv
+    )
+    if prev_scale_inv is not None:
+        scale_inv = jnp.maximum(scale_inv, prev_scale_inv)
+    return 1 / scale_inv, scale_inv
+
+
+class ScaledJacobianOperator:
+    """Linear operator for the scaled Jacobian J*d using Jacobian-vector products.
+
+    Can be used in place of the matrix ``J*d`` in functions that only need its
+    ``dot`` method, such as ``evaluate_quadratic_form_jac`` and ``select_step``.
+
+    Parameters
+    ----------
+    jvp, vjp : callable
+        Functions to compute Jacobian-vector and vector-Jacobian products, with
+        signatures ``jvp(v, x, *args) -> J @ v`` and ``vjp(v, x, *args) -> v.T @ J``.
+    x : ndarray
+        Point at which the Jacobian is evaluated.
+    d : ndarray
+        Scale of each column.
+    args : tuple
+        Additional arguments passed to jvp and vjp.
+
+    """
+
+    def __init__(self, jvp, vjp, x, d, args=()):
+        self.jvp = jvp
+        self.vjp = vjp
+        self.x = x
+        self.d = d
+        self.args = args
+
+    def dot(self, s):
+        """Compute (J*d) @ s for s of shape (n,) or (n, k)."""
+        if s.ndim == 1:
+            return self.jvp(self.d * s, self.x, *self.args)
+        # objective jvp takes a stack of tangents as rows and returns a stack of rows
+        return self.jvp((self.d[:, None] * s).T, self.x, *self.args).T
+
+    def rdot(self, v):
+        """Compute (J*d).T @ v."""
+        return self.d * self.vjp(v, self.x, *self.args)
+
+    def __matmul__(self, s):
+        return self.dot(s)
+
+
+register_pytree_node(
+    ScaledJacobianOperator,
+    lambda op: ((op.x, op.d, op.args), (op.jvp, op.vjp)),
+    lambda aux, children: ScaledJacobianOperator(*aux, *children),
+)
+
+
 @jit
 def compute_hess_scale(H, prev_scale_inv=None):
     """Compute scaling factors based on diagonal of Hessian matrix."""
@@ -536,6 +628,134 @@ def f_where_x(x, xs, fs, dim=0):
     return f
 
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class ArrayLRUCache:
+    """Cache of values keyed by arrays, with least recently used eviction.
+
+    Keys match if all of their elements agree to within a relative and absolute
+    tolerance, as in ``f_where_x``. To avoid comparing against every key, each key is
+    hashed by binning a fixed random projection of it, with bins much wider than the
+    tolerance, so only keys in the same or neighboring bins need to be compared.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of entries. When full, the least recently used entry is
+        removed to make room for a new one. None for no limit.
+    tol : float, optional
+        Relative and absolute tolerance for matching keys. Defaults to the machine
+        epsilon for the type of the first key.
+
+    """
+
+    def __init__(self, maxsize=32, tol=None):
+        errorif(
+            maxsize is not None and maxsize < 1,
+            ValueError,
+            f"maxsize should be a positive integer or None, got {maxsize}",
+        )
+        self.maxsize = maxsize
+        self.tol = tol
+        self.clear()
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self._entries = OrderedDict()  # id -> (key, value), least recently used first
+        self._bins = {}  # bin -> ids of the entries with keys in the bin
+        self._next_id = 0
+        self._w = None
+        self.hits = 0
+        self.misses = 0
+
+    def _bin(self, x):
+        if self._w is None:
+            # bins are fixed by the first key
+            self.tol = setdefault(self.tol, np.finfo(x.dtype).eps)
+            self._w = np.random.default_rng(0).standard_normal(x.size)
+            self._width = np.sqrt(self.tol) * (1 + np.abs(self._w) @ np.abs(x))
+        s = self._w @ x
+        return int(np.floor(s / self._width)) if np.isfinite(s) else None
+
+    def _find(self, x):
+        b = self._bin(x)
+        neighbors = [None] if b is None else [b - 1, b, b + 1]
+        ids = [i for n in neighbors for i in self._bins.get(n, [])]
+        # sometimes more than one key is within tol of x, we want the most recent one
+        for i in sorted(ids, reverse=True):
+            key = self._entries[i][0]
+            if np.all(np.isclose(x, key, rtol=self.tol, atol=self.tol)):
+                return i
+        return None
+
+    def get(self, x, default=None):
+        """Return the value stored for a key matching x, or default if there is none.
+
+        Parameters
+        ----------
+        x : ndarray
+            Key to look up.
+        default : object, optional
+            Value to return if no key matches.
+
+        Returns
+        -------
+        value : object
+            Stored value for x, or default.
+
+        """
+        x = np.asarray(x)
+        i = self._find(x) if len(self._entries) else None
+        if i is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(i)
+        return self._entries[i][1]
+
+    def put(self, x, value):
+        """Store value for key x, replacing the value of any matching key.
+
+        Parameters
+        ----------
+        x : ndarray
+            Key to store value under.
+        value : object
+            Value to store.
+
+        """
+        x = np.array(x)
+        i = self._find(x)
+        if i is not None:
+            self._remove(i)
+        if self.maxsize is not None and len(self._entries) >= self.maxsize:
+            self._remove(next(iter(self._entries)))
+        # ids increase with each insertion, so the most recent key has the largest id
+        i = self._next_id
+        self._next_id += 1
+        self._entries[i] = (x, value)
+        self._bins.setdefault(self._bin(x), []).append(i)
+
+    def _remove(self, i):
+        x, _ = self._entries.pop(i)
+        b = self._bin(x)
+        self._bins[b].remove(i)
+        if not self._bins[b]:
+            del self._bins[b]
+
+    def items(self):
+        """Return the (key, value) pairs, from least to most recently used."""
+        return list(self._entries.values())
+
+    def cache_info(self):
+        """Return the number of hits and misses, maximum size and current size."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+
 @functools.partial(jit, static_argnames="lower")
 def solve_triangular_regularized(R, b, lower=False):
     """Solve Rx=b for triangular, possibly rank deficient R.
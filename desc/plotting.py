@@ -22,7 +22,7 @@ from desc.compute.utils import _parse_parameterization
 from desc.equilibrium.coords import map_coordinates
 from desc.grid import Grid, LinearGrid
 from desc.integrals import surface_averages_map
-from desc.magnetic_fields import field_line_integrate
+from desc.magnetic_fields import trace_field_lines
 from desc.utils import errorif, only1, parse_argname_change, setdefault
 from desc.vmec_utils import ptolemy_linear_transform
 
@@ -1816,7 +1816,7 @@ def poincare_plot(
         * ``ylabel_fontsize``: float, fontsize of the ylabel
 
         Additionally, any other keyword arguments will be passed on to
-        ``desc.magnetic_fields.field_line_integrate``
+        ``desc.magnetic_fields.trace_field_lines``
 
     Returns
     -------
@@ -1828,7 +1828,7 @@ def poincare_plot(
         Dictionary of the data plotted, only returned if ``return_data=True``
     """
     fli_kwargs = {}
-    for key in inspect.signature(field_line_integrate).parameters:
+    for key in inspect.signature(trace_field_lines).parameters:
         if key in kwargs:
             fli_kwargs[key] = kwargs.pop(key)
 
@@ -1853,28 +1853,19 @@ def poincare_plot(
     phi = np.atleast_1d(phi)
     nplanes = len(phi)
 
-    phis = (phi + np.arange(0, ntransit)[:, None] * 2 * np.pi / NFP).flatten()
-
     R0, Z0 = np.atleast_1d(R0, Z0)
 
-    fieldR, fieldZ = field_line_integrate(
-        r0=R0,
-        z0=Z0,
-        phis=phis,
+    traced = trace_field_lines(
+        r0=R0.flatten(),
+        z0=Z0.flatten(),
         field=field,
+        phi=phi,
+        ntransit=ntransit,
+        NFP=NFP,
         source_grid=grid,
         **fli_kwargs,
     )
-
-    zs = fieldZ.reshape((ntransit, nplanes, -1))
-    rs = fieldR.reshape((ntransit, nplanes, -1))
-
-    signBT = np.sign(
-        field.compute_magnetic_field(np.array([R0.flat[0], 0.0, Z0.flat[0]]))[:, 1]
-    ).flat[0]
-    if signBT < 0:  # field lines are traced backwards when toroidal field < 0
-        rs, zs = rs[:, ::-1], zs[:, ::-1]
-        rs, zs = np.roll(rs, 1, 1), np.roll(zs, 1, 1)
+    rs, zs = traced["R"], traced["Z"]
 
     data = {
         "R": rs,
@@ -1,14 +1,25 @@
 """Class to transform from spectral basis to real space."""
 
+import functools
+import hashlib
 import warnings
+import weakref
+from collections import OrderedDict, namedtuple
 
 import numpy as np
 import scipy.linalg
 from termcolor import colored
 
 from desc.backend import jnp, put
+from desc.basis import FourierZernikeBasis, ZernikePolynomial, fourier, zernike_radial
 from desc.io import IOAble
-from desc.utils import combination_permutation, isalmostequal, islinspaced, issorted
+from desc.utils import (
+    combination_permutation,
+    errorif,
+    isalmostequal,
+    islinspaced,
+    issorted,
+)
 
 
 class Transform(IOAble):
@@ -30,9 +41,15 @@ class Transform(IOAble):
         whether to precompute the transforms now or do it later
     build_pinv : bool
         whether to precompute the pseudoinverse now or do it later
-    method : {```'auto'``, `'fft'``, ``'direct1'``, ``'direct2'``, ``'jitable'``}
+    method : {```'auto'``, `'fft'``, ``'separable'``, ``'direct1'``, ``'direct2'``,
+              ``'jitable'``}
         * ``'fft'`` uses fast fourier transforms in the zeta direction, and so must have
           equally spaced toroidal nodes, and the same node pattern on each zeta plane.
+        * ``'separable'`` is the same as ``'fft'`` in zeta, but also uses partial
+          summation in rho and theta for Zernike bases, storing the radial and
+          poloidal parts separately rather than a dense matrix for each zeta plane.
+          Useful when there are many fewer radial surfaces than nodes on each plane,
+          such as for ``ConcentricGrid`` and ``QuadratureGrid``.
         * ``'direct1'`` uses full matrices and can handle arbitrary node patterns and
           spectral bases.
         * ``'direct2'`` uses a DFT instead of FFT that can be faster in practice.
@@ -142,6 +159,10 @@ class Transform(IOAble):
             },
             "fft": {i: {j: {} for j in range(n + 1)} for i in range(n + 1)},
             "direct2": {i: {} for i in range(n + 1)},
+            "separable": {
+                "radial": {i: {} for i in range(n + 1)},
+                "poloidal": {i: {} for i in range(n + 1)},
+            },
         }
         return matrices
 
@@ -284,6 +305,49 @@ class Transform(IOAble):
             ]
         )
 
+    def _check_inputs_separable(self, grid, basis):
+        """Check that inputs are formatted correctly for separable method."""
+        if not isinstance(basis, (FourierZernikeBasis, ZernikePolynomial)):
+            warnings.warn(
+                colored(
+                    "separable method requires a Zernike basis, "
+                    + "falling back to fft method",
+                    "yellow",
+                )
+            )
+            self.method = "fft"
+            return
+
+        self._check_inputs_fft(grid, basis)
+        if self.method != "fft":
+            # fft checks failed and already fell back to another method
+            return
+
+        self._method = "separable"
+        # unique radial coordinates of the nodes on each zeta plane
+        self.rho_nodes, self.rho_index = np.unique(
+            self.fft_nodes[:, 0], return_inverse=True
+        )
+        self.rho_index = self.rho_index.ravel()
+        # nodes on each radial surface, padded with -1 to the same length, and the
+        # position of each node in the flattened array of padded surfaces
+        counts = np.bincount(self.rho_index)
+        sort_idx = np.argsort(self.rho_index, kind="stable")
+        position = np.arange(sort_idx.size) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        self.surface_index = np.full((counts.size, counts.max()), -1)
+        self.surface_index[self.rho_index[sort_idx], position] = sort_idx
+        self.plane_index = np.empty_like(self.rho_index)
+        self.plane_index[sort_idx] = self.rho_index[sort_idx] * counts.max() + position
+        self.m_modes = np.unique(self.lm_modes[:, 1])
+        # indices of the radial/poloidal modes with each poloidal mode number,
+        # padded with -1 to the same length. Padded entries have zero radial part.
+        groups = [np.nonzero(self.lm_modes[:, 1] == m)[0] for m in self.m_modes]
+        self.lm_index = np.full((len(groups), max(map(len, groups))), -1)
+        for i, g in enumerate(groups):
+            self.lm_index[i, : len(g)] = g
+
     def _check_inputs_direct2(self, grid, basis):
         """Check that inputs are formatted correctly for direct2 method."""
         if grid.num_nodes == 0 or basis.num_modes == 0:
@@ -366,6 +430,42 @@ class Transform(IOAble):
             [np.zeros((self.zeta_nodes.size, 2)), self.zeta_nodes[:, np.newaxis]]
         )
 
+    def _matrix_key(self):
+        """Key identifying the grid and basis in the shared matrix cache."""
+        if self.method == "jitable":
+            # may be built inside jit with traced nodes
+            return None
+        try:
+            nodes = np.ascontiguousarray(self.grid.nodes, dtype=float)
+            modes = np.ascontiguousarray(self.basis.modes, dtype=int)
+        except TypeError:  # traced
+            return None
+        return (
+            hashlib.sha1(nodes.tobytes()).hexdigest(),
+            self.basis.__class__.__name__,
+            self.basis.NFP,
+            hashlib.sha1(modes.tobytes()).hexdigest(),
+        )
+
+    def _separable_radial(self, dr):
+        """Radial part of separable transform, shape(num_m, num_rho, num_l)."""
+        radial = np.asarray(
+            zernike_radial(
+                self.rho_nodes[:, np.newaxis],
+                self.lm_modes[:, 0],
+                self.lm_modes[:, 1],
+                dr=dr,
+            )
+        )
+        radial = np.where(self.lm_index >= 0, radial[:, self.lm_index], 0)
+        return radial.transpose((1, 0, 2))
+
+    def _separable_poloidal(self, dt):
+        """Poloidal part of separable transform, shape(num_rho, num_surface, num_m)."""
+        theta = self.fft_nodes[self.surface_index, 1, np.newaxis]
+        poloidal = np.asarray(fourier(theta, self.m_modes, dt=dt))
+        return np.where(self.surface_index[..., np.newaxis] >= 0, poloidal, 0)
+
     def build(self):
         """Build the transform matrices for each derivative order."""
         if self.built:
@@ -375,10 +475,14 @@ class Transform(IOAble):
             self._built = True
             return
 
+        key = self._matrix_key()
+        cached = functools.partial(_matrix_cache.get, key)
+
         if self.method == "direct1":
             for d in self.derivatives:
-                self.matrices["direct1"][d[0]][d[1]][d[2]] = self.basis.evaluate(
-                    self.grid.nodes, d, unique=True
+                self.matrices["direct1"][d[0]][d[1]][d[2]] = cached(
+                    ("direct1", *d),
+                    lambda d=d: self.basis.evaluate(self.grid.nodes, d, unique=True),
                 )
 
         if self.method == "jitable":
@@ -393,8 +497,11 @@ class Transform(IOAble):
             ).astype(int)
             temp_modes = np.hstack([self.lm_modes, np.zeros((self.num_lm_modes, 1))])
             for d in temp_d:
-                self.matrices["fft"][d[0]][d[1]] = self.basis.evaluate(
-                    self.fft_nodes, d, modes=temp_modes, unique=True
+                self.matrices["fft"][d[0]][d[1]] = cached(
+                    ("fft", *d),
+                    lambda d=d: self.basis.evaluate(
+                        self.fft_nodes, d, modes=temp_modes, unique=True
+                    ),
                 )
         if self.method == "direct2":
             temp_d = np.hstack(
@@ -404,8 +511,20 @@ class Transform(IOAble):
                 [np.zeros((self.num_n_modes, 2)), self.n_modes[:, np.newaxis]]
             )
             for d in temp_d:
-                self.matrices["direct2"][d[2]] = self.basis.evaluate(
-                    self.dft_nodes, d, modes=temp_modes, unique=True
+                self.matrices["direct2"][d[2]] = cached(
+                    ("direct2", *d),
+                    lambda d=d: self.basis.evaluate(
+                        self.dft_nodes, d, modes=temp_modes, unique=True
+                    ),
+                )
+        if self.method == "separable":
+            for dr in np.unique(self.derivatives[:, 0]):
+                self.matrices["separable"]["radial"][dr] = cached(
+                    ("radial", dr), functools.partial(self._separable_radial, dr)
+                )
+            for dt in np.unique(self.derivatives[:, 1]):
+                self.matrices["separable"]["poloidal"][dt] = cached(
+                    ("poloidal", dt), functools.partial(self._separable_poloidal, dt)
                 )
 
         self._built = True
@@ -415,37 +534,83 @@ class Transform(IOAble):
         if self.built_pinv:
             return
         rcond = None if self.rcond == "auto" else self.rcond
+
+        def pinv(nodes, modes=None):
+            A = self.basis.evaluate(nodes, np.array([0, 0, 0]), modes=modes)
+            return scipy.linalg.pinv(A, rtol=rcond) if A.size else np.zeros_like(A.T)
+
+        key = self._matrix_key()
+        cached = functools.partial(_matrix_cache.get, key)
         if self.method in ["direct1", "jitable"]:
-            A = self.basis.evaluate(self.grid.nodes, np.array([0, 0, 0]))
-            self.matrices["pinv"] = (
-                scipy.linalg.pinv(A, rtol=rcond) if A.size else np.zeros_like(A.T)
+            self.matrices["pinv"] = cached(
+                ("pinv", rcond), functools.partial(pinv, self.grid.nodes)
             )
-        elif self.method == "direct2":
+        if self.method in ["fft", "direct2", "separable"]:
             temp_modes = np.hstack([self.lm_modes, np.zeros((self.num_lm_modes, 1))])
-            A = self.basis.evaluate(
-                self.fft_nodes, np.array([0, 0, 0]), modes=temp_modes, unique=True
+            self.matrices["pinvA"] = cached(
+                ("pinvA", rcond), functools.partial(pinv, self.fft_nodes, temp_modes)
             )
+        if self.method == "direct2":
             temp_modes = np.hstack(
                 [np.zeros((self.num_n_modes, 2)), self.n_modes[:, np.newaxis]]
             )
-            B = self.basis.evaluate(
-                self.dft_nodes, np.array([0, 0, 0]), modes=temp_modes, unique=True
+            self.matrices["pinvB"] = cached(
+                ("pinvB", rcond), functools.partial(pinv, self.dft_nodes, temp_modes)
             )
-            self.matrices["pinvA"] = (
-                scipy.linalg.pinv(A, rtol=rcond) if A.size else np.zeros_like(A.T)
-            )
-            self.matrices["pinvB"] = (
-                scipy.linalg.pinv(B, rtol=rcond) if B.size else np.zeros_like(B.T)
-            )
-        elif self.method == "fft":
-            temp_modes = np.hstack([self.lm_modes, np.zeros((self.num_lm_modes, 1))])
-            A = self.basis.evaluate(
-                self.fft_nodes, np.array([0, 0, 0]), modes=temp_modes, unique=True
+        self._built_pinv = True
+
+    def _get_plane_matrix(self, dr, dt):
+        """Get the matrix for one zeta plane, or its factors for separable method."""
+        if self.method == "separable":
+            A = (
+                self.matrices["separable"]["radial"].get(dr, {}),
+                self.matrices["separable"]["poloidal"].get(dt, {}),
             )
-            self.matrices["pinvA"] = (
-                scipy.linalg.pinv(A, rtol=rcond) if A.size else np.zeros_like(A.T)
+            if isinstance(A[0], dict) or isinstance(A[1], dict):
+                A = {}
+        else:
+            A = self.matrices["fft"].get(dr, {}).get(dt, {})
+        if isinstance(A, dict):
+            raise ValueError(
+                colored("Derivative orders are out of initialized bounds", "red")
             )
-        self._built_pinv = True
+        return A
+
+    def _plane_matmul(self, A, c, transpose=False):
+        """Compute A @ c (or A.T @ c) with A from ``_get_plane_matrix``.
+
+        Parameters
+        ----------
+        A : ndarray or tuple of ndarray
+            Matrix for one zeta plane, shape(num_plane_nodes, num_lm_modes), or for
+            the separable method the radial part, shape(num_m, num_rho, num_l), and
+            poloidal part on each radial surface, shape(num_rho, num_surface, num_m).
+        c : ndarray, shape(num_lm_modes, k) or shape(num_plane_nodes, k)
+            Coefficients for each radial/poloidal mode, or values at each node if
+            ``transpose`` is True.
+        transpose : bool
+            Whether to apply the transpose of A.
+
+        Returns
+        -------
+        x : ndarray, shape(num_plane_nodes, k) or shape(num_lm_modes, k)
+
+        """
+        if self.method != "separable":
+            return A.T @ c if transpose else A @ c
+        R, T = A
+        if transpose:
+            # sum over nodes on each radial surface, shape(num_rho, num_m, k)
+            H = jnp.einsum("rpm,rpk->rmk", T, c[self.surface_index])
+            # sum over radial surfaces for each radial mode, shape(num_m, num_l, k)
+            P = jnp.einsum("mrl,rmk->mlk", R, H)
+            # padded entries of P are zero
+            return jnp.zeros((self.num_lm_modes, c.shape[1])).at[self.lm_index].add(P)
+        # sum over radial modes for each poloidal mode, shape(num_rho, num_m, k)
+        G = jnp.einsum("mrl,mlk->rmk", R, c[self.lm_index])
+        # sum over poloidal modes at nodes on each radial surface
+        x = jnp.einsum("rpm,rmk->rpk", T, G)
+        return x.reshape((-1, c.shape[1]))[self.plane_index]
 
     def transform(self, c, dr=0, dt=0, dz=0):
         """Transform from spectral domain to physical.
@@ -503,12 +668,8 @@ class Transform(IOAble):
             cc = A @ c_mtrx
             return (cc @ B.T).flatten(order="F")
 
-        elif self.method == "fft":
-            A = self.matrices["fft"].get(dr, {}).get(dt, {})
-            if isinstance(A, dict):
-                raise ValueError(
-                    colored("Derivative orders are out of initialized bounds", "red")
-                )
+        elif self.method in ["fft", "separable"]:
+            A = self._get_plane_matrix(dr, dt)
             # reshape coefficients
             c_mtrx = jnp.zeros((self.num_lm_modes * self.num_n_modes,))
             c_mtrx = put(c_mtrx, self.fft_index, c).reshape((-1, self.num_n_modes))
@@ -530,7 +691,96 @@ class Transform(IOAble):
             )
             # transform coefficients
             c_fft = jnp.real(jnp.fft.ifft(c_cplx))
-            return (A @ c_fft).flatten(order="F")
+            return self._plane_matmul(A, c_fft).flatten(order="F")
+
+    def transform_all(self, c, derivs=None):
+        """Transform from spectral domain to physical for several derivative orders.
+
+        Equivalent to calling ``transform`` for each row of ``derivs``, but the work
+        shared between derivative orders is only done once. For the ``"fft"``,
+        ``"separable"`` and ``"direct2"`` methods, the coefficients are reshaped and
+        transformed in zeta once for all toroidal derivative orders, and each matrix in
+        rho and theta is applied to all of them in a single matrix product.
+
+        Parameters
+        ----------
+        c : ndarray, shape(num_coeffs,)
+            spectral coefficients, indexed to correspond to the spectral basis
+        derivs : ndarray, shape(k, 3), optional
+            orders of derivatives [dr, dt, dz] to compute. Defaults to all derivative
+            orders the transform was built for, ie ``self.derivatives``.
+
+        Returns
+        -------
+        x : ndarray, shape(k, num_nodes)
+            array of values of each derivative at node locations
+        """
+        if not self.built:
+            raise RuntimeError(
+                "Transform must be precomputed with transform.build() before being used"
+            )
+        derivs = self.derivatives if derivs is None else np.atleast_2d(derivs)
+        derivs = np.asarray(derivs).astype(int)
+
+        if self.basis.num_modes != c.size:
+            raise ValueError(
+                colored(
+                    "Coefficients dimension ({}) is incompatible with ".format(c.size)
+                    + "the number of basis modes({})".format(self.basis.num_modes),
+                    "red",
+                )
+            )
+
+        if len(c) == 0:
+            return np.zeros((len(derivs), self.grid.num_nodes))
+
+        if self.method in ["direct1", "jitable"]:
+            return jnp.stack([self.transform(c, *d) for d in derivs])
+
+        # group derivatives by order in rho, theta, so each matrix A is only used once
+        c_mtrx = jnp.zeros((self.num_lm_modes * self.num_n_modes,))
+        c_mtrx = put(c_mtrx, self.fft_index, c).reshape((-1, self.num_n_modes))
+
+        # coefficients transformed in zeta for each order of zeta derivative,
+        # each of shape(num_lm_modes, num_z_nodes)
+        C = {}
+        for k in np.unique(derivs[:, 2]):
+            if self.method == "direct2":
+                B = self.matrices["direct2"].get(k, {})
+                if isinstance(B, dict):
+                    raise ValueError(
+                        colored(
+                            "Derivative orders are out of initialized bounds", "red"
+                        )
+                    )
+                C[k] = c_mtrx @ B.T
+            else:
+                c_diff = c_mtrx[:, :: (-1) ** k] * self.dk**k * (-1) ** (k > 1)
+                c_real = jnp.pad(
+                    (self.num_z_nodes / 2)
+                    * (c_diff[:, self.N + 1 :] - 1j * c_diff[:, self.N - 1 :: -1]),
+                    ((0, 0), (0, self.pad_dim)),
+                    mode="constant",
+                )
+                c_cplx = jnp.hstack(
+                    (
+                        self.num_z_nodes * c_diff[:, self.N, jnp.newaxis],
+                        c_real,
+                        jnp.fliplr(jnp.conj(c_real)),
+                    )
+                )
+                C[k] = jnp.real(jnp.fft.ifft(c_cplx))
+
+        x = {}
+        for d in np.unique(derivs[:, :2], axis=0):
+            A = self._get_plane_matrix(d[0], d[1])
+            dz = np.unique(derivs[(derivs[:, :2] == d).all(axis=-1), 2])
+            # one matrix product for all orders in zeta
+            AC = self._plane_matmul(A, jnp.hstack([C[k] for k in dz]))
+            AC = AC.reshape((AC.shape[0], len(dz), -1))
+            for i, k in enumerate(dz):
+                x[(d[0], d[1], k)] = AC[:, i].flatten(order="F")
+        return jnp.stack([x[tuple(d)] for d in derivs])
 
     def fit(self, x):
         """Transform from physical domain to spectral using weighted least squares fit.
@@ -559,7 +809,7 @@ class Transform(IOAble):
             Binv = self.matrices["pinvB"]
             yy = jnp.matmul(Ainv, x.reshape((-1, self.num_z_nodes), order="F"))
             c = jnp.matmul(Binv, yy.T).T.flatten()[self.fft_index]
-        elif self.method == "fft":
+        elif self.method in ["fft", "separable"]:
             Ainv = self.matrices["pinvA"]
             c_fft = jnp.matmul(Ainv, x.reshape((Ainv.shape[1], -1), order="F"))
             c_cplx = jnp.fft.fft(c_fft)
@@ -612,11 +862,12 @@ class Transform(IOAble):
             yy = jnp.matmul(A.T, y.reshape((-1, self.num_z_nodes), order="F"))
             return jnp.matmul(yy, B).flatten()[self.fft_index]
 
-        elif self.method == "fft":
-            A = self.matrices["fft"][0][0]
+        elif self.method in ["fft", "separable"]:
+            A = self._get_plane_matrix(0, 0)
             # this was derived by trial and error, but seems to work correctly
             # there might be a more efficient way...
-            a = jnp.fft.fft(A.T @ y.reshape((A.shape[0], -1), order="F"))
+            Y = y.reshape((self.fft_nodes.shape[0], -1), order="F")
+            a = jnp.fft.fft(self._plane_matmul(A, Y, transpose=True))
             cdn = a[:, 0]
             cr = a[:, 1 : 1 + self.N]
             b = jnp.hstack(
@@ -637,7 +888,7 @@ class Transform(IOAble):
             Spectral basis of modes
         build : bool
             whether to recompute matrices now or wait until requested
-        method : {"auto", "direct1", "direct2", "fft"}
+        method : {"auto", "direct1", "direct2", "fft", "separable"}
             method to use for computing transforms
 
         """
@@ -671,6 +922,8 @@ class Transform(IOAble):
             self._grid = grid
             if self.method == "fft":
                 self._check_inputs_fft(self.grid, self.basis)
+            if self.method == "separable":
+                self._check_inputs_separable(self.grid, self.basis)
             if self.method == "direct2":
                 self._check_inputs_direct2(self.grid, self.basis)
             if self.built:
@@ -691,6 +944,8 @@ class Transform(IOAble):
             self._basis = basis
             if self.method == "fft":
                 self._check_inputs_fft(self.grid, self.basis)
+            if self.method == "separable":
+                self._check_inputs_separable(self.grid, self.basis)
             if self.method == "direct2":
                 self._check_inputs_direct2(self.grid, self.basis)
             if self.built:
@@ -789,7 +1044,7 @@ class Transform(IOAble):
 
     @property
     def method(self):
-        """{``'direct1'``, ``'direct2'``, ``'fft'``}: method of computing transform."""
+        """str: method of computing transform, eg ``'fft'`` or ``'separable'``."""
         return self.__dict__.setdefault("_method", "direct1")
 
     @method.setter
@@ -800,9 +1055,18 @@ class Transform(IOAble):
         elif method == "auto":
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
-                self.method = "fft"
+                self.method = "separable"
+            if self.method == "separable":
+                # partial summation has more overhead than a single matrix product,
+                # so only use it when it saves most of the work
+                cost = self.rho_nodes.size * self.m_modes.size
+                cost *= self.lm_index.shape[1] + self.surface_index.shape[1]
+                if cost > 0.4 * self.fft_nodes.shape[0] * self.num_lm_modes:
+                    self._method = "fft"
         elif method == "fft":
             self._check_inputs_fft(self.grid, self.basis)
+        elif method == "separable":
+            self._check_inputs_separable(self.grid, self.basis)
         elif method == "direct2":
             self._check_inputs_direct2(self.grid, self.basis)
         elif method == "direct1":
@@ -824,3 +1088,135 @@ class Transform(IOAble):
                 self.method, repr(self.basis), repr(self.grid)
             )
         )
+
+
+MatrixCacheInfo = namedtuple(
+    "MatrixCacheInfo", ["hits", "misses", "maxsize", "currsize", "bytes_saved"]
+)
+
+
+class MatrixCache:
+    """Process wide cache of transform matrices, shared between ``Transform`` s.
+
+    Matrices are keyed on a hash of the grid nodes, the type, ``NFP`` and modes of
+    the basis, and the kind of matrix and derivative order (which depend on the
+    method), so transforms built separately for different objectives on the same
+    grid and basis evaluate each matrix only once. The cache keeps a weak reference
+    to every matrix it returns, so matrices are shared for as long as some transform
+    uses them. In addition, up to ``max_size`` GB of the most recently used matrices
+    can be kept alive by the cache, so that they are reused by transforms built after
+    the previous ones are gone. These are kept on the device they were computed on,
+    eg in GPU memory.
+
+    Parameters
+    ----------
+    max_size : float, optional
+        Maximum size in GB of the matrices kept alive by the cache. ``None`` means
+        no limit. Defaults to 0, so matrices are only shared while in use.
+
+    """
+
+    def __init__(self, max_size=0):
+        self.max_size = max_size
+        self.clear()
+
+    @property
+    def max_size(self):
+        """float: Maximum size in GB of the matrices kept alive by the cache."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, max_size):
+        errorif(
+            max_size is not None and max_size < 0,
+            ValueError,
+            f"max_size should be non-negative or None, got {max_size}",
+        )
+        self._max_size = max_size
+        if hasattr(self, "_entries"):
+            self._evict()
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self._entries = OrderedDict()  # key -> matrix, least recently used first
+        self._live = weakref.WeakValueDictionary()  # key -> matrix still in use
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def _evict(self):
+        max_bytes = np.inf if self.max_size is None else self.max_size * 1e9
+        while self._nbytes > max_bytes:
+            _, A = self._entries.popitem(last=False)
+            self._nbytes -= A.nbytes
+
+    def get(self, key, name, fun):
+        """Return the matrix stored for key and name, computing it if needed.
+
+        Parameters
+        ----------
+        key : tuple or None
+            Key for the grid and basis. If None, the matrix is computed and not
+            cached.
+        name : tuple
+            Kind of matrix and derivative orders, or other parameters it depends on.
+        fun : callable
+            Function with no arguments that computes the matrix.
+
+        Returns
+        -------
+        A : ndarray
+            The matrix. Should not be modified in place, as it may be shared.
+
+        """
+        if key is None:
+            return fun()
+        key = (key, name)
+        A = self._entries.get(key, self._live.get(key))
+        if A is not None:
+            self.hits += 1
+            self.bytes_saved += A.nbytes
+        else:
+            self.misses += 1
+            A = fun()
+            if isinstance(A, np.ndarray):
+                A.setflags(write=False)
+            self._live[key] = A
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        elif self.max_size is None or A.nbytes <= self.max_size * 1e9:
+            self._entries[key] = A
+            self._nbytes += A.nbytes
+            self._evict()
+        return A
+
+    def cache_info(self):
+        """Return the number of hits and misses, maximum and current size in GB."""
+        return MatrixCacheInfo(
+            self.hits, self.misses, self.max_size, self._nbytes / 1e9, self.bytes_saved
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_matrix_cache = MatrixCache()
+
+
+def get_matrix_cache():
+    """Return the ``MatrixCache`` shared by all transforms.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from desc.transform import get_matrix_cache
+
+        cache = get_matrix_cache()
+        cache.max_size = 4  # GB
+        obj.build()
+        print(cache.cache_info().bytes_saved)
+
+    """
+    return _matrix_cache
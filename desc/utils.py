@@ -938,3 +938,63 @@ def ensure_tuple(x):
     if isinstance(x, list):
         return tuple(x)
     return (x,)
+
+
+class _CacheKey:
+    """Hashable key for ``lru_cache_by_key``, holding the arguments of a call."""
+
+    __slots__ = ("key", "args", "kwargs")
+
+    def __init__(self, key, args, kwargs):
+        self.key = key
+        self.args = args
+        self.kwargs = kwargs
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, _CacheKey) and self.key == other.key
+
+
+def lru_cache_by_key(key, maxsize=8):
+    """Decorator like ``functools.lru_cache``, but keyed on ``key(*args, **kwargs)``.
+
+    Useful when the arguments aren't hashable, or when only some of them determine
+    the result. The cache doesn't keep the arguments alive, only the results.
+    The decorated function has the ``cache_info`` and ``cache_clear`` methods of
+    ``functools.lru_cache``.
+
+    Parameters
+    ----------
+    key : callable
+        Function of the same arguments as the decorated function, returning a
+        hashable key. Calls with equal keys return the same cached result.
+    maxsize : int, optional
+        Maximum number of results to keep. When full, the least recently used one
+        is removed.
+
+    Returns
+    -------
+    decorator : callable
+        Decorator to apply to the function to cache.
+
+    """
+
+    def decorator(fun):
+        @functools.lru_cache(maxsize=maxsize)
+        def cached(k):
+            out = fun(*k.args, **k.kwargs)
+            # only the key is needed for lookups once the result is cached
+            k.args, k.kwargs = (), {}
+            return out
+
+        @functools.wraps(fun)
+        def wrapper(*args, **kwargs):
+            return cached(_CacheKey(key(*args, **kwargs), args, kwargs))
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+
+    return decorator
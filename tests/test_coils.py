@@ -471,6 +471,135 @@ class TestCoilSet:
         )[0]
         np.testing.assert_allclose(B_true, B_approx, rtol=1e-3, atol=1e-10)
 
+    @pytest.mark.unit
+    def test_tree_code(self):
+        """Tree code Biot-Savart agrees with the direct sum, including symmetry."""
+        coil = FourierPlanarCoil(
+            current=1e6, center=[10, 0.3, 0.2], normal=[0.1, 1, 0], r_n=1
+        )
+        coils = CoilSet.linspaced_angular(coil, n=3, angle=np.pi / 3)
+        coilset = CoilSet(coils.coils, NFP=3, sym=True)
+        # straight segments of a spline coil use the same expression as the direct sum
+        mixed = MixedCoilSet(coilset, FourierXYZCoil(2e5), coil.to_SplineXYZ(grid=16))
+        rng = np.random.default_rng(0)
+        coords = np.stack(
+            [
+                rng.uniform(9.5, 10.5, 100),
+                rng.uniform(0, 2 * np.pi, 100),
+                rng.uniform(-0.5, 0.5, 100),
+            ],
+            axis=-1,
+        )
+        for field in [coilset, mixed]:
+            B = field.compute_magnetic_field(coords, source_grid=64)
+            B_tree = field.compute_magnetic_field(coords, source_grid=64, tol=1e-8)
+            np.testing.assert_allclose(B_tree, B, atol=1e-8 * np.abs(B).max())
+            A = field.compute_magnetic_vector_potential(coords, source_grid=64)
+            A_tree = field.compute_magnetic_vector_potential(
+                coords, source_grid=64, tol=1e-8
+            )
+            np.testing.assert_allclose(A_tree, A, atol=1e-8 * np.abs(A).max())
+        with pytest.raises(ValueError, match="transforms"):
+            coilset.compute_magnetic_field(
+                coords, source_grid=64, transforms={"x": None}, tol=1e-8
+            )
+
+    @pytest.mark.unit
+    def test_to_interpolated(self, tmpdir_factory):
+        """Interpolated field from a stellarator symmetric coil set."""
+        coil = FourierPlanarCoil(
+            current=1e6, center=[10, 0.3, 0.2], normal=[0.1, 1, 0], r_n=1.5
+        )
+        coils = CoilSet.linspaced_angular(coil, n=3, angle=np.pi / 3)
+        coilset = CoilSet(coils.coils, NFP=3, sym=True)
+        R = np.linspace(9.2, 10.8, 9)
+        Z = np.linspace(-0.7, 0.7, 7)
+        path = tmpdir_factory.mktemp("interp").join("field.npy")
+        field = coilset.to_interpolated(
+            R, 12, Z, source_grid=32, sym=True, chunk_size=20, memmap=str(path)
+        )
+        assert field.NFP == 3
+        np.testing.assert_allclose(field._phi, np.linspace(0, 2 * np.pi / 3, 13)[:-1])
+
+        # values at the nodes agree with the field, including the half of the field
+        # period filled in by symmetry
+        RR, PP, ZZ = np.meshgrid(R, field._phi, Z, indexing="ij")
+        coords = np.array([RR.flatten(), PP.flatten(), ZZ.flatten()]).T
+        B = coilset.compute_magnetic_field(coords, source_grid=32)
+        np.testing.assert_allclose(field.compute_magnetic_field(coords), B, atol=1e-12)
+        A = coilset.compute_magnetic_vector_potential(coords, source_grid=32)
+        np.testing.assert_allclose(
+            field.compute_magnetic_vector_potential(coords), A, atol=1e-12
+        )
+        np.testing.assert_allclose(np.load(str(path))[0], field._BR[..., 0])
+
+        # nodes that are not symmetric fall back to evaluating everywhere
+        with pytest.warns(UserWarning, match="not stellarator symmetric"):
+            field = coilset.to_interpolated(
+                R,
+                12,
+                Z + 0.1,
+                source_grid=32,
+                sym=True,
+                compute_vector_potential=False,
+            )
+        assert field._AR is None
+        B = coilset.compute_magnetic_field(coords + [0, 0, 0.1], source_grid=32)
+        np.testing.assert_allclose(
+            field.compute_magnetic_field(coords + [0, 0, 0.1]), B, atol=1e-12
+        )
+
+    @pytest.mark.unit
+    def test_save_mgrid_chunks(self, tmpdir_factory, capsys):
+        """Writing mgrid files in chunks, with symmetry, and resuming."""
+        from netCDF4 import Dataset
+
+        coil = FourierPlanarCoil(
+            current=1e6, center=[10, 0.3, 0.2], normal=[0.1, 1, 0], r_n=1.5
+        )
+        coils = CoilSet.linspaced_angular(coil, n=3, angle=np.pi / 3)
+        coilset = CoilSet(coils.coils, NFP=3, sym=True)
+        tmpdir = tmpdir_factory.mktemp("mgrid_chunks")
+        args = (9, 11, -1, 1, 6, 5, 8)
+        names = ["br_001", "bp_001", "bz_001", "ar_001", "ap_001", "az_001"]
+
+        coilset.save_mgrid(str(tmpdir.join("full.nc")), *args, sym=False)
+        with Dataset(str(tmpdir.join("full.nc"))) as file:
+            full = {name: file[name][:] for name in names}
+
+        coilset.save_mgrid(
+            str(tmpdir.join("sym.nc")), *args, chunk_size=2, sym=True, verbose=1
+        )
+        # only planes 0 to 4 of 8 are evaluated, the rest come from symmetry
+        assert "Wrote 5/5 toroidal planes" in capsys.readouterr().out
+        with Dataset(str(tmpdir.join("sym.nc"))) as file:
+            for name in names:
+                np.testing.assert_allclose(file[name][:], full[name], atol=1e-12)
+
+        # interrupt writing after the first chunk, then finish the file
+        path = str(tmpdir.join("resume.nc"))
+        compute = coilset.compute_magnetic_vector_potential
+        calls = []
+
+        def interrupted(*args, **kwargs):
+            calls.append(1)
+            if len(calls) > 1:
+                raise KeyboardInterrupt
+            return compute(*args, **kwargs)
+
+        coilset.compute_magnetic_vector_potential = interrupted
+        with pytest.raises(KeyboardInterrupt):
+            coilset.save_mgrid(path, *args, chunk_size=2, sym=False)
+        coilset.compute_magnetic_vector_potential = compute
+        capsys.readouterr()
+        coilset.save_mgrid(path, *args, chunk_size=2, sym=False, resume=True, verbose=1)
+        assert "Wrote 6/6 toroidal planes" in capsys.readouterr().out
+        with Dataset(path) as file:
+            for name in names:
+                np.testing.assert_allclose(file[name][:], full[name], atol=1e-12)
+        with pytest.raises(ValueError, match="different grid"):
+            coilset.save_mgrid(path, 9, 11, -1, 1, 6, 5, 4, resume=True)
+
     @pytest.mark.unit
     def test_linspaced_angular(self):
         """Field from uniform toroidal solenoid."""
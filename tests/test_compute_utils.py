@@ -18,3 +18,58 @@ def test_rotation_matrix():
     np.testing.assert_allclose(rotation_matrix(x0), np.eye(3))
     np.testing.assert_allclose(dfdx_fwd(x0), np.zeros((3, 3, 3)))
     np.testing.assert_allclose(dfdx_rev(x0), np.zeros((3, 3, 3)))
+
+
+@pytest.mark.unit
+def test_compute_plan():
+    """Test that compute plans are ordered, skip computed data and are cached."""
+    from desc.compute import data_index
+    from desc.compute.utils import _compute_plan, get_data_deps
+
+    p = "desc.equilibrium.equilibrium.Equilibrium"
+    _compute_plan.cache_clear()
+    plan = _compute_plan(p, ("|B|", "iota"), True)
+    assert plan[-1] == "|B|"
+    assert len(plan) == len(set(plan))
+    for i, name in enumerate(plan):
+        deps = data_index[p][name]["dependencies"]
+        assert set(deps["data"] + deps["axis_limit_data"]).issubset(plan[:i])
+    assert set(plan) == set(get_data_deps(["|B|", "iota"], p, has_axis=True)).union(
+        ["|B|", "iota"]
+    )
+
+    # same plan object is reused
+    assert _compute_plan(p, ("|B|", "iota"), True) is plan
+    assert _compute_plan.cache_info().hits == 1
+
+    # quantities that are already computed are skipped, along with what they need
+    plan = _compute_plan(p, ("|B|",), False, frozenset(["B"]))
+    assert "B" not in plan
+    assert "B^theta" not in plan
+    assert plan[-1] == "|B|"
+
+
+@pytest.mark.unit
+def test_compute_transform_groups():
+    """Test that derivatives of the same transform are computed together."""
+    from desc.compute import data_index
+    from desc.compute.utils import _transform_groups, _transform_only
+    from desc.examples import get
+    from desc.grid import LinearGrid
+
+    p = "desc.equilibrium.equilibrium.Equilibrium"
+    names = [name for name in data_index[p] if _transform_only(p, name) is not None]
+    groups = _transform_groups(p, tuple(names))
+    assert {key for key, *_ in groups} == {"R", "Z", "L"}
+
+    # computing one quantity at a time doesn't use transform_all
+    eq = get("HELIOTRON")
+    grid = LinearGrid(L=2, M=3, N=3, NFP=eq.NFP)
+    data = eq.compute(names, grid=grid)
+    for name in names:
+        np.testing.assert_allclose(
+            data[name],
+            eq.compute(name, grid=grid)[name],
+            atol=1e-12,
+            err_msg=name,
+        )
@@ -1,10 +1,16 @@
 """Tests for jax autodiff wrappers and finite differences."""
 
+import os
+import subprocess
+import sys
+import textwrap
+
 import numpy as np
 import pytest
 from numpy.random import default_rng
 
-from desc.backend import jnp
+from desc.backend import jax, jnp
+from desc.batching import jacfwd_chunked
 from desc.derivatives import AutoDiffDerivative, FiniteDiffDerivative
 
 
@@ -125,6 +131,63 @@ class TestDerivative:
         jac = AutoDiffDerivative(fun, num_blocks=3, shape=A.shape)
         np.testing.assert_allclose(jac(x), A)
 
+    @pytest.mark.unit
+    def test_sharded_jacobian(self):
+        """Test chunked jacobian split across devices matches the unsharded one."""
+        rando = default_rng(seed=0)
+        A = rando.random((19, 17))
+
+        def fun(x):
+            return jnp.sin(jnp.dot(A, x))
+
+        x = rando.random(17)
+        J = jax.jacfwd(fun)(x)
+        num_devices = len(jax.local_devices())
+        for devices in ["all", num_devices, jax.local_devices()]:
+            J1 = jacfwd_chunked(fun, chunk_size=3, devices=devices)(x)
+            np.testing.assert_allclose(J1, J)
+        J2 = jax.jit(jacfwd_chunked(fun, chunk_size=5, devices="all"))(x)
+        np.testing.assert_allclose(J2, J)
+        with pytest.raises(ValueError, match="devices"):
+            jacfwd_chunked(fun, devices=num_devices + 1)(x)
+
+    @pytest.mark.unit
+    def test_sharded_jacobian_multiple_devices(self):
+        """Test the sharded jacobian with several devices, which uses shard_map."""
+        # the number of host devices can only be set before jax is initialized, so
+        # this has to run in a new process
+        code = textwrap.dedent(
+            """
+            import jax
+            import numpy as np
+            from desc.backend import jnp
+            from desc.batching import jacfwd_chunked
+
+            assert len(jax.local_devices()) == 4, jax.local_devices()
+            A = np.random.default_rng(0).random((19, 17))
+            x = np.random.default_rng(1).random(17)
+
+            def fun(x):
+                return jnp.sin(jnp.dot(A, x))
+
+            J = jax.jacfwd(fun)(x)
+            for devices, chunk_size in [("all", 3), (3, 5), (4, None)]:
+                J1 = jacfwd_chunked(fun, chunk_size=chunk_size, devices=devices)(x)
+                np.testing.assert_allclose(J1, J)
+            J2 = jax.jit(jacfwd_chunked(fun, chunk_size=2, devices="all"))(x)
+            np.testing.assert_allclose(J2, J)
+            """
+        )
+        env = dict(os.environ)
+        env["XLA_FLAGS"] = (
+            env.get("XLA_FLAGS", "") + " --xla_force_host_platform_device_count=4"
+        )
+        env["JAX_PLATFORMS"] = "cpu"
+        result = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+
 
 class TestJVP:
     """Test calculation of jacobian vector products."""
@@ -8,11 +8,13 @@ import numpy as np
 import pytest
 
 from desc.__main__ import main
-from desc.backend import sign
-from desc.equilibrium import EquilibriaFamily, Equilibrium
+from desc.backend import jit, jnp, sign
+from desc.continuation import _continuation_task, _get_ratio
+from desc.equilibrium import CoordinateMapper, EquilibriaFamily, Equilibrium
 from desc.examples import get
-from desc.grid import Grid, LinearGrid
-from desc.io import InputReader
+from desc.geometry import FourierRZToroidalSurface
+from desc.grid import ConcentricGrid, Grid, LinearGrid
+from desc.io import InputReader, load
 from desc.objectives import ForceBalance, ObjectiveFunction, get_equilibrium_objective
 from desc.profiles import PowerSeriesProfile
 
@@ -81,6 +83,100 @@ def test_map_coordinates():
     np.testing.assert_allclose(out, out_coords, rtol=1e-4, atol=1e-4)
 
 
+@pytest.mark.unit
+def test_map_coordinates_nn_guess():
+    """Test the cached nearest neighbor initial guess against a brute force search."""
+    from desc.equilibrium.coords import _get_nn_index, _initial_guess_nn_search
+
+    eq = get("DSHAPE")
+    inbasis = ("R", "phi", "Z")
+    period = np.array([np.inf, 2 * np.pi, np.inf])
+    rng = np.random.default_rng(0)
+    coords = np.column_stack(
+        [
+            rng.uniform(2.5, 4, 200),
+            rng.uniform(-2 * np.pi, 4 * np.pi, 200),
+            rng.uniform(-1.5, 1.5, 200),
+        ]
+    )
+
+    def compute(y, basis):
+        data = eq.compute(list(basis), grid=Grid(y, sort=False, jitable=True))
+        return jnp.column_stack([data[k] for k in basis])
+
+    _get_nn_index.cache_clear()
+    guess = _initial_guess_nn_search(
+        coords, inbasis, eq, period, compute, eq.params_dict, {}
+    )
+    yg = ConcentricGrid(eq.L_grid, eq.M_grid, max(eq.N_grid, eq.M_grid)).nodes
+    d = coords[:, None] - np.asarray(compute(yg, inbasis))
+    d[..., 1] = (d[..., 1] + np.pi) % (2 * np.pi) - np.pi
+    idx = np.argmin(np.linalg.norm(d, axis=-1), axis=-1)
+    np.testing.assert_allclose(guess, yg[idx])
+
+    # traced inputs can't be put in a k-d tree, and use the brute force search
+    guess_jit = jit(
+        lambda c: _initial_guess_nn_search(
+            c, inbasis, eq, period, compute, eq.params_dict, {}
+        )
+    )(coords)
+    np.testing.assert_allclose(guess_jit, guess)
+
+    # the spatial index is reused, and rebuilt when the equilibrium changes
+    assert _get_nn_index.cache_info().currsize == 1
+    guess2 = _initial_guess_nn_search(
+        coords, inbasis, eq, period, compute, eq.params_dict, {}
+    )
+    np.testing.assert_allclose(guess2, guess)
+    assert _get_nn_index.cache_info().currsize == 1
+    assert _get_nn_index.cache_info().hits == 1
+    eq.Psi = 2 * eq.Psi
+    _initial_guess_nn_search(coords, inbasis, eq, period, compute, eq.params_dict, {})
+    assert _get_nn_index.cache_info().currsize == 2
+    # or when the profiles used to compute the coordinates change
+    for iota in [1.0, 2.0]:
+        profiles = {"iota": PowerSeriesProfile([iota])}
+        _initial_guess_nn_search(
+            coords, inbasis, eq, period, compute, eq.params_dict, profiles
+        )
+    assert _get_nn_index.cache_info().currsize == 4
+
+
+@pytest.mark.unit
+def test_coordinate_mapper():
+    """Test CoordinateMapper against map_coordinates with chunks of points."""
+    eq = get("DSHAPE")
+    inbasis = ("R", "phi", "Z")
+    outbasis = ("rho", "theta_PEST", "zeta")
+    period = (np.inf, 2 * np.pi, np.inf)
+
+    rho = np.linspace(0.01, 0.99, 50)
+    theta = np.linspace(0, np.pi, 50, endpoint=False)
+    zeta = np.linspace(0, np.pi, 50, endpoint=False)
+    grid = Grid(np.vstack([rho, theta, zeta]).T, sort=False)
+    in_data = eq.compute(list(inbasis), grid=grid)
+    in_coords = np.column_stack([in_data[k] for k in inbasis])
+    # point outside the plasma
+    in_coords[-1] = [100, 0, 0]
+
+    mapper = CoordinateMapper(
+        eq, inbasis, outbasis, period=period, maxiter=40, chunk_size=16
+    )
+    out, info = mapper(in_coords, full_output=True)
+    expected = eq.map_coordinates(
+        in_coords, inbasis, outbasis, period=period, maxiter=40
+    )
+    np.testing.assert_allclose(out[:-1], expected[:-1], rtol=1e-8, atol=1e-8)
+    assert info["residual"].shape == (50,)
+    assert info["niter"].shape == (50,)
+    assert info["converged"][:-1].all()
+    assert not info["converged"][-1]
+
+    # smaller batches are padded to reuse the same compiled functions
+    np.testing.assert_allclose(mapper(in_coords[:5]), out[:5])
+    np.testing.assert_allclose(mapper.map(in_coords[5:12]), out[5:12])
+
+
 @pytest.mark.unit
 def test_map_coordinates_derivative():
     """Test root finding for (rho,theta,zeta) from (R,phi,Z)."""
@@ -206,6 +302,112 @@ def test_continuation_resolution(tmpdir_factory):
         main(args)
 
 
+@pytest.mark.unit
+@pytest.mark.slow
+def test_continuation_batch(tmpdir_factory):
+    """Test solving several equilibria in worker processes and resuming."""
+    output_dir = tmpdir_factory.mktemp("batch")
+    output_path = str(output_dir.join("batch.h5"))
+    surfaces = [
+        FourierRZToroidalSurface(
+            R_lmn=[10, 1], modes_R=[[0, 0], [1, 0]], Z_lmn=[-k], modes_Z=[[-1, 0]]
+        )
+        for k in [1, 2]
+    ]
+    eqs = [Equilibrium(L=2, M=2, surface=surf) for surf in surfaces]
+    eqs.append({"L": 2, "M": 2, "surface": surfaces[0]})
+    eqfam = EquilibriaFamily.solve_continuation_batch(
+        eqs, output_path, num_workers=2, verbose=0
+    )
+    assert len(eqfam) == 3
+    assert eqfam[0] is eqs[0]
+    np.testing.assert_allclose(eqfam[0].R_lmn, eqfam[2].R_lmn, atol=1e-8)
+    assert not np.allclose(eqfam[0].R_lmn, eqfam[1].R_lmn)
+    # once the batch is done the file is in input order
+    saved = load(output_path)
+    np.testing.assert_allclose(saved[1].R_lmn, eqfam[1].R_lmn)
+    index_path = str(output_dir.join("batch_index.txt"))
+    np.testing.assert_array_equal(np.loadtxt(index_path, dtype=int), [0, 1, 2])
+
+    # equilibrium 1 was interrupted after its last checkpoint, and equilibrium 2 is
+    # no longer part of the batch
+    checkpoint_dir = str(output_dir.join("batch_checkpoints"))
+    os.remove(os.path.join(checkpoint_dir, "done_1.h5"))
+    eqs = [eq.copy() for eq in eqs[:2]]
+    eqfam2 = EquilibriaFamily.solve_continuation_batch(
+        eqs, output_path, num_workers=1, verbose=0
+    )
+    assert len(eqfam2) == 2
+    np.testing.assert_allclose(eqfam2[1].R_lmn, eqfam[1].R_lmn)
+    saved = load(output_path)
+    assert len(saved) == 2
+    np.testing.assert_allclose(saved[1].R_lmn, eqfam[1].R_lmn)
+    # entries of the previous batch after the first one that changed are dropped
+    np.testing.assert_array_equal(np.loadtxt(index_path, dtype=int), [0, 1])
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+@pytest.mark.parametrize("interrupt", [2, 4, 6])
+def test_continuation_batch_resume(tmpdir_factory, monkeypatch, interrupt):
+    """Test that a worker killed mid-continuation does not redo finished steps."""
+    output_dir = tmpdir_factory.mktemp("resume")
+    done_path = str(output_dir.join("done.h5"))
+    checkpoint_path = str(output_dir.join("step.h5"))
+    surf = FourierRZToroidalSurface(
+        R_lmn=[10, 1, 0.1],
+        modes_R=[[0, 0], [1, 0], [1, 1]],
+        Z_lmn=[-1, -0.1],
+        modes_Z=[[-1, 0], [-1, -1]],
+    )
+    pressure = PowerSeriesProfile([1e3, -1e3], modes=[0, 2])
+    eq = Equilibrium(L=2, M=2, N=1, surface=surf, pressure=pressure)
+    # with zero current: 2 vacuum steps, then 2 shaping steps, then 2 pressure steps
+    solve_kwargs = dict(
+        maxiter=20, verbose=0, mres_step=1, pres_step=0.5, bdry_step=0.5
+    )
+
+    solve = Equilibrium.solve
+    num_solves = [0]
+
+    def killed_solve(self, *args, **kwargs):
+        num_solves[0] += 1
+        if num_solves[0] == interrupt:
+            raise RuntimeError("worker killed")
+        return solve(self, *args, **kwargs)
+
+    monkeypatch.setattr(Equilibrium, "solve", killed_solve)
+    with pytest.raises(RuntimeError, match="worker killed"):
+        _continuation_task(eq.copy(), done_path, checkpoint_path, solve_kwargs)
+    saved = load(checkpoint_path)
+    assert len(saved) == interrupt - 1
+    assert not os.path.exists(done_path)
+
+    num_solves[0] = 0
+    _continuation_task(eq.copy(), done_path, checkpoint_path, solve_kwargs)
+    # only the steps that were not saved are solved again
+    assert num_solves[0] == 7 - interrupt
+    eqfam = load(checkpoint_path)
+    assert len(eqfam) == 6
+    for eq1, eq2 in zip(saved, eqfam):
+        np.testing.assert_allclose(eq1.R_lmn, eq2.R_lmn)
+    # resumed steps keep the step sizes of the interrupted continuation
+    np.testing.assert_array_equal([eqi.M for eqi in eqfam], [1, 2, 2, 2, 2, 2])
+    np.testing.assert_allclose(
+        [_get_ratio(eqi.surface, eq.surface) for eqi in eqfam],
+        [0, 0, 0.5, 1, 1, 1],
+        atol=1e-8,
+    )
+    np.testing.assert_allclose(
+        [_get_ratio(eqi.pressure, eq.pressure) for eqi in eqfam],
+        [0, 0, 0, 0, 0.5, 1],
+        atol=1e-8,
+    )
+    done = load(done_path)
+    assert done.is_nested()
+    np.testing.assert_allclose(done.R_lmn, eqfam[-1].R_lmn)
+
+
 @pytest.mark.unit
 def test_grid_resolution_warning():
     """Test that a warning is thrown if grid resolution is too low."""
@@ -10,7 +10,7 @@ import pytest
 
 import desc.examples
 from desc.basis import FourierZernikeBasis
-from desc.equilibrium import Equilibrium
+from desc.equilibrium import EquilibriaFamily, Equilibrium
 from desc.grid import LinearGrid
 from desc.io import InputReader, hdf5Reader, hdf5Writer, load
 from desc.io.ascii_io import read_ascii, write_ascii
@@ -666,6 +666,148 @@ def test_save_after_load(tmpdir_factory):
     assert eq2.equiv(eq)
 
 
+@pytest.mark.unit
+def test_load_lazy(tmpdir_factory):
+    """Test that lazy loading only reads the attributes that are accessed."""
+    tmpdir = tmpdir_factory.mktemp("lazy_test")
+    tmp_path = tmpdir.join("lazy_test.h5")
+    fam = EquilibriaFamily(
+        *[
+            Equilibrium(L=2, M=2, Psi=i + 1.0, iota=np.array([1, 0, 0.1 * i]))
+            for i in range(3)
+        ]
+    )
+    fam.save(tmp_path)
+
+    fam2 = load(tmp_path, lazy=True)
+    assert isinstance(fam2, EquilibriaFamily)
+    assert len(fam2) == 3
+    eq = fam2[-1]
+    assert isinstance(eq, Equilibrium)
+    assert "_R_lmn" not in eq.__dict__
+    assert eq.Psi == 3.0
+    np.testing.assert_allclose(eq.iota.params, fam[-1].iota.params)
+    # only what was accessed has been read
+    assert "_R_lmn" not in eq.__dict__
+    assert "_Psi" not in fam2[0].__dict__
+    # anything else loads the full object
+    assert eq.equiv(fam[-1])
+    assert type(eq) is Equilibrium
+    assert type(eq.iota).__name__ == "PowerSeriesProfile"
+    assert type(fam2[0]) is not Equilibrium
+
+    # saving proxies saves the full objects
+    fam2.save(tmpdir.join("lazy_test2.h5"))
+    fam3 = load(tmpdir.join("lazy_test2.h5"))
+    for eq1, eq2 in zip(fam, fam3):
+        assert type(eq2) is Equilibrium
+        assert eq1.equiv(eq2)
+
+
+@pytest.mark.unit
+def test_load_mmap(tmpdir_factory):
+    """Test memory mapping uncompressed arrays when loading."""
+    tmpdir = tmpdir_factory.mktemp("mmap_test")
+    tmp_path = tmpdir.join("mmap_test.h5")
+    eq = Equilibrium(L=2, M=2)
+    eq.save(tmp_path)
+    with h5py.File(tmp_path, "a") as f:
+        R_lmn = f["_R_lmn"][()]
+        del f["_R_lmn"]
+        f.create_dataset("_R_lmn", data=R_lmn)
+
+    eq2 = load(tmp_path, mmap=True)
+    assert isinstance(eq2.R_lmn, np.memmap)
+    assert not eq2.R_lmn.flags.writeable
+    # compressed arrays can't be memory mapped
+    assert not isinstance(eq2.Z_lmn, np.memmap)
+    assert eq2.equiv(eq)
+    with pytest.raises(ValueError):
+        load(tmp_path, file_format="pickle", lazy=True)
+
+    # objects nested in lists and attributes are memory mapped too
+    tmp_path = tmpdir.join("mmap_family_test.h5")
+    fam = EquilibriaFamily(eq, Equilibrium(L=3, M=3))
+    fam.save(tmp_path, compression=None)
+    for lazy in [False, True]:
+        fam2 = load(tmp_path, lazy=lazy, mmap=True)
+        assert isinstance(fam2[0].R_lmn, np.memmap)
+        assert isinstance(fam2[1].surface.R_lmn, np.memmap)
+        assert fam2[1].equiv(fam[1])
+
+
+@pytest.mark.unit
+def test_save_compression(tmpdir_factory):
+    """Test the compression and chunking options of the hdf5 writer."""
+    tmpdir = tmpdir_factory.mktemp("compression_test")
+    eq = Equilibrium(L=2, M=2)
+    for compression, opts, chunks in [
+        ("gzip", None, None),
+        ("gzip", 9, None),
+        (1, None, None),
+        ("lzf", None, None),
+        (None, None, None),
+        (None, None, True),
+    ]:
+        tmp_path = tmpdir.join("compression_test.h5")
+        eq.save(tmp_path, compression=compression, compression_opts=opts, chunks=chunks)
+        with h5py.File(tmp_path, "r") as f:
+            dset = f["_R_lmn"]
+            assert dset.compression == (
+                "gzip" if isinstance(compression, int) else compression
+            )
+            if opts is not None:
+                assert dset.compression_opts == opts
+            assert (dset.chunks is None) == (compression is None and chunks is None)
+            # nested objects use the same options
+            assert f["_surface/_R_lmn"].compression == dset.compression
+        assert load(tmp_path).equiv(eq)
+
+
+@pytest.mark.unit
+def test_save_append(tmpdir_factory):
+    """Test that appending to a family only writes the new members."""
+    tmpdir = tmpdir_factory.mktemp("append_test")
+    tmp_path = tmpdir.join("append_test.h5")
+    eqs = [Equilibrium(L=2, M=2, Psi=i + 1.0) for i in range(4)]
+    fam = EquilibriaFamily(*eqs[:2])
+    # uncompressed data is contiguous, so we can see where it is written
+    fam.save(tmp_path, compression=None)
+    with h5py.File(tmp_path, "r") as f:
+        offset = f["_equilibria/1/_R_lmn"].id.get_offset()
+
+    fam.append(eqs[2])
+    fam.save(tmp_path, file_mode="a", compression=None, append=True)
+    with h5py.File(tmp_path, "r") as f:
+        assert f["_equilibria/1/_R_lmn"].id.get_offset() == offset
+    fam2 = load(tmp_path)
+    assert len(fam2) == 3
+    for eq1, eq2 in zip(fam, fam2):
+        assert eq1.equiv(eq2)
+
+    # items beyond the length of the list are removed
+    fam = EquilibriaFamily(*eqs[:2])
+    fam.save(tmp_path, file_mode="a", compression=None, append=True)
+    fam2 = load(tmp_path)
+    assert len(fam2) == 2
+    assert fam2[-1].equiv(eqs[1])
+
+    # without append, members that were edited since the last save are updated
+    fam[0] = eqs[3]
+    fam.save(tmp_path, file_mode="a", compression=None)
+    fam2 = load(tmp_path)
+    assert len(fam2) == 2
+    assert fam2[0].equiv(eqs[3])
+    assert fam2[1].equiv(eqs[1])
+    fam[0].Psi = 10.0
+    fam.save(tmp_path, file_mode="a")
+    assert load(tmp_path)[0].Psi == 10.0
+
+    # a different object is replaced completely
+    eqs[3].save(tmp_path, file_mode="a")
+    assert load(tmp_path).equiv(eqs[3])
+
+
 @pytest.mark.unit
 def test_io_OmnigenousField(tmpdir_factory):
     """Test saving/loading an OmnigenousField works (tests dict saving)."""
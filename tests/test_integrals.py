@@ -23,6 +23,7 @@ from desc.integrals import (
     Bounce1D,
     DFTInterpolator,
     FFTInterpolator,
+    get_interpolator,
     line_integrals,
     singular_integral,
     surface_averages,
@@ -720,6 +721,48 @@ class TestSingularities:
             np.testing.assert_allclose(g1, g2)
             np.testing.assert_allclose(g1, ff)
 
+    @pytest.mark.unit
+    def test_singular_integral_chunked(self):
+        """Test chunked evaluation and cached interpolators of singular integrals."""
+        eq = get("ESTELL")
+        eval_grid = LinearGrid(M=4, N=4, NFP=eq.NFP)
+        source_grid = LinearGrid(M=9, N=9, NFP=eq.NFP)
+        keys = ["K_vc", "R", "phi", "Z", "|e_theta x e_zeta|"]
+        source_data = eq.compute(keys, grid=source_grid)
+        eval_data = eq.compute(keys, grid=eval_grid)
+
+        interpolator = get_interpolator(eval_grid, source_grid, 8, 8)
+        assert isinstance(interpolator, FFTInterpolator)
+        assert get_interpolator(eval_grid, source_grid, 8, 8) is interpolator
+        assert (
+            get_interpolator(LinearGrid(M=4, N=4, NFP=eq.NFP), source_grid, 8, 8)
+            is interpolator
+        )
+        assert get_interpolator(eval_grid, source_grid, 8, 6) is not interpolator
+
+        B1 = virtual_casing_biot_savart(
+            eval_data, source_data, interpolator, loop=False
+        )
+        # chunk sizes that don't divide the number of eval points and polar nodes
+        B2 = virtual_casing_biot_savart(
+            eval_data, source_data, interpolator, chunk_size=7
+        )
+        np.testing.assert_allclose(B1, B2, rtol=1e-10, atol=1e-12)
+
+        # fft interpolation to a different number of points
+        egrid = LinearGrid(M=6, N=3, NFP=eq.NFP)
+        interp1 = get_interpolator(egrid, source_grid, 8, 8)
+        interp2 = get_interpolator(egrid, source_grid, 8, 8, use_dft=True)
+        assert isinstance(interp2, DFTInterpolator)
+        f = lambda t, z: np.sin(2 * t) + np.cos(eq.NFP * z)
+        fs = f(source_grid.nodes[:, 1], source_grid.nodes[:, 2])
+        for i in [0, 5, 17]:
+            fi = f(
+                egrid.nodes[:, 1] + interp1._st[i], egrid.nodes[:, 2] + interp1._sz[i]
+            )
+            np.testing.assert_allclose(interp1(fs, i), fi, atol=1e-12)
+            np.testing.assert_allclose(interp2(fs, i), fi, atol=1e-12)
+
 
 class TestBouncePoints:
     """Test that bounce points are computed correctly."""
@@ -465,6 +465,37 @@ def test_correct_indexing_passed_modes():
     np.testing.assert_allclose(A @ Z, 0, atol=atol)
 
 
+@pytest.mark.unit
+def test_factorize_coupled_block():
+    """Test null space from the coupled block matches the dense SVD."""
+    from desc.objectives.utils import _factorize_coupled_block
+    from desc.utils import svd_inv_null
+
+    rng = np.random.default_rng(0)
+    A = np.zeros((4, 12))
+    A[:, [1, 5, 6, 10]] = rng.standard_normal((4, 4))
+    A[:, 3] = 0.5 * A[:, 1]  # rank deficient in coupled block
+    b = rng.standard_normal(4)
+    b = A @ np.linalg.lstsq(A, b, rcond=None)[0]
+
+    free_idx, coupled_idx, A_inv, Zc = _factorize_coupled_block(A)
+    np.testing.assert_array_equal(free_idx, [0, 2, 4, 7, 8, 9, 11])
+    np.testing.assert_array_equal(coupled_idx, [1, 3, 5, 6, 10])
+    Z = np.zeros((A.shape[1], free_idx.size + Zc.shape[1]))
+    Z[free_idx, np.arange(free_idx.size)] = 1
+    Z[np.ix_(coupled_idx, free_idx.size + np.arange(Zc.shape[1]))] = Zc
+    xp = np.zeros(A.shape[1])
+    xp[coupled_idx] = A_inv @ b
+
+    A_inv_dense, Z_dense = svd_inv_null(A)
+    np.testing.assert_allclose(A @ Z, 0, atol=1e-14)
+    np.testing.assert_allclose(Z.T @ Z, np.eye(Z.shape[1]), atol=1e-14)
+    assert Z.shape == Z_dense.shape
+    # same null space
+    np.testing.assert_allclose(Z @ Z.T, Z_dense @ Z_dense.T, atol=1e-12)
+    np.testing.assert_allclose(xp, A_inv_dense @ b, atol=1e-12)
+
+
 @pytest.mark.unit
 def test_correct_indexing_passed_modes_and_passed_target():
     """Test indexing when passing in specified modes, related to gh issue #380."""
@@ -1,5 +1,7 @@
 """Tests for magnetic field classes."""
 
+from functools import partial
+
 import numpy as np
 import pytest
 from diffrax import Dopri5
@@ -28,8 +30,14 @@ from desc.magnetic_fields import (
     VerticalMagneticField,
     field_line_integrate,
     read_BNORM_file,
+    trace_field_lines,
+)
+from desc.magnetic_fields._core import (
+    biot_savart_general,
+    biot_savart_general_vector_potential,
 )
 from desc.magnetic_fields._dommaschk import CD_m_k, CN_m_k
+from desc.magnetic_fields._treecode import biot_savart_tree
 from desc.utils import dot
 
 
@@ -227,6 +235,36 @@ class TestMagneticFields:
             ["B0", "R0"],
         ]
 
+    @pytest.mark.unit
+    def test_biot_savart_tree(self):
+        """Tree code agrees with the direct sum for a cloud of current elements."""
+        rng = np.random.default_rng(0)
+        rs = rng.normal(size=(3000, 3))
+        J = rng.normal(size=(3000, 3))
+        dV = rng.uniform(size=3000)
+        # points both inside and far from the sources
+        re = np.concatenate([rng.normal(size=(50, 3)), 5 * rng.normal(size=(50, 3))])
+        B = biot_savart_general(re, rs, J, dV)
+        np.testing.assert_allclose(
+            biot_savart_general(re, rs, J, dV, tol=1e-8), B, atol=1e-7 * np.abs(B).max()
+        )
+        # small leaves so that most of the sum comes from the expansions
+        B_tree = biot_savart_tree(
+            re, rs, J * dV[:, None], tol=1e-8, order=6, leaf_size=8, max_near=512
+        )
+        np.testing.assert_allclose(B_tree, B, atol=1e-7 * np.abs(B).max())
+        # chunks with too many near clusters fall back to the direct sum
+        B_tree = biot_savart_tree(
+            re, rs, J * dV[:, None], tol=1e-8, leaf_size=8, max_near=2
+        )
+        np.testing.assert_allclose(B_tree, B, rtol=1e-10, atol=1e-14)
+        A = biot_savart_general_vector_potential(re, rs, J, dV)
+        np.testing.assert_allclose(
+            biot_savart_general_vector_potential(re, rs, J, dV, tol=1e-8),
+            A,
+            atol=1e-7 * np.abs(A).max(),
+        )
+
     @pytest.mark.unit
     def test_scalar_field(self):
         """Test scalar potential magnetic field against analytic result."""
@@ -718,6 +756,68 @@ class TestMagneticFields:
         with pytest.raises(ValueError):
             field.Phi_mn = np.ones((basis.num_modes + 1,))
 
+    @pytest.mark.unit
+    def test_fourier_current_potential_field_to_interpolated(self):
+        """Test that a symmetric winding surface does not make the field symmetric."""
+        basis = DoubleFourierSeries(M=1, N=1, NFP=2, sym=False)
+        field = FourierCurrentPotentialField(
+            Phi_mn=np.linspace(1, 2, basis.num_modes) * 1e5,
+            modes_Phi=basis.modes[:, 1:],
+            G=1e6,
+            R_lmn=np.array([10, 1]),
+            Z_lmn=np.array([-1]),
+            modes_R=np.array([[0, 0], [1, 0]]),
+            modes_Z=np.array([[-1, 0]]),
+            NFP=2,
+        )
+        assert field.sym and field.sym_Phi is False
+        source_grid = LinearGrid(M=8, N=8, NFP=2)
+        R = np.linspace(9.5, 10.5, 3)
+        Z = np.linspace(-0.4, 0.4, 3)
+        interp = field.to_interpolated(
+            R, 4, Z, source_grid=source_grid, compute_vector_potential=False
+        )
+        RR, PP, ZZ = np.meshgrid(R, interp._phi, Z, indexing="ij")
+        coords = np.array([RR.flatten(), PP.flatten(), ZZ.flatten()]).T
+        B = field.compute_magnetic_field(coords, source_grid=source_grid)
+        np.testing.assert_allclose(
+            interp.compute_magnetic_field(coords), B, atol=1e-12 * np.abs(B).max()
+        )
+
+    @pytest.mark.unit
+    def test_fourier_current_potential_field_save_mgrid(self, tmpdir_factory):
+        """Test that a symmetric winding surface does not make the mgrid symmetric."""
+        from netCDF4 import Dataset
+
+        basis = DoubleFourierSeries(M=1, N=1, NFP=2, sym=False)
+        field = FourierCurrentPotentialField(
+            Phi_mn=np.linspace(1, 2, basis.num_modes) * 1e5,
+            modes_Phi=basis.modes[:, 1:],
+            G=1e6,
+            R_lmn=np.array([10, 1]),
+            Z_lmn=np.array([-1]),
+            modes_R=np.array([[0, 0], [1, 0]]),
+            modes_Z=np.array([[-1, 0]]),
+            NFP=2,
+        )
+        assert field.sym and field.sym_Phi is False
+        source_grid = LinearGrid(M=8, N=8, NFP=2)
+        field.compute_magnetic_field = partial(
+            field.compute_magnetic_field, source_grid=source_grid
+        )
+        path = str(tmpdir_factory.mktemp("mgrid_sym").join("mgrid.nc"))
+        field.save_mgrid(path, 9.5, 10.5, -0.4, 0.4, 3, 3, 4, False)
+        with Dataset(path) as file:
+            BR = file["br_001"][:]
+        R, Z = np.linspace(9.5, 10.5, 3), np.linspace(-0.4, 0.4, 3)
+        phi = np.linspace(0, np.pi, 4, endpoint=False)
+        PP, ZZ, RR = np.meshgrid(phi, Z, R, indexing="ij")
+        coords = np.array([RR.flatten(), PP.flatten(), ZZ.flatten()]).T
+        B = field.compute_magnetic_field(coords)
+        np.testing.assert_allclose(
+            BR, B[:, 0].reshape(BR.shape), atol=1e-12 * np.abs(B).max()
+        )
+
     @pytest.mark.unit
     def test_io_fourier_current_field(self, tmpdir_factory):
         """Test that i/o works for FourierCurrentPotentialField."""
@@ -1051,6 +1151,64 @@ class TestMagneticFields:
         np.testing.assert_allclose(r[-1], 10, rtol=1e-6, atol=1e-6)
         np.testing.assert_allclose(z[-1], 0.001, rtol=1e-6, atol=1e-6)
 
+    @pytest.mark.unit
+    def test_trace_field_lines(self):
+        """Test tracing field lines through Poincare sections."""
+        # q=4, field line should rotate 1/4 turn after 1 toroidal transit
+        field = ToroidalMagneticField(2, 10) + PoloidalMagneticField(2, 10, 0.25)
+        r0 = [10.001, 10.002]
+        z0 = [0.0, 0.0]
+        data = trace_field_lines(r0, z0, field, phi=[0, np.pi / 2], ntransit=5)
+        assert data["R"].shape == data["Z"].shape == (5, 2, 2)
+        np.testing.assert_allclose(data["phi"][:, 0], 2 * np.pi * np.arange(5))
+        np.testing.assert_allclose(
+            data["R"][:, 0, 0], [10.001, 10, 9.999, 10, 10.001], atol=1e-6
+        )
+        np.testing.assert_allclose(
+            data["Z"][:, 0, 0], [0, 0.001, 0, -0.001, 0], atol=1e-6
+        )
+
+        def length(a, phi):
+            # field line is R = 10 + a cos(phi/4), Z = a sin(phi/4)
+            phi = np.linspace(0, phi, 10001)
+            return np.trapz(np.sqrt((10 + a * np.cos(phi / 4)) ** 2 + a**2 / 16), phi)
+
+        np.testing.assert_allclose(
+            data["length"], [length(0.001, 10 * np.pi), length(0.002, 10 * np.pi)]
+        )
+        assert not np.any(data["lost"])
+        assert data["num_field_evals"] > 0
+
+        # second line leaves the box at R=9.9985 during the second transit
+        data2 = trace_field_lines(
+            r0,
+            z0,
+            field,
+            phi=[0, np.pi / 2],
+            ntransit=5,
+            bounds_R=(9.9985, np.inf),
+            chunk_size=1,
+        )
+        np.testing.assert_allclose(data2["R"][:, :, 0], data["R"][:, :, 0])
+        np.testing.assert_array_equal(data2["lost"], [False, True])
+        assert np.all(np.isfinite(data2["R"][:2, :, 1]))
+        assert np.all(np.isnan(data2["R"][2:, :, 1]))
+        # it reaches the wall at a poloidal angle of arccos(-0.75), q is only
+        # approximately 4 so this is less accurate than the length of a full line
+        np.testing.assert_allclose(
+            data2["length"][1], length(0.002, 4 * np.arccos(-0.75)), rtol=1e-3
+        )
+
+        # crossings are in the right planes when traced against the toroidal angle
+        field = ToroidalMagneticField(-2, 10) + PoloidalMagneticField(2, 10, 0.25)
+        data = trace_field_lines(r0, z0, field, phi=[0, np.pi / 2], ntransit=2)
+        np.testing.assert_allclose(
+            data["phi"], [[0, -3 * np.pi / 2], [-2 * np.pi, -7 * np.pi / 2]]
+        )
+        r, z = field_line_integrate(r0, z0, -data["phi"].flatten(), field)
+        np.testing.assert_allclose(data["R"].reshape(r.shape), r, atol=1e-8)
+        np.testing.assert_allclose(data["Z"].reshape(z.shape), z, atol=1e-8)
+
     @pytest.mark.unit
     def test_field_line_integrate_early_terminate_default(self):
         """Test field line integration with default early termination criterion."""
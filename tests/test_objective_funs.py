@@ -13,7 +13,7 @@ import pytest
 from scipy.constants import elementary_charge, mu_0
 
 import desc.examples
-from desc.backend import jnp
+from desc.backend import jax, jnp
 from desc.coils import (
     CoilSet,
     FourierPlanarCoil,
@@ -329,6 +329,52 @@ class TestObjectiveFunction:
 
         test(Equilibrium(L=2, M=2, N=1, current=PowerSeriesProfile(0)))
 
+    @pytest.mark.unit
+    def test_compilation_cache(self, tmpdir_factory, capsys):
+        """Test persistent compilation cache hit/miss reporting and eviction."""
+        from desc.compilation_cache import (
+            disable_compilation_cache,
+            enable_compilation_cache,
+        )
+
+        cache_dir = tmpdir_factory.mktemp("compilation_cache")
+        cache = enable_compilation_cache(cache_dir)
+        try:
+            eq = Equilibrium(L=2, M=2, N=0)
+            obj1 = ObjectiveFunction(ForceBalance(eq))
+            obj1.build(verbose=0)
+            obj2 = ObjectiveFunction(ForceBalance(eq.copy()))
+            obj2.build(verbose=0)
+            # same structure, different instances -> same key
+            assert obj1._compilation_cache_key("lsq") == obj2._compilation_cache_key(
+                "lsq"
+            )
+            assert obj1._compilation_cache_key("lsq") != obj1._compilation_cache_key(
+                "scalar"
+            )
+            eq3 = Equilibrium(L=3, M=3, N=0)
+            obj3 = ObjectiveFunction(ForceBalance(eq3))
+            obj3.build(verbose=0)
+            assert obj1._compilation_cache_key("lsq") != obj3._compilation_cache_key(
+                "lsq"
+            )
+
+            obj1.compile(verbose=1)
+            assert "Compilation cache miss" in capsys.readouterr().out
+            assert cache.misses == 1
+            assert cache.size > 0
+            obj2.compile(verbose=1)
+            assert "Compilation cache hit" in capsys.readouterr().out
+            assert cache.hits == 1
+
+            # shrinking the cache evicts the least recently used entry
+            cache._max_size = 1e-12
+            obj3.compile(verbose=0)
+            assert not cache.contains(obj1._compilation_cache_key("lsq"))
+            assert cache.contains(obj3._compilation_cache_key("lsq"))
+        finally:
+            disable_compilation_cache()
+
     @pytest.mark.unit
     def test_qh_boozer(self):
         """Test calculation of Boozer QH metric."""
@@ -1104,6 +1150,83 @@ class TestObjectiveFunction:
 
         # TODO: add more complex test case with a stellarator and/or MixedCoilSet
 
+    @pytest.mark.unit
+    def test_min_distance_symmetry_culling(self):
+        """Test min distance objectives against distances between all points."""
+
+        def brute(x, y, exclude_self=False):
+            d = jnp.linalg.norm(x[:, None, :, None] - y[None, :, None, :], axis=-1)
+            d = d.min(axis=(-1, -2))
+            if exclude_self:
+                d = jnp.where(jnp.eye(d.shape[0], dtype=bool), jnp.inf, d)
+            return d.min(axis=-1)
+
+        NFP = 3
+        phi = (np.arange(2) + 0.5) * np.pi / NFP / 2
+        coils = CoilSet(
+            [
+                FourierPlanarCoil(
+                    center=[6 * np.cos(p), 6 * np.sin(p), 0.1 * i],
+                    normal=[-np.sin(p), np.cos(p), 0.1 * i],
+                    r_n=2 + 0.1 * i,
+                )
+                for i, p in enumerate(phi)
+            ],
+            NFP=NFP,
+            sym=True,
+        )
+        coil_grid = LinearGrid(N=15)
+
+        def coil_pts(params):
+            return coils._compute_position(params=params, grid=coil_grid)
+
+        obj = CoilSetMinDistance(coils, grid=coil_grid, dist_chunk_size=5)
+        obj.build(verbose=0)
+        np.testing.assert_array_equal(obj._unique, [0, 1])
+        # 12 coils with 4 segments each
+        assert obj._num_candidates < 48
+        params = coils.params_dict
+        np.testing.assert_allclose(
+            obj.compute(params), brute(coil_pts(params), coil_pts(params), True)
+        )
+        np.testing.assert_allclose(
+            np.hstack(jax.tree_util.tree_leaves(jax.jacfwd(obj.compute)(params))),
+            np.hstack(
+                jax.tree_util.tree_leaves(
+                    jax.jacfwd(lambda x: brute(coil_pts(x), coil_pts(x), True))(params)
+                )
+            ),
+            atol=1e-12,
+        )
+        # move a coil closer to a different neighbor than it was built with
+        params[1]["center"] = params[1]["center"] + np.array([-0.5, 1.0, 0.5])
+        np.testing.assert_allclose(
+            obj.compute(params), brute(coil_pts(params), coil_pts(params), True)
+        )
+
+        surf = FourierRZToroidalSurface(
+            R_lmn=np.array([6, 1]),
+            Z_lmn=np.array([-1]),
+            modes_R=np.array([[0, 0], [1, 0]]),
+            modes_Z=np.array([[-1, 0]]),
+            NFP=NFP,
+        )
+        params = coils.params_dict
+        for plasma_grid, num_unique in [
+            (LinearGrid(M=4, zeta=np.linspace(0, 2 * np.pi, 4 * NFP, False)), 2),
+            (LinearGrid(M=4, zeta=16), 12),
+        ]:
+            obj = PlasmaCoilSetMinDistance(
+                surf, coils, plasma_grid=plasma_grid, coil_grid=coil_grid
+            )
+            obj.build(verbose=0)
+            assert obj._unique.size == num_unique
+            plasma_pts = surf.compute("x", grid=plasma_grid, basis="xyz")["x"]
+            np.testing.assert_allclose(
+                obj.compute(surf.params_dict, params),
+                brute(coil_pts(params), plasma_pts[None]),
+            )
+
     @pytest.mark.unit
     def test_quadratic_flux(self):
         """Test calculation of quadratic flux on the boundary."""
@@ -44,11 +44,13 @@ from desc.objectives import (
     QuasisymmetryTripleProduct,
     Volume,
     get_fixed_boundary_constraints,
+    maybe_add_self_consistency,
 )
 from desc.objectives.objective_funs import _Objective
 from desc.optimize import (
     LinearConstraintProjection,
     Optimizer,
+    OptimizerCheckpoint,
     ProximalProjection,
     fmin_auglag,
     fmintr,
@@ -57,6 +59,7 @@ from desc.optimize import (
     optimizers,
     sgd,
 )
+from desc.optimize.utils import ArrayLRUCache
 
 
 @jit
@@ -301,6 +304,126 @@ class TestLSQTR:
         )
         np.testing.assert_allclose(out["x"], p)
 
+    @pytest.mark.unit
+    def test_lsqtr_broyden(self):
+        """Test least squares with Broyden updates between Jacobian evaluations."""
+        p = np.array([1.0, 2.0, 3.0, 4.0, 1.0, 2.0])
+        x = np.linspace(-1, 1, 100)
+        y = vector_fun(x, p)
+
+        def res(p):
+            return vector_fun(x, p) - y
+
+        rando = default_rng(seed=0)
+        p0 = p + 0.25 * (rando.random(p.size) - 0.5)
+
+        jac = Derivative(res, 0, "fwd")
+
+        out1 = lsqtr(res, p0, jac, verbose=3, x_scale=1)
+        out2 = lsqtr(
+            res,
+            p0,
+            jac,
+            verbose=3,
+            x_scale=1,
+            options={"max_broyden_updates": 3},
+        )
+        np.testing.assert_allclose(out1["x"], p)
+        np.testing.assert_allclose(out2["x"], p)
+        assert out2["njev"] < out2["nit"]
+
+    @pytest.mark.unit
+    def test_lsqtr_initial_jac(self):
+        """Test least squares starting from an approximate Jacobian."""
+        p = np.array([1.0, 2.0, 3.0, 4.0, 1.0, 2.0])
+        x = np.linspace(-1, 1, 100)
+        y = vector_fun(x, p)
+
+        def res(p):
+            return vector_fun(x, p) - y
+
+        rando = default_rng(seed=0)
+        p0 = p + 0.25 * (rando.random(p.size) - 0.5)
+
+        jac = Derivative(res, 0, "fwd")
+
+        out1 = lsqtr(res, p0, jac, verbose=3, x_scale=1)
+        # Jacobian from a nearby point, as from a previous solve of a similar problem
+        out2 = lsqtr(
+            res,
+            p0,
+            jac,
+            verbose=3,
+            x_scale=1,
+            options={"initial_jac": jac(p0 + 0.01)},
+        )
+        np.testing.assert_allclose(out1["x"], p)
+        np.testing.assert_allclose(out2["x"], p)
+        assert out2["njev"] == out2["nit"] < out1["njev"]
+
+        # a bad approximation gets replaced by the true Jacobian
+        out3 = lsqtr(
+            res,
+            p0,
+            jac,
+            verbose=3,
+            x_scale=1,
+            options={"initial_jac": -jac(p0)},
+        )
+        np.testing.assert_allclose(out3["x"], p)
+
+        with pytest.raises(ValueError, match="initial_jac"):
+            lsqtr(res, p0, jac, options={"initial_jac": jac(p0)[:, 1:]})
+
+    @pytest.mark.unit
+    def test_lsqtr_cg(self):
+        """Test minimizing least squares test function using matrix free CG."""
+        p = np.array([1.0, 2.0, 3.0, 4.0, 1.0, 2.0])
+        x = np.linspace(-1, 1, 100)
+        y = vector_fun(x, p)
+
+        def res(p):
+            return vector_fun(x, p) - y
+
+        rando = default_rng(seed=0)
+        p0 = p + 0.25 * (rando.random(p.size) - 0.5)
+
+        jac = Derivative(res, 0, "fwd")
+
+        def jvp(v, p):
+            if v.ndim == 1:
+                return Derivative.compute_jvp(res, 0, v, p)
+            return jnp.vstack([Derivative.compute_jvp(res, 0, vi, p) for vi in v])
+
+        def vjp(v, p):
+            return Derivative.compute_vjp(res, 0, v, p)
+
+        for x_scale in [1, "jac"]:
+            out = lsqtr(
+                res,
+                p0,
+                jac,
+                verbose=3,
+                x_scale=x_scale,
+                options={"tr_method": "cg", "jvp": jvp, "vjp": vjp},
+            )
+            np.testing.assert_allclose(out["x"], p)
+            assert out["jac"] is None
+
+        # with bounds, which uses the operator in select_step
+        out = lsqtr(
+            res,
+            p0,
+            jac,
+            bounds=(0.5, 10),
+            verbose=3,
+            options={"tr_method": "cg", "jvp": jvp, "vjp": vjp},
+        )
+        np.testing.assert_allclose(out["x"], p)
+
+        with pytest.raises(ValueError, match="requires the 'jvp' and 'vjp'"):
+            lsqtr(res, p0, jac, options={"tr_method": "cg"})
+
 
 @pytest.mark.unit
 def test_no_iterations():
@@ -712,6 +835,69 @@ def test_solve_with_x_scale():
     assert eq.is_nested()
 
 
+@pytest.mark.unit
+def test_project_x_scale():
+    """Test projecting x_scale onto the reduced variables without dense matrices."""
+    eq = Equilibrium(L=3, M=3, N=1, NFP=2)
+    objective = ObjectiveFunction(ForceBalance(eq))
+    constraint = ObjectiveFunction(
+        maybe_add_self_consistency(eq, get_fixed_boundary_constraints(eq))
+    )
+    objective.build(verbose=0)
+    constraint.build(verbose=0)
+    lcp = LinearConstraintProjection(objective, constraint)
+    lcp.build(verbose=0)
+    Z, D, idx = np.asarray(lcp._Z), np.asarray(lcp._D), lcp._unfixed_idx
+    x_scale = default_rng(0).random(objective.dim_x)
+    np.testing.assert_allclose(
+        lcp._project_x_scale(x_scale),
+        np.diag(Z.T @ np.diag(x_scale[idx]) @ Z),
+        rtol=1e-14,
+        atol=1e-14,
+    )
+    np.testing.assert_allclose(
+        lcp._unfixed_idx_mat, np.diag(D)[:, idx] @ Z, rtol=0, atol=0
+    )
+
+
+@pytest.mark.unit
+def test_update_constraint_target(monkeypatch):
+    """Test that updating the constraint targets reuses the factorization."""
+    eq = Equilibrium(L=3, M=3, N=1, NFP=2)
+    objective = ObjectiveFunction(ForceBalance(eq))
+    constraint = ObjectiveFunction(
+        maybe_add_self_consistency(eq, get_fixed_boundary_constraints(eq))
+    )
+    objective.build(verbose=0)
+    constraint.build(verbose=0)
+    lcp = LinearConstraintProjection(objective, constraint)
+    lcp.build(verbose=0)
+    Z, D = lcp._Z, lcp._D
+
+    eq2 = eq.copy()
+    eq2.surface.R_lmn = eq2.surface.R_lmn * 1.1
+    eq2.Psi = 2 * eq.Psi
+    calls = []
+    monkeypatch.setattr(
+        "desc.objectives.utils._factorize_coupled_block",
+        lambda *args: calls.append(args),
+    )
+    lcp.update_constraint_target(eq2)
+    assert not calls
+    assert lcp._Z is Z
+    assert lcp._D is D
+    monkeypatch.undo()
+
+    # same particular solution as factorizing again with the new targets
+    xp = lcp._xp
+    lcp._factorize(D)
+    np.testing.assert_allclose(xp, lcp._xp, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(lcp._Z, Z, rtol=1e-12, atol=1e-12)
+    # and the recovered state vectors satisfy the new constraints
+    x = lcp.recover(default_rng(0).random(lcp._dim_x_reduced))
+    np.testing.assert_allclose(constraint.compute_scaled_error(x), 0, atol=1e-10)
+
+
 @pytest.mark.unit
 def test_bounded_optimization():
     """Test that our bounded optimizers are as good as scipy."""
@@ -894,6 +1080,124 @@ def test_auglag():
     np.testing.assert_allclose(out4["x"], out3["x"], rtol=1e-4, atol=1e-4)
 
 
+@pytest.mark.unit
+def test_solver_checkpoint_restart(tmpdir):
+    """Test that restarting lsqtr and lsq_auglag from a checkpoint is exact."""
+    fun = jit(lambda x: jnp.array([10 * (x[1] - x[0] ** 2), 1 - x[0], x[2] ** 3]))
+    jac = jit(Derivative(fun, mode="fwd"))
+    con = jit(lambda x: jnp.array([x[0] + x[1] + x[2] - 1.5]))
+    conjac = jit(Derivative(con, mode="fwd"))
+    constraint = NonlinearConstraint(con, -np.inf, 0, conjac)
+    x0 = np.array([-1.2, 1.0, 0.5])
+    path = str(tmpdir.join("checkpoint.h5"))
+
+    def run(solver, maxiter, **options):
+        kwargs = {"constraint": constraint} if solver is lsq_auglag else {}
+        return solver(
+            fun,
+            x0,
+            jac,
+            ftol=0,
+            xtol=0,
+            gtol=0,
+            verbose=0,
+            maxiter=maxiter,
+            options=options,
+            **kwargs,
+        )
+
+    def save(state):
+        state = {key: np.asarray(val) for key, val in state.items()}
+        OptimizerCheckpoint("lsq-exact", x0.size, state, {}).save(path)
+
+    for solver, options in [
+        (lsqtr, {}),
+        (lsqtr, {"max_broyden_updates": 2}),
+        (lsq_auglag, {}),
+    ]:
+        out1 = run(solver, 8, **options)
+        out2 = run(solver, 3, checkpoint=save, **options)
+        assert out2["nit"] == 3
+        restart = load(path).solver_state
+        assert restart["iteration"] == 3
+        out3 = run(solver, 8, restart=restart, **options)
+        assert out3["nit"] == out1["nit"]
+        assert out3["nfev"] == out1["nfev"]
+        assert out3["njev"] == out1["njev"]
+        np.testing.assert_array_equal(out3["x"], out1["x"])
+        np.testing.assert_array_equal(out3["alltr"], out1["alltr"])
+        np.testing.assert_array_equal(out3["allx"], out1["allx"])
+
+
+@pytest.mark.unit
+def test_array_lru_cache():
+    """Test lookups, tolerance, eviction and statistics of the cache of solutions."""
+    rng = default_rng(0)
+    xs = [rng.random(10) for _ in range(5)]
+    cache = ArrayLRUCache(maxsize=3)
+    for i, x in enumerate(xs[:3]):
+        cache.put(x, i)
+    assert cache.get(xs[0]) == 0
+    # keys within machine precision match, others don't
+    assert cache.get(xs[1] * (1 + 1e-17) + 1e-17) == 1
+    assert cache.get(xs[1] + 1e-8) is None
+    assert cache.get(np.full(10, np.nan)) is None
+    # xs[2] is least recently used so it is evicted first
+    cache.put(xs[3], 3)
+    assert cache.get(xs[2], "missing") == "missing"
+    cache.put(xs[0], 4)
+    assert cache.get(xs[0]) == 4
+    assert [i for _, i in cache.items()] == [1, 3, 4]
+    assert cache.cache_info() == (3, 3, 3, 3)
+    with pytest.raises(ValueError):
+        ArrayLRUCache(maxsize=0)
+
+
+@pytest.mark.slow
+@pytest.mark.regression
+@pytest.mark.optimize
+def test_optimize_checkpoint_restart(tmpdir):
+    """Test that an interrupted proximal optimization can be restarted exactly."""
+    eq0 = desc.examples.get("DSHAPE")
+    with pytest.warns(UserWarning, match="Reducing radial"):
+        eq0.change_resolution(L=4, M=4, L_grid=6, M_grid=6)
+    V = eq0.compute("V")["V"]
+    path = str(tmpdir.join("checkpoint.h5"))
+
+    def run(maxiter, **kwargs):
+        eq = eq0.copy()
+        objective = ObjectiveFunction(
+            (AspectRatio(eq=eq, target=2.5), Volume(eq=eq, target=V))
+        )
+        constraints = (ForceBalance(eq), FixPressure(eq), FixIota(eq), FixPsi(eq))
+        return eq.optimize(
+            objective,
+            constraints,
+            optimizer="proximal-lsq-exact",
+            maxiter=maxiter,
+            ftol=0,
+            xtol=0,
+            gtol=0,
+            verbose=0,
+            **kwargs,
+        )
+
+    eq1, result1 = run(4)
+    _, result2 = run(2, checkpoint=path, checkpoint_every=1)
+    assert result2["nit"] == 2
+    eq3, result3 = run(4, restart_from=path)
+    assert result3["nit"] == result1["nit"]
+    np.testing.assert_array_equal(result3["x"], result1["x"])
+    assert len(result3["history"]) == len(result1["history"])
+    for key, val in eq1.params_dict.items():
+        np.testing.assert_array_equal(eq3.params_dict[key], val)
+
+    with pytest.raises(ValueError, match="method"):
+        eq0.solve(optimizer="lsq-auglag", maxiter=1, restart_from=path)
+    with pytest.raises(NotImplementedError):
+        eq0.solve(optimizer="fmintr", maxiter=1, checkpoint=path)
+
+
 @pytest.mark.slow
 @pytest.mark.regression
 @pytest.mark.optimize
@@ -1232,6 +1536,46 @@ def test_proximal_jacobian():
     np.testing.assert_allclose(jac_unscaled, jac3, rtol=1e-12, atol=1e-12)
 
 
+@pytest.mark.slow
+@pytest.mark.regression
+def test_proximal_recycle_inner_jacobian():
+    """Test that the equilibrium solves in ProximalProjection reuse earlier work."""
+    eq = desc.examples.get("DSHAPE")
+    with pytest.warns(UserWarning, match="Reducing radial"):
+        eq.change_resolution(L=4, M=4, L_grid=6, M_grid=6)
+    eq.solve(maxiter=1, verbose=0)  # so that eq satisfies the linear constraints
+    con = ObjectiveFunction(ForceBalance(eq))
+    obj = ObjectiveFunction((AspectRatio(eq), Volume(eq)))
+    prox = ProximalProjection(obj, con, eq, solve_options={"maxiter": 5})
+    prox.build()
+    lcp = prox._eq_solve_objective
+    assert prox._recycle_jac
+    assert prox._inner_jac is None
+
+    x = prox.x(eq)
+    _ = prox.jac_scaled_error(x)
+    # Jacobian of the equilibrium solve at the current equilibrium, in the reduced
+    # variables of the solve
+    np.testing.assert_allclose(
+        prox._inner_jac @ lcp._unfixed_idx_mat,
+        lcp.jac_scaled_error(lcp.x(eq)),
+        rtol=1e-10,
+        atol=1e-10,
+    )
+
+    dx = np.zeros_like(x)
+    dx[-1] = 1e-3 * x[-1]  # small change to the last boundary mode
+    f = prox.compute_scaled_error(x + dx)
+    assert prox._eq_solve_objective is lcp
+    info = prox.cache_info()
+    assert info.currsize == 2
+    assert info.misses == 1
+    # the equilibrium was solved with the new boundary
+    xopt, xeq = prox._cache.get(x + dx)
+    np.testing.assert_allclose(lcp.recover(lcp.project(xeq)), xeq, atol=1e-12)
+    np.testing.assert_allclose(f, obj.compute_scaled_error(xopt))
+
+
 @pytest.mark.slow
 @pytest.mark.regression
 def test_LinearConstraint_jacobian():
@@ -21,8 +21,10 @@ from desc.integrals import surface_averages
 from desc.io import load
 from desc.magnetic_fields import (
     OmnigenousField,
+    PoloidalMagneticField,
     SplineMagneticField,
     ToroidalMagneticField,
+    field_line_integrate,
 )
 from desc.plotting import (
     plot_1d,
@@ -963,3 +965,29 @@ def test_plot_poincare():
 
     fig, ax = poincare_plot(ext_field, r0, z0, ntransit=50, NFP=eq.NFP)
     return fig
+
+
+@pytest.mark.unit
+def test_poincare_plot_crossings():
+    """Test poincare_plot gives the same crossings as field_line_integrate."""
+    r0 = np.array([10.001, 10.002])
+    z0 = np.zeros(2)
+    phi = np.linspace(0, 2 * np.pi, 4, endpoint=False)
+    ntransit = 3
+    phis = (phi + 2 * np.pi * np.arange(ntransit)[:, None]).flatten()
+    for B0 in [2, -2]:
+        field = ToroidalMagneticField(B0, 10) + PoloidalMagneticField(2, 10, 0.25)
+        _, _, data = poincare_plot(
+            field, r0, z0, ntransit=ntransit, phi=phi, NFP=1, return_data=True
+        )
+        r, z = field_line_integrate(r0, z0, phis, field)
+        r = r.reshape((ntransit, phi.size, -1))
+        z = z.reshape((ntransit, phi.size, -1))
+        if B0 < 0:
+            # field lines go backwards in phi, so the old code traced to -phis
+            # and had to reverse and roll the planes to put them back in order
+            r = np.roll(r[:, ::-1], 1, 1)
+            z = np.roll(z[:, ::-1], 1, 1)
+        np.testing.assert_allclose(data["R"], r, atol=1e-8)
+        np.testing.assert_allclose(data["Z"], z, atol=1e-8)
+        plt.close("all")
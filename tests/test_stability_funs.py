@@ -7,7 +7,8 @@ from scipy.interpolate import interp1d
 
 import desc.examples
 import desc.io
-from desc.backend import jnp
+from desc.backend import jax, jnp
+from desc.compute._stability import _eigvalsh_max_tridiagonal
 from desc.equilibrium import Equilibrium
 from desc.grid import Grid, LinearGrid, QuadratureGrid
 from desc.objectives import MagneticWell, MercierStability
@@ -526,6 +527,30 @@ def test_ballooning_geometry(tmpdir_factory):
         np.testing.assert_allclose(sqrt_g_PEST, 1 / (B_sup_zeta / psi_r))
 
 
+@pytest.mark.unit
+def test_eigvalsh_max_tridiagonal():
+    """Test largest eigenvalue of tridiagonal matrices and its derivative."""
+    rng = np.random.default_rng(0)
+
+    def dense(d, e):
+        i = np.arange(d.shape[-1])
+        T = jnp.zeros(d.shape + d.shape[-1:]).at[..., i, i].set(d)
+        T = T.at[..., i[:-1], i[1:]].set(e).at[..., i[1:], i[:-1]].set(e)
+        return jnp.linalg.eigh(T)[0][..., -1]
+
+    for n in [1, 2, 40]:
+        d = 100 * rng.normal(size=(3, 2, n))
+        e = 50 * rng.normal(size=(3, 2, n - 1))
+        np.testing.assert_allclose(
+            _eigvalsh_max_tridiagonal(d, e), dense(d, e), rtol=1e-13, atol=1e-12
+        )
+        # grad matches grad of dense solver
+        grad1 = jax.grad(lambda d, e: _eigvalsh_max_tridiagonal(d, e).sum(), (0, 1))
+        grad2 = jax.grad(lambda d, e: dense(d, e).sum(), (0, 1))
+        for g1, g2 in zip(grad1(d, e), grad2(d, e)):
+            np.testing.assert_allclose(g1, g2, atol=1e-12)
+
+
 @pytest.mark.unit
 def test_ballooning_stability_eval():
     """Cross-compare all the stability functions.
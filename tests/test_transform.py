@@ -14,8 +14,10 @@ from desc.basis import (
     ZernikePolynomial,
 )
 from desc.compute import get_transforms
-from desc.grid import ConcentricGrid, Grid, LinearGrid
-from desc.transform import Transform
+from desc.equilibrium import Equilibrium
+from desc.grid import ConcentricGrid, Grid, LinearGrid, QuadratureGrid
+from desc.objectives import AspectRatio, ObjectiveFunction, Volume
+from desc.transform import Transform, get_matrix_cache
 
 
 class TestTransform:
@@ -389,6 +391,75 @@ class TestTransform:
                 err_msg="failed on double fourier after change, d={}".format(d),
             )
 
+    @pytest.mark.unit
+    def test_transform_all(self):
+        """Tests that transform_all gives the same results as transform."""
+        grid = ConcentricGrid(8, 4, 3, 4)
+        basis = FourierZernikeBasis(4, 3, 2, 4)
+        x = np.random.random(basis.num_modes)
+        for method in ["direct1", "direct2", "fft", "separable", "jitable"]:
+            t = Transform(grid, basis, derivs=2, method=method)
+            y = t.transform_all(x)
+            assert y.shape == (len(t.derivatives), grid.num_nodes)
+            for i, d in enumerate(t.derivatives):
+                np.testing.assert_allclose(
+                    y[i],
+                    t.transform(x, *d),
+                    atol=1e-12,
+                    err_msg=f"failed on {method}, d={d}",
+                )
+            derivs = np.array([[0, 2, 0], [1, 0, 1], [0, 2, 0]])
+            y = t.transform_all(x, derivs)
+            for i, d in enumerate(derivs):
+                np.testing.assert_allclose(y[i], t.transform(x, *d), atol=1e-12)
+
+    @pytest.mark.unit
+    def test_separable(self):
+        """Tests that the separable method gives the same results as direct1."""
+        np.random.seed(0)
+        for basis, grid in [
+            (FourierZernikeBasis(6, 5, 3, 2, spectral_indexing="fringe"), None),
+            (FourierZernikeBasis(5, 5, 2, sym="cos"), QuadratureGrid(6, 6, 4)),
+            (ZernikePolynomial(6, 4), ConcentricGrid(6, 6, 0)),
+        ]:
+            if grid is None:
+                grid = ConcentricGrid(8, 7, 5, NFP=2)
+            ts = Transform(grid, basis, derivs=3, method="separable", build_pinv=True)
+            td = Transform(grid, basis, derivs=3, method="direct1", build_pinv=True)
+            assert ts.method == "separable"
+            x = np.random.random(basis.num_modes)
+            for d in ts.derivatives:
+                np.testing.assert_allclose(
+                    ts.transform(x, *d),
+                    td.transform(x, *d),
+                    atol=1e-10,
+                    err_msg=f"failed on {basis}, d={d}",
+                )
+            y = np.random.random(grid.num_nodes)
+            np.testing.assert_allclose(ts.project(y), td.project(y), atol=1e-12)
+            np.testing.assert_allclose(
+                ts.fit(ts.transform(x)), td.fit(td.transform(x)), atol=1e-10
+            )
+
+        # falls back for bases without zernike radial part or bad grids
+        grid = LinearGrid(4, 4, 3)
+        with pytest.warns(UserWarning, match="Zernike"):
+            t = Transform(grid, DoubleFourierSeries(2, 2), method="separable")
+        assert t.method == "fft"
+        with pytest.warns(UserWarning, match="node pattern"):
+            t = Transform(
+                Grid(np.array([[0, 0, 0], [0.5, 1, 0.1], [0, 0, 0.3]])),
+                FourierZernikeBasis(2, 2, 1),
+                method="separable",
+            )
+        assert t.method == "direct1"
+
+        # auto only picks separable when it saves most of the work
+        basis = FourierZernikeBasis(4, 4, 1)
+        assert Transform(QuadratureGrid(8, 8, 2), basis).method == "fft"
+        basis = FourierZernikeBasis(16, 16, 2)
+        assert Transform(QuadratureGrid(32, 32, 4), basis).method == "separable"
+
     @pytest.mark.unit
     def test_project(self):
         """Tests projection method for Galerkin method."""
@@ -579,6 +650,58 @@ class TestTransform:
         c1 = transform.fit(x)
         np.testing.assert_allclose(c, c1, atol=1e-12)
 
+    @pytest.mark.unit
+    def test_matrix_cache(self):
+        """Test that transforms share matrices through the matrix cache."""
+        cache = get_matrix_cache()
+        cache.clear()
+        cache.max_size = 0.5
+        grid = ConcentricGrid(6, 6, 3)
+        basis = FourierZernikeBasis(4, 4, 2)
+        t1 = Transform(grid, basis, derivs=1, method="fft", build_pinv=True)
+        # matrix for dr=dt=0 is the same for dz=0 and dz=1
+        info1 = cache.cache_info()
+        assert info1.hits == 1 and info1.misses == 4
+        t2 = Transform(grid, basis, derivs=[[1, 0, 0], [2, 0, 0]], method="fft")
+        t2.build_pinv()
+        assert t2.matrices["fft"][1][0] is t1.matrices["fft"][1][0]
+        assert t2.matrices["pinvA"] is t1.matrices["pinvA"]
+        info2 = cache.cache_info()
+        assert info2.hits == info1.hits + 3 and info2.misses == info1.misses + 1
+        assert info2.bytes_saved - info1.bytes_saved == (
+            t1.matrices["fft"][0][0].nbytes
+            + t1.matrices["fft"][1][0].nbytes
+            + t1.matrices["pinvA"].nbytes
+        )
+        # different basis or method doesn't reuse anything
+        t3 = Transform(grid, FourierZernikeBasis(4, 4, 3), method="fft")
+        t4 = Transform(grid, basis, method="direct1")
+        assert cache.cache_info().hits == info2.hits
+        x = np.random.random(basis.num_modes)
+        np.testing.assert_allclose(t1.transform(x), t4.transform(x), atol=1e-12)
+        assert t3.built
+
+        # bounded size, evicted matrices still shared while in use
+        cache.max_size = t4.matrices["direct1"][0][0][0].nbytes / 1e9
+        assert len(cache) == 1
+        t5 = Transform(grid, basis, method="fft")
+        assert t5.matrices["fft"][0][0] is t1.matrices["fft"][0][0]
+        cache.max_size = 0
+        assert len(cache) == 0
+        t6 = Transform(grid, basis, method="direct1")
+        assert t6.matrices["direct1"][0][0][0] is t4.matrices["direct1"][0][0][0]
+
+        # shared between objectives in an ObjectiveFunction
+        eq = Equilibrium(L=3, M=3, N=1)
+        cache.clear()
+        obj = ObjectiveFunction(
+            (AspectRatio(eq, grid=grid), Volume(eq, grid=grid)), use_jit=False
+        )
+        obj.build(verbose=0)
+        t1, t2 = [o.constants["transforms"] for o in obj.objectives]
+        assert t1["R"].matrices["fft"][0][0] is t2["R"].matrices["fft"][0][0]
+        assert cache.cache_info().bytes_saved > 0
+
     @pytest.mark.unit
     def test_empty_grid(self):
         """Make sure we can build transforms with empty grids."""
@@ -7,7 +7,13 @@ import pytest
 
 from desc.backend import flatnonzero, jnp, tree_leaves, tree_structure
 from desc.grid import LinearGrid
-from desc.utils import broadcast_tree, isalmostequal, islinspaced, take_mask
+from desc.utils import (
+    broadcast_tree,
+    isalmostequal,
+    islinspaced,
+    lru_cache_by_key,
+    take_mask,
+)
 
 
 @pytest.mark.unit
@@ -231,3 +237,28 @@ def test_take_mask():
             desired[-1] if desired.size else np.nan,
             equal_nan=True,
         )
+
+
+@pytest.mark.unit
+def test_lru_cache_by_key():
+    """Test caching results of functions of unhashable arguments."""
+    calls = []
+
+    @lru_cache_by_key(lambda x, scale=1: (x.tobytes(), scale), maxsize=2)
+    def fun(x, scale=1):
+        calls.append(x)
+        return x * scale
+
+    x = np.arange(3.0)
+    out = fun(x)
+    assert fun(x.copy()) is out
+    assert len(calls) == 1
+    fun(x, scale=2)
+    fun(x + 1)
+    assert len(calls) == 3
+    # least recently used result was dropped
+    assert fun.cache_info().currsize == 2
+    assert fun(x) is not out
+    assert len(calls) == 4
+    fun.cache_clear()
+    assert fun.cache_info().currsize == 0